@@ -60,9 +60,13 @@ class Queue:
     def __init__(self, cap=10):
         """
         Initializes the Queue with a given capacity or a default of 10.
+        The queue is a circular buffer: cap slots are allocated up front and the front
+        and back move around them, so enqueue and dequeue never shift the other items.
         """
-        self.capacity_val = cap  # Queue capacity
-        self.queue = []          # Queue list to store elements
+        self.capacity_val = cap          # Queue capacity (allocated slots)
+        self.queue = [None] * cap        # Slots storing the elements
+        self.front = 0                   # Slot of the front (oldest) element
+        self.size = 0                    # Number of elements in the queue
 
     def capacity(self):
         """
@@ -70,13 +74,48 @@ class Queue:
         """
         return self.capacity_val
 
+    def _grow(self, needed):
+        """
+        Doubles the capacity until it holds at least needed items, moving the items into
+        a new list of slots with the front at slot 0.
+        """
+        new_cap = max(self.capacity_val, 1)
+        while new_cap < needed:
+            new_cap *= 2  # Double the capacity
+        self.queue = self._items() + [None] * (new_cap - self.size)
+        self.capacity_val = new_cap
+        self.front = 0
+
+    def _items(self):
+        """
+        Returns the items in the queue from front to back as a list.
+        """
+        end = self.front + self.size
+        if end <= self.capacity_val:
+            return self.queue[self.front:end]
+        return self.queue[self.front:] + self.queue[:end - self.capacity_val]
+
     def enqueue(self, data):
         """
         Adds an item to the back of the queue. If the queue exceeds its capacity, it resizes.
         """
-        if len(self.queue) >= self.capacity_val:
-            self.capacity_val *= 2  # Double the capacity
-        self.queue.append(data)
+        if self.size >= self.capacity_val:
+            self._grow(self.size + 1)
+        self.queue[(self.front + self.size) % self.capacity_val] = data
+        self.size += 1
+
+    def enqueue_many(self, items):
+        """
+        Adds every item of an iterable to the back of the queue, in order, growing at most once.
+        """
+        items = list(items)
+        if self.size + len(items) > self.capacity_val:
+            self._grow(self.size + len(items))
+        back = (self.front + self.size) % self.capacity_val if self.capacity_val else 0
+        first = min(len(items), self.capacity_val - back)
+        self.queue[back:back + first] = items[:first]
+        self.queue[:len(items) - first] = items[first:]
+        self.size += len(items)
 
     def dequeue(self):
         """
@@ -84,7 +123,21 @@ class Queue:
         """
         if self.is_empty():
             raise IndexError('dequeue() used on empty queue')
-        return self.queue.pop(0)  # Remove the first element (FIFO)
+        data = self.queue[self.front]
+        self.queue[self.front] = None  # Release the reference
+        self.front = (self.front + 1) % self.capacity_val
+        self.size -= 1
+        return data
+
+    def drain(self):
+        """
+        Removes every item from the queue and returns them as a list, front first.
+        """
+        items = self._items()
+        self.queue = [None] * self.capacity_val
+        self.front = 0
+        self.size = 0
+        return items
 
     def get_front(self):
         """
@@ -93,19 +146,19 @@ class Queue:
         """
         if self.is_empty():
             return None
-        return self.queue[0]
+        return self.queue[self.front]
 
     def is_empty(self):
         """
         Returns True if the queue is empty, otherwise False.
         """
-        return len(self.queue) == 0
+        return self.size == 0
 
     def __len__(self):
         """
         Returns the number of items in the queue.
         """
-        return len(self.queue)
+        return self.size
 
 
 
@@ -114,9 +167,14 @@ class Deque:
     def __init__(self, cap=10):
         """
         Initializes the Deque with a given capacity or a default of 10.
+        Like Queue, the deque is a circular buffer: cap slots are allocated up front and
+        both ends move around them, so pushing or popping at either end never shifts the
+        other elements.
         """
-        self.capacity_val = cap  # Initial capacity of the deque
-        self.deque = []          # Internal list to store elements
+        self.capacity_val = cap          # Deque capacity (allocated slots)
+        self.deque = [None] * cap        # Slots storing the elements
+        self.front = 0                   # Slot of the front element
+        self.size = 0                    # Number of elements in the deque
 
     def capacity(self):
         """
@@ -124,13 +182,27 @@ class Deque:
         """
         return self.capacity_val
 
+    def _grow(self, needed):
+        """
+        Doubles the capacity until it holds at least needed elements, moving the elements
+        into a new list of slots with the front at slot 0.
+        """
+        new_cap = max(self.capacity_val, 1)
+        while new_cap < needed:
+            new_cap *= 2  # Double the capacity
+        self.deque = list(self) + [None] * (new_cap - self.size)
+        self.capacity_val = new_cap
+        self.front = 0
+
     def push_front(self, data):
         """
         Adds data to the front of the deque. If the deque exceeds capacity, it resizes.
         """
-        if len(self.deque) >= self.capacity_val:
-            self.capacity_val *= 2  # Double the capacity
-        self.deque.insert(0, data)  # Insert element at the front
+        if self.size >= self.capacity_val:
+            self._grow(self.size + 1)
+        self.front = (self.front - 1) % self.capacity_val
+        self.deque[self.front] = data
+        self.size += 1
 
     def pop_front(self):
         """
@@ -138,15 +210,20 @@ class Deque:
         """
         if self.is_empty():
             raise IndexError('pop_front() used on empty deque')
-        return self.deque.pop(0)  # Remove the first element
+        data = self.deque[self.front]
+        self.deque[self.front] = None  # Release the reference
+        self.front = (self.front + 1) % self.capacity_val
+        self.size -= 1
+        return data
 
     def push_back(self, data):
         """
         Adds data to the back of the deque. If the deque exceeds capacity, it resizes.
         """
-        if len(self.deque) >= self.capacity_val:
-            self.capacity_val *= 2  # Double the capacity
-        self.deque.append(data)  # Append element to the back
+        if self.size >= self.capacity_val:
+            self._grow(self.size + 1)
+        self.deque[(self.front + self.size) % self.capacity_val] = data
+        self.size += 1
 
     def pop_back(self):
         """
@@ -154,7 +231,55 @@ class Deque:
         """
         if self.is_empty():
             raise IndexError('pop_back() used on empty deque')
-        return self.deque.pop()  # Remove the last element
+        back = (self.front + self.size - 1) % self.capacity_val
+        data = self.deque[back]
+        self.deque[back] = None  # Release the reference
+        self.size -= 1
+        return data
+
+    def extend_right(self, items):
+        """
+        Adds every item of an iterable to the back of the deque, in order, growing at most once.
+        """
+        items = list(items)
+        if self.size + len(items) > self.capacity_val:
+            self._grow(self.size + len(items))
+        for data in items:
+            self.deque[(self.front + self.size) % self.capacity_val] = data
+            self.size += 1
+
+    def extend_left(self, items):
+        """
+        Adds every item of an iterable to the front of the deque, growing at most once.
+        Each item is pushed in front of the previous one, so the items end up in reverse order.
+        """
+        items = list(items)
+        if self.size + len(items) > self.capacity_val:
+            self._grow(self.size + len(items))
+        for data in items:
+            self.front = (self.front - 1) % self.capacity_val
+            self.deque[self.front] = data
+            self.size += 1
+
+    def rotate(self, n=1):
+        """
+        Rotates the deque n steps to the right: the last n elements move to the front.
+        A negative n rotates to the left. When the deque is full this only moves the front,
+        otherwise it moves min(n, len - n) elements.
+        """
+        if self.size == 0:
+            return
+        n %= self.size
+        if n == 0:
+            return
+        if self.size == self.capacity_val:
+            self.front = (self.front - n) % self.capacity_val
+        elif n <= self.size // 2:
+            for _ in range(n):
+                self.push_front(self.pop_back())
+        else:
+            for _ in range(self.size - n):
+                self.push_back(self.pop_front())
 
     def get_front(self):
         """
@@ -162,7 +287,7 @@ class Deque:
         """
         if self.is_empty():
             return None
-        return self.deque[0]
+        return self.deque[self.front]
 
     def get_back(self):
         """
@@ -170,25 +295,35 @@ class Deque:
         """
         if self.is_empty():
             return None
-        return self.deque[-1]
+        return self.deque[(self.front + self.size - 1) % self.capacity_val]
 
     def is_empty(self):
         """
         Returns True if the deque is empty, otherwise False.
         """
-        return len(self.deque) == 0
+        return self.size == 0
 
     def __len__(self):
         """
         Returns the number of elements in the deque.
         """
-        return len(self.deque)
+        return self.size
 
     def __getitem__(self, k):
         """
         Returns the k'th element from the front of the deque without removing it.
         Raises IndexError if k is out of range.
         """
-        if k < 0 or k >= len(self.deque):
+        if k < 0 or k >= self.size:
             raise IndexError('Index out of range')
-        return self.deque[k]
+        return self.deque[(self.front + k) % self.capacity_val]
+
+    def __iter__(self):
+        """
+        Yields the elements from front to back, reading the slots in place without copying them.
+        The deque must not be changed while it is being iterated.
+        """
+        deque = self.deque
+        cap = self.capacity_val
+        for i in range(self.front, self.front + self.size):
+            yield deque[i % cap]
@@ -114,3 +114,143 @@ def all_same_signs(grid):
             if len(signs) > 1:
                 return False
     return len(signs) <= 1
+
+
+_grid_tables = {}
+
+def get_grid_tables(rows, cols):
+    """
+    Returns the neighbours and overflow point of every cell of a grid of a given size,
+    cached per size.
+
+    Args:
+        rows (int): The number of rows in the grid.
+        cols (int): The number of columns in the grid.
+
+    Returns:
+        tuple: (neighbors, limits, cells) where neighbors[row][col] lists the coordinates of
+        the neighbours of (row, col) as get_neighbors does, limits[row][col] is the value at
+        which the cell overflows, as used by get_overflow_list, and cells lists every
+        coordinate in row order.
+    """
+    tables = _grid_tables.get((rows, cols))
+    if tables is None:
+        grid = [[0] * cols for _ in range(rows)]
+        neighbors = [[get_neighbors(grid, r, c) for c in range(cols)] for r in range(rows)]
+        limits = [[4 - (r == 0 or r == rows - 1) - (c == 0 or c == cols - 1) for c in range(cols)]
+                  for r in range(rows)]
+        cells = [(r, c) for r in range(rows) for c in range(cols)]
+        tables = (neighbors, limits, cells)
+        _grid_tables[(rows, cols)] = tables
+    return tables
+
+
+def board_tally(grid):
+    """
+    Counts the pieces of each player on a grid.
+
+    Args:
+        grid (list of list of int): The 2D grid to count.
+
+    Returns:
+        list of int: [positive cells, negative cells, sum of positive cells,
+        sum of the absolute values of negative cells].
+    """
+    positive = negative = positive_sum = negative_sum = 0
+    for row in grid:
+        for cell in row:
+            if cell > 0:
+                positive += 1
+                positive_sum += cell
+            elif cell < 0:
+                negative += 1
+                negative_sum -= cell
+    return [positive, negative, positive_sum, negative_sum]
+
+
+def overflow_iterative(grid, a_queue=None, tally=None):
+    """
+    Applies the overflow process like overflow(), without recursion or full rescans.
+
+    After the first wave only the cells that received pieces in the previous wave can
+    overflow, so only those are checked. The number of positive and negative cells is kept
+    up to date as cells change instead of rescanning the grid for all_same_signs.
+    The final grid, the number of waves and the grid states queued are the same as overflow().
+    A tally of the grid can be passed in to skip the initial count and get the tally of the
+    result back.
+
+    Args:
+        grid (list of list of int): The 2D grid to process.
+        a_queue (Queue, optional): The queue to store intermediate grid states. If None,
+            no copies of the grid are made.
+        tally (list of int, optional): The board_tally() of grid. If given, it is used
+            instead of counting the cells and is kept up to date as cells change.
+
+    Returns:
+        int: The number of overflow operations performed.
+    """
+    rows, cols = len(grid), len(grid[0])
+    neighbors, limits, candidates = get_grid_tables(rows, cols)
+    if tally is None:
+        positive = negative = 0
+        for row in grid:
+            for cell in row:
+                if cell > 0:
+                    positive += 1
+                elif cell < 0:
+                    negative += 1
+    else:
+        positive, negative, positive_sum, negative_sum = tally
+
+    waves = 0
+    while True:
+        overflow_cells = [(r, c) for r, c in candidates if abs(grid[r][c]) >= limits[r][c]]
+        if not overflow_cells or positive == 0 or negative == 0:
+            if tally is not None:
+                tally[:] = [positive, negative, positive_sum, negative_sum]
+            return waves
+
+        first_row, first_col = min(overflow_cells)
+        sign = 1 if grid[first_row][first_col] > 0 else -1
+
+        for r, c in overflow_cells:
+            old = grid[r][c]
+            if old > 0:
+                positive -= 1
+                if tally is not None:
+                    positive_sum -= old
+            elif old < 0:
+                negative -= 1
+                if tally is not None:
+                    negative_sum += old
+            grid[r][c] = 0
+
+        changed = set()
+        for r, c in overflow_cells:
+            for nr, nc in neighbors[r][c]:
+                old = grid[nr][nc]
+                if (nr, nc) not in changed:
+                    if old > 0:
+                        positive -= 1
+                    elif old < 0:
+                        negative -= 1
+                    changed.add((nr, nc))
+                grid[nr][nc] = sign * (abs(old) + 1)
+                if tally is not None:
+                    if old > 0:
+                        positive_sum -= old
+                    else:
+                        negative_sum += old
+                    if sign > 0:
+                        positive_sum += abs(old) + 1
+                    else:
+                        negative_sum += abs(old) + 1
+        if sign > 0:
+            positive += len(changed)
+        else:
+            negative += len(changed)
+
+        waves += 1
+        if a_queue is not None:
+            a_queue.enqueue([row[:] for row in grid])
+        candidates = changed
@@ -1,19 +1,53 @@
+import sys
+import threading
+
+_RECORD_SIZE = sys.getsizeof((None, None))  # bytes of one (key, value) tuple
+
+
 class HashTable:
-    def __init__(self, capacity=32):
+    def __init__(self, capacity=32, incremental=False, migrate_step=4, shrink=False):
         """
         Initializes the hash table with a given capacity.
 
+        By default the table doubles in one go when the load goes over 0.7, so the insert
+        that crosses it moves every record. With incremental=True the old and the new table
+        are kept side by side instead, and each later operation moves migrate_step buckets of
+        the old table, or more if needed to finish before the next resize, which caps the work
+        any single insert does. Records not yet
+        moved are still found, modified and removed in the old table.
+
+        With shrink=True, removing records halves the capacity once the load drops below
+        0.175 (a quarter of the 0.7 growth limit), but never below the initial capacity.
+        After halving the load is still at most 0.35, so a table hovering around one size
+        does not keep growing and shrinking. An incremental table shrinks incrementally too.
+
         Parameters:
         capacity (int, optional): The initial capacity of the hash table. Default is 32.
+        incremental (bool, optional): If True, resize a few buckets per operation. Default is False.
+        migrate_step (int, optional): Buckets moved per operation while resizing incrementally. Default is 4.
+        shrink (bool, optional): If True, halve the capacity when the load gets low. Default is False.
 
         Attributes:
         _capacity (int): The current capacity of the hash table.
         table (list of list of tuple): The hash table, where each index contains a list of key-value pairs.
         size (int): The number of key-value pairs in the hash table.
+        _old_table (list of list of tuple): The table being moved out of, or None when not resizing.
+        _migrated (int): Number of buckets of _old_table already moved.
+        _migrate_rate (int): Buckets moved per operation during the current resize, at least migrate_step.
+        _min_capacity (int): The capacity shrinking stops at.
+        resizes (int): Number of times the capacity changed.
         """
         self._capacity = capacity 
         self.table = [None] * self._capacity 
         self.size = 0 
+        self.incremental = incremental
+        self.migrate_step = max(1, migrate_step)
+        self._old_table = None
+        self._migrated = 0
+        self._migrate_rate = self.migrate_step
+        self.shrink = shrink
+        self._min_capacity = capacity
+        self.resizes = 0
 
     def _hash(self, key):
         """
@@ -27,17 +61,127 @@ class HashTable:
         """
         return hash(key) % self._capacity
 
-    def _resize(self):
-        """Resizes the hash table"""
+    def _place(self, key, value):
+        """Appends a record known not to be in the table to its chain, without any checks."""
+        index = self._hash(key)
+        if self.table[index] is None:
+            self.table[index] = []
+        self.table[index].append((key, value))
+
+    @classmethod
+    def presized(cls, expected, capacity=32, **kwargs):
+        """
+        Creates a hash table large enough to hold expected records without resizing.
+
+        The capacity starts at capacity and doubles, as the table itself would while filling
+        up, until expected records fit within the 0.7 load limit.
+
+        Parameters:
+        expected (int): The number of records the table will hold.
+        capacity (int, optional): The smallest capacity to use. Default is 32.
+        **kwargs: Passed on to the constructor.
+
+        Returns:
+        HashTable: The empty table.
+        """
+        capacity = max(capacity, 1)
+        while expected / capacity > 0.7:
+            capacity *= 2
+        return cls(capacity, **kwargs)
+
+    def _resize(self, capacity=None):
+        """Resizes the hash table, to double its capacity unless capacity is given"""
+        self._finish_migration()
         old_table = self.table
-        self._capacity *= 2
+        self._capacity = capacity if capacity is not None else self._capacity * 2
         self.table = [None] * self._capacity
-        self.size = 0  
+        self.resizes += 1
 
         for chain in old_table:
             if chain:
                 for key, value in chain:
-                    self.insert(key, value)
+                    self._place(key, value)
+
+    def _start_migration(self, capacity=None):
+        """
+        Changes the capacity, keeping the current table as the old table to move records out of.
+
+        Parameters:
+        capacity (int, optional): The new capacity. Default is double the current one.
+        """
+        self._finish_migration()
+        self._old_table = self.table
+        self._migrated = 0
+        self._capacity = capacity if capacity is not None else self._capacity * 2
+        self.table = [None] * self._capacity
+        self.resizes += 1
+        # only an insert can start the next resize while this one runs (shrinking waits for it),
+        # so move enough buckets per operation to be done by the insert that would grow again,
+        # however many times larger than the new table the old one is
+        operations = max(1, int(0.7 * self._capacity) + 1 - self.size)
+        self._migrate_rate = max(self.migrate_step, -(-len(self._old_table) // operations))
+
+    def _shrink_if_sparse(self):
+        """
+        Halves the capacity if shrinking is on and the load is below 0.175.
+
+        An incremental table shrinks incrementally too, and not while a resize is still in
+        progress, so no remove finishes a resize in one go.
+        """
+        if (self.shrink and self._old_table is None and self._capacity // 2 >= self._min_capacity
+                and self.size / self._capacity < 0.175):
+            capacity = self._capacity
+            while capacity // 2 >= self._min_capacity and self.size / capacity < 0.175:
+                capacity //= 2
+            if self.incremental:
+                self._start_migration(capacity)
+            else:
+                self._resize(capacity)
+
+    def _migrate(self, buckets):
+        """
+        Moves up to buckets buckets of the old table into the table.
+
+        Parameters:
+        buckets (int): The most buckets to move.
+        """
+        old_table = self._old_table
+        end = min(self._migrated + buckets, len(old_table))
+        for i in range(self._migrated, end):
+            chain = old_table[i]
+            if chain:
+                for key, value in chain:
+                    self._place(key, value)
+                old_table[i] = None
+        self._migrated = end
+        if end == len(old_table):
+            self._old_table = None
+
+    def _finish_migration(self):
+        """Moves every record left in the old table, if a resize is in progress."""
+        if self._old_table is not None:
+            self._migrate(len(self._old_table))
+
+    def _chains(self, key):
+        """
+        Does one step of an incremental resize in progress, then returns the chains key can be in.
+
+        Parameters:
+        key (any): The key.
+
+        Returns:
+        tuple: (index, old_chain) where index is key's index in the table and old_chain is
+               the chain of the old table that may still hold key, or None.
+        """
+        if self._old_table is not None:
+            self._migrate(self._migrate_rate)
+        h = hash(key)
+        old_chain = None
+        if self._old_table is not None:
+            old_index = h % len(self._old_table)
+            if old_index >= self._migrated:
+                old_chain = self._old_table[old_index]
+        return h % self._capacity, old_chain
 
     def insert(self, key, value):
         """
@@ -50,18 +194,25 @@ class HashTable:
         Returns:
         bool: False if the key already exists in the hash table, True otherwise.
         """
-        index = self._hash(key)
+        index, old_chain = self._chains(key)
         if self.table[index] is None:
             self.table[index] = [] 
 
         for k, v in self.table[index]:
             if k == key:
                 return False
+        if old_chain:
+            for k, v in old_chain:
+                if k == key:
+                    return False
 
         self.table[index].append((key, value))
         self.size += 1
         if self.size / self._capacity > 0.7:
-            self._resize()
+            if self.incremental:
+                self._start_migration()
+            else:
+                self._resize()
 
         return True
 
@@ -76,17 +227,357 @@ class HashTable:
         Returns:
         bool: True if the key was found and the value was modified, False otherwise.
         """
-        index = self._hash(key)
-        if self.table[index] is None:
-            return False
+        index, old_chain = self._chains(key)
+        for chain in (self.table[index], old_chain):
+            if chain:
+                for i, (k, v) in enumerate(chain):
+                    if k == key:
+                        chain[i] = (key, value)
+                        return True
 
-        for i, (k, v) in enumerate(self.table[index]):
-            if k == key:
-                self.table[index][i] = (key, value)
-                return True
+        return False
+
+    def remove(self, key):
+        """
+        Removes the key-value pair associated with the given key.
+
+        Parameters:
+        key (any): The key to be removed.
+
+        Returns:
+        bool: True if the key was found and removed, False otherwise.
+        """
+        index, old_chain = self._chains(key)
+        if self.table[index] is not None:
+            for i, (k, v) in enumerate(self.table[index]):
+                if k == key:
+                    del self.table[index][i]
+                    self.size -= 1
+                    if not self.table[index]:
+                        self.table[index] = None
+                    self._shrink_if_sparse()
+                    return True
+
+        if old_chain:
+            for i, (k, v) in enumerate(old_chain):
+                if k == key:
+                    # an emptied old chain is left as [], _migrate skips it
+                    del old_chain[i]
+                    self.size -= 1
+                    self._shrink_if_sparse()
+                    return True
 
         return False
 
+    def search(self, key):
+        """Searches for the value associated with the key."""
+        index, old_chain = self._chains(key)
+        for chain in (self.table[index], old_chain):
+            if chain:
+                for k, v in chain:
+                    if k == key:
+                        return v
+
+        return None
+
+    def insert_many(self, items):
+        """
+        Inserts many key-value pairs, growing the table at most once.
+
+        The capacity is doubled up front until every pair fits within the 0.7 load limit,
+        counting each pair as new, and the pairs are then added without further load checks.
+        A key already in the table, or repeated in items, keeps its first value.
+        Any incremental resize in progress is finished first.
+
+        Parameters:
+        items (iterable of tuple): The (key, value) pairs to insert.
+
+        Returns:
+        int: The number of pairs inserted.
+        """
+        items = list(items)
+        self._finish_migration()
+        capacity = self._capacity
+        while (self.size + len(items)) / capacity > 0.7:
+            capacity *= 2
+        if capacity != self._capacity:
+            self._resize(capacity)
+
+        table = self.table
+        inserted = 0
+        for key, value in items:
+            index = hash(key) % capacity
+            chain = table[index]
+            if chain is None:
+                table[index] = [(key, value)]
+                inserted += 1
+            elif all(k != key for k, v in chain):
+                chain.append((key, value))
+                inserted += 1
+        self.size += inserted
+        return inserted
+
+    def search_many(self, keys):
+        """
+        Searches for the values associated with many keys.
+        Any incremental resize in progress is finished first.
+
+        Parameters:
+        keys (iterable): The keys to look for.
+
+        Returns:
+        list: The value for each key, None for keys that are not in the table.
+        """
+        self._finish_migration()
+        table = self.table
+        capacity = self._capacity
+        values = []
+        for key in keys:
+            chain = table[hash(key) % capacity]
+            value = None
+            if chain is not None:
+                for k, v in chain:
+                    if k == key:
+                        value = v
+                        break
+            values.append(value)
+        return values
+
+    def remove_many(self, keys):
+        """
+        Removes the records for many keys. Keys that are not in the table are skipped.
+        Any incremental resize in progress is finished first.
+
+        Parameters:
+        keys (iterable): The keys to remove.
+
+        Returns:
+        int: The number of records removed.
+        """
+        self._finish_migration()
+        table = self.table
+        capacity = self._capacity
+        removed = 0
+        for key in keys:
+            index = hash(key) % capacity
+            chain = table[index]
+            if chain is None:
+                continue
+            for i, (k, v) in enumerate(chain):
+                if k == key:
+                    del chain[i]
+                    removed += 1
+                    if not chain:
+                        table[index] = None
+                    break
+        self.size -= removed
+        self._shrink_if_sparse()
+        return removed
+
+    def stats(self):
+        """
+        Reports how full the table is and how its records are spread over the buckets.
+
+        The chain lengths describe the buckets of the current table only, so they add up to
+        capacity buckets. While an incremental resize is in progress, the records still in
+        the old table are reported as migrating instead.
+
+        Returns:
+        dict: With keys
+              size (int): number of records,
+              capacity (int): number of buckets,
+              load_factor (float): size / capacity,
+              longest_chain (int): records in the fullest bucket,
+              chain_lengths (dict): number of buckets holding each number of records, empty ones included,
+              migrating (int): records not yet moved out of the old table, 0 when not resizing,
+              resizes (int): number of times the capacity changed,
+              memory_bytes (int): approximate bytes used by the bucket lists, chains and record
+              tuples of both tables, not counting the keys and values themselves.
+        """
+        chain_lengths = {}
+        memory = sys.getsizeof(self.table)
+        for chain in self.table:
+            length = len(chain) if chain else 0
+            chain_lengths[length] = chain_lengths.get(length, 0) + 1
+            if chain is not None:
+                memory += sys.getsizeof(chain) + length * _RECORD_SIZE
+        migrating = 0
+        if self._old_table is not None:
+            memory += sys.getsizeof(self._old_table)
+            for chain in self._old_table[self._migrated:]:
+                if chain is not None:
+                    migrating += len(chain)
+                    memory += sys.getsizeof(chain) + len(chain) * _RECORD_SIZE
+        return {
+            "size": self.size,
+            "capacity": self._capacity,
+            "load_factor": self.size / self._capacity,
+            "longest_chain": max(chain_lengths),
+            "chain_lengths": dict(sorted(chain_lengths.items())),
+            "migrating": migrating,
+            "resizes": self.resizes,
+            "memory_bytes": memory,
+        }
+
+    def capacity(self):
+        """Returns the number of slots in the table."""
+        return self._capacity
+
+    def __len__(self):
+        """Returns the number of records stored in the table."""
+        return self.size
+
+
+class ConcurrentHashTable:
+    def __init__(self, capacity=32, stripes=16):
+        """
+        Initializes a hash table that many threads can use at once.
+
+        Records are chained per bucket as in HashTable. Bucket i is guarded by lock
+        i % stripes, so operations on buckets under different locks run without waiting for
+        each other. A resize takes every lock, in order, before rebuilding the buckets. An
+        operation takes its bucket's lock and then checks that the capacity it hashed with is
+        still current, starting over if a resize happened in between. The capacity doubles
+        once the load goes over 0.7, as in HashTable.
+
+        Parameters:
+        capacity (int, optional): The initial capacity of the hash table. Default is 32.
+        stripes (int, optional): The number of locks. Default is 16.
+
+        Attributes:
+        _capacity (int): The current capacity of the hash table.
+        table (list of list of tuple): The hash table, where each index contains a list of key-value pairs.
+        _locks (list of Lock): The stripe locks.
+        _counts (list of int): The number of records under each lock.
+        """
+        self._capacity = capacity
+        self.table = [None] * capacity
+        self._locks = [threading.Lock() for _ in range(max(1, stripes))]
+        self._counts = [0] * len(self._locks)
+
+    @classmethod
+    def presized(cls, expected, capacity=32, stripes=16):
+        """
+        Creates a hash table large enough to hold expected records without resizing.
+
+        Parameters:
+        expected (int): The number of records the table will hold.
+        capacity (int, optional): The smallest capacity to use. Default is 32.
+        stripes (int, optional): The number of locks. Default is 16.
+
+        Returns:
+        ConcurrentHashTable: The empty table.
+        """
+        capacity = max(capacity, 1)
+        while expected / capacity > 0.7:
+            capacity *= 2
+        return cls(capacity, stripes)
+
+    def _lock_bucket(self, key):
+        """
+        Takes the lock of key's bucket.
+
+        Parameters:
+        key (any): The key.
+
+        Returns:
+        tuple: (index, stripe) of key's bucket. The caller must release self._locks[stripe].
+        """
+        h = hash(key)
+        while True:
+            capacity = self._capacity
+            index = h % capacity
+            stripe = index % len(self._locks)
+            lock = self._locks[stripe]
+            lock.acquire()
+            if capacity == self._capacity:
+                return index, stripe
+            # resized between reading the capacity and taking the lock
+            lock.release()
+
+    def _resize(self, capacity=None, seen=None):
+        """
+        Resizes the hash table, to double its capacity unless capacity is given.
+
+        Parameters:
+        capacity (int, optional): The new capacity. Default is double the current one.
+        seen (int, optional): The capacity the caller saw. If another thread has resized
+                              since, nothing is done. Default is None.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            if seen is not None and seen != self._capacity:
+                return
+            old_table = self.table
+            self._capacity = capacity if capacity is not None else self._capacity * 2
+            self.table = [None] * self._capacity
+            counts = [0] * len(self._locks)
+            for chain in old_table:
+                if chain:
+                    for key, value in chain:
+                        index = hash(key) % self._capacity
+                        if self.table[index] is None:
+                            self.table[index] = []
+                        self.table[index].append((key, value))
+                        counts[index % len(self._locks)] += 1
+            self._counts = counts
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def insert(self, key, value):
+        """
+        Inserts a new key-value pair into the hash table.
+
+        Parameters:
+        key (any): The key to be inserted.
+        value (any): The value to be associated with the key.
+
+        Returns:
+        bool: False if the key already exists in the hash table, True otherwise.
+        """
+        index, stripe = self._lock_bucket(key)
+        try:
+            chain = self.table[index]
+            if chain is None:
+                chain = self.table[index] = []
+            for k, v in chain:
+                if k == key:
+                    return False
+            chain.append((key, value))
+            self._counts[stripe] += 1
+            capacity = self._capacity
+        finally:
+            self._locks[stripe].release()
+
+        if len(self) / capacity > 0.7:
+            self._resize(seen=capacity)
+        return True
+
+    def modify(self, key, value):
+        """
+        Modifies the value of an existing key in the hash table.
+
+        Parameters:
+        key (any): The key whose value is to be modified.
+        value (any): The new value to be associated with the key.
+
+        Returns:
+        bool: True if the key was found and the value was modified, False otherwise.
+        """
+        index, stripe = self._lock_bucket(key)
+        try:
+            chain = self.table[index]
+            if chain is not None:
+                for i, (k, v) in enumerate(chain):
+                    if k == key:
+                        chain[i] = (key, value)
+                        return True
+            return False
+        finally:
+            self._locks[stripe].release()
+
     def remove(self, key):
         """
         Removes the key-value pair associated with the given key.
@@ -97,31 +588,352 @@ class HashTable:
         Returns:
         bool: True if the key was found and removed, False otherwise.
         """
-        index = self._hash(key)
-        if self.table[index] is None:
+        index, stripe = self._lock_bucket(key)
+        try:
+            chain = self.table[index]
+            if chain is not None:
+                for i, (k, v) in enumerate(chain):
+                    if k == key:
+                        del chain[i]
+                        self._counts[stripe] -= 1
+                        if not chain:
+                            self.table[index] = None
+                        return True
             return False
+        finally:
+            self._locks[stripe].release()
 
-        for i, (k, v) in enumerate(self.table[index]):
-            if k == key:
-                del self.table[index][i]
-                self.size -= 1
-                if not self.table[index]:
-                    self.table[index] = None
-                return True
+    def search(self, key):
+        """Searches for the value associated with the key."""
+        index, stripe = self._lock_bucket(key)
+        try:
+            chain = self.table[index]
+            if chain is not None:
+                for k, v in chain:
+                    if k == key:
+                        return v
+            return None
+        finally:
+            self._locks[stripe].release()
 
-        return False
+    def insert_many(self, items):
+        """
+        Inserts many key-value pairs, growing the table at most once (unless other threads
+        insert at the same time).
+
+        Parameters:
+        items (iterable of tuple): The (key, value) pairs to insert.
+
+        Returns:
+        int: The number of pairs inserted.
+        """
+        items = list(items)
+        capacity = self._capacity
+        needed = capacity
+        while (len(self) + len(items)) / needed > 0.7:
+            needed *= 2
+        if needed != capacity:
+            self._resize(needed, seen=capacity)
+        return sum(self.insert(key, value) for key, value in items)
+
+    def search_many(self, keys):
+        """Searches for the values associated with many keys, returning a list with None for missing keys."""
+        return [self.search(key) for key in keys]
+
+    def remove_many(self, keys):
+        """Removes the records for many keys, returning the number removed."""
+        return sum(self.remove(key) for key in keys)
+
+    def capacity(self):
+        """Returns the number of slots in the table."""
+        return self._capacity
+
+    def __len__(self):
+        """Returns the number of records stored in the table."""
+        return sum(self._counts)
+
+
+_EMPTY = object()    # marks a slot that has never held a record
+_DELETED = object()  # marks a slot whose record was removed (a tombstone)
+
+
+class OpenHashTable:
+    def __init__(self, capacity=32):
+        """
+        Initializes an open addressing hash table with a given capacity.
+
+        Records live in three parallel lists (hashes, keys and values) instead of a list of
+        (key, value) tuples per slot, and collisions are resolved by linear probing. Every
+        key's hash is cached next to it, so probing compares hashes before keys and resizing
+        never calls hash() again. Removing a record leaves a tombstone so that probe
+        sequences running through its slot stay intact. The contract is the same as HashTable:
+        the capacity doubles once the load goes over 0.7, and removing never shrinks it.
+
+        Parameters:
+        capacity (int, optional): The initial capacity of the hash table. Default is 32.
+
+        Attributes:
+        _capacity (int): The current capacity of the hash table.
+        hashes (list of int): The cached hash of the key in each slot.
+        keys (list): The key in each slot, or _EMPTY / _DELETED.
+        values (list): The value in each slot.
+        size (int): The number of key-value pairs in the hash table.
+        tombstones (int): The number of slots marked _DELETED.
+        """
+        self._capacity = capacity
+        self.hashes = [0] * capacity
+        self.keys = [_EMPTY] * capacity
+        self.values = [None] * capacity
+        self.size = 0
+        self.tombstones = 0
+
+    @classmethod
+    def presized(cls, expected, capacity=32):
+        """
+        Creates a hash table large enough to hold expected records without resizing.
+
+        Parameters:
+        expected (int): The number of records the table will hold.
+        capacity (int, optional): The smallest capacity to use. Default is 32.
+
+        Returns:
+        OpenHashTable: The empty table.
+        """
+        capacity = max(capacity, 1)
+        while expected / capacity > 0.7:
+            capacity *= 2
+        return cls(capacity)
+
+    def _find(self, key, h):
+        """
+        Probes for a key.
+
+        Parameters:
+        key (any): The key to look for.
+        h (int): hash(key).
+
+        Returns:
+        int: The slot holding key, or -1 if key is not in the table.
+        """
+        keys = self.keys
+        hashes = self.hashes
+        capacity = self._capacity
+        index = h % capacity
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1
+            if hashes[index] == h and k is not _DELETED and (k is key or k == key):
+                return index
+            index += 1
+            if index == capacity:
+                index = 0
+
+    def _rebuild(self, capacity):
+        """
+        Moves every record into new lists of capacity slots, dropping the tombstones.
+        Uses the cached hashes, so no key is hashed again.
+
+        Parameters:
+        capacity (int): The capacity of the new lists.
+        """
+        old_hashes, old_keys, old_values = self.hashes, self.keys, self.values
+        hashes = [0] * capacity
+        keys = [_EMPTY] * capacity
+        values = [None] * capacity
+        for h, key, value in zip(old_hashes, old_keys, old_values):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            index = h % capacity
+            while keys[index] is not _EMPTY:
+                index += 1
+                if index == capacity:
+                    index = 0
+            hashes[index] = h
+            keys[index] = key
+            values[index] = value
+        self._capacity = capacity
+        self.hashes, self.keys, self.values = hashes, keys, values
+        self.tombstones = 0
+
+    def _resize(self):
+        """Resizes the hash table"""
+        self._rebuild(self._capacity * 2)
+
+    def _add(self, key, value, h):
+        """
+        Puts a key-value pair in the first free slot of key's probe sequence, without load checks.
+
+        Parameters:
+        key (any): The key to be inserted.
+        value (any): The value to be associated with the key.
+        h (int): hash(key).
+
+        Returns:
+        bool: False if the key already exists in the hash table, True otherwise.
+        """
+        keys = self.keys
+        hashes = self.hashes
+        capacity = self._capacity
+        index = h % capacity
+        free = -1
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                break
+            if k is _DELETED:
+                if free < 0:
+                    free = index
+            elif hashes[index] == h and (k is key or k == key):
+                return False
+            index += 1
+            if index == capacity:
+                index = 0
+
+        if free >= 0:
+            index = free
+            self.tombstones -= 1
+        hashes[index] = h
+        keys[index] = key
+        self.values[index] = value
+        self.size += 1
+        return True
+
+    def insert(self, key, value):
+        """
+        Inserts a new key-value pair into the hash table.
+
+        Parameters:
+        key (any): The key to be inserted.
+        value (any): The value to be associated with the key.
+
+        Returns:
+        bool: False if the key already exists in the hash table, True otherwise.
+        """
+        if not self._add(key, value, hash(key)):
+            return False
+
+        if self.size / self._capacity > 0.7:
+            self._resize()
+        elif (self.size + self.tombstones) / self._capacity > 0.7:
+            # too few empty slots left to end probes quickly: clear the tombstones
+            self._rebuild(self._capacity)
+
+        return True
+
+    def modify(self, key, value):
+        """
+        Modifies the value of an existing key in the hash table.
+
+        Parameters:
+        key (any): The key whose value is to be modified.
+        value (any): The new value to be associated with the key.
+
+        Returns:
+        bool: True if the key was found and the value was modified, False otherwise.
+        """
+        index = self._find(key, hash(key))
+        if index < 0:
+            return False
+        self.values[index] = value
+        return True
+
+    def remove(self, key):
+        """
+        Removes the key-value pair associated with the given key.
+
+        Parameters:
+        key (any): The key to be removed.
+
+        Returns:
+        bool: True if the key was found and removed, False otherwise.
+        """
+        index = self._find(key, hash(key))
+        if index < 0:
+            return False
+
+        keys = self.keys
+        self.hashes[index] = 0
+        self.values[index] = None
+        self.size -= 1
+        if keys[(index + 1) % self._capacity] is _EMPTY:
+            # nothing probes past an empty slot, so this slot and the tombstones
+            # just before it can become empty again
+            keys[index] = _EMPTY
+            index -= 1
+            while keys[index] is _DELETED:
+                keys[index] = _EMPTY
+                self.tombstones -= 1
+                index -= 1
+        else:
+            keys[index] = _DELETED
+            self.tombstones += 1
+        return True
 
     def search(self, key):
         """Searches for the value associated with the key."""
-        index = self._hash(key)
-        if self.table[index] is None:
+        index = self._find(key, hash(key))
+        if index < 0:
             return None
+        return self.values[index]
 
-        for k, v in self.table[index]:
-            if k == key:
-                return v
+    def insert_many(self, items):
+        """
+        Inserts many key-value pairs, growing the table at most once.
 
-        return None
+        Parameters:
+        items (iterable of tuple): The (key, value) pairs to insert.
+
+        Returns:
+        int: The number of pairs inserted.
+        """
+        items = list(items)
+        capacity = self._capacity
+        while (self.size + len(items)) / capacity > 0.7:
+            capacity *= 2
+        if capacity != self._capacity or (self.size + self.tombstones + len(items)) / capacity > 0.7:
+            # the adds below make no load checks, so clear the tombstones first if they could
+            # otherwise fill every empty slot, which is what ends a probe
+            self._rebuild(capacity)
+
+        add = self._add
+        inserted = 0
+        for key, value in items:
+            inserted += add(key, value, hash(key))
+        if (self.size + self.tombstones) / capacity > 0.7:
+            self._rebuild(capacity)
+        return inserted
+
+    def search_many(self, keys):
+        """
+        Searches for the values associated with many keys.
+
+        Parameters:
+        keys (iterable): The keys to look for.
+
+        Returns:
+        list: The value for each key, None for keys that are not in the table.
+        """
+        find = self._find
+        values = self.values
+        found = []
+        for key in keys:
+            index = find(key, hash(key))
+            found.append(values[index] if index >= 0 else None)
+        return found
+
+    def remove_many(self, keys):
+        """
+        Removes the records for many keys. Keys that are not in the table are skipped.
+
+        Parameters:
+        keys (iterable): The keys to remove.
+
+        Returns:
+        int: The number of records removed.
+        """
+        remove = self.remove
+        return sum(remove(key) for key in keys)
 
     def capacity(self):
         """Returns the number of slots in the table."""
@@ -130,3 +942,255 @@ class HashTable:
     def __len__(self):
         """Returns the number of records stored in the table."""
         return self.size
+
+
+# fields of a BoundedHashTable record
+_KEY = 0
+_VALUE = 1
+_BYTES = 2
+_PREV = 3     # lru: the next more recently used record
+_NEXT = 4     # lru: the next less recently used record
+_COUNTER = 3  # clock: sweeps the record survives before it can be evicted
+_SLOT = 4     # clock: the record's position on the clock
+
+_MAX_DEPTH_BONUS = 3
+
+
+def _default_weigh(key, value):
+    """Approximate bytes one record of a BoundedHashTable costs: its key, value and bookkeeping."""
+    return sys.getsizeof(key) + sys.getsizeof(value) + 120
+
+
+class BoundedHashTable:
+    def __init__(self, max_entries=None, max_bytes=None, policy='lru', depth=None, weigh=None):
+        """
+        Initializes a hash table of bounded size for use as a cache.
+
+        Records are kept in a HashTable. When inserting would go over max_entries records or
+        max_bytes bytes, other records are evicted first, each in O(1) amortized time:
+        - 'lru' evicts the least recently used record. Records are kept on a doubly linked
+          list, most recently used first, and moved to the front whenever they are used.
+        - 'clock' approximates LRU: records sit on a ring that a hand sweeps, and a record
+          used since the hand last passed gets a second chance instead of being evicted.
+          Using a record costs no relinking.
+        With depth, replacement prefers to keep records for deeper searches: 'lru' evicts the
+        shallower of the two least recently used records, and 'clock' lets a record survive
+        up to 3 extra sweeps, one per ply of depth.
+
+        Parameters:
+        max_entries (int, optional): The most records to keep, at least 1. Default is None (no limit).
+        max_bytes (int, optional): The most bytes of records to keep, as measured by weigh, at least 1.
+                                   Default is None (no limit).
+        policy (str, optional): 'lru' or 'clock'. Default is 'lru'.
+        depth (callable, optional): Called with a value, returns the search depth it came from. Default is None.
+        weigh (callable, optional): Called with a key and a value, returns the bytes the record
+                                    costs. Default is an approximation from sys.getsizeof.
+
+        Attributes:
+        table (HashTable): The records, by key.
+        hits (int): Number of searches that found their key.
+        misses (int): Number of searches that did not.
+        evictions (int): Number of records evicted to make room.
+        bytes (int): The total bytes of the records kept.
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("a bounded table needs max_entries or max_bytes")
+        for name, limit in (("max_entries", max_entries), ("max_bytes", max_bytes)):
+            if limit is not None and limit < 1:
+                raise ValueError("%s must be at least 1, not %r" % (name, limit))
+        if policy not in ('lru', 'clock'):
+            raise ValueError("policy must be 'lru' or 'clock', not %r" % (policy,))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.depth = depth
+        self.weigh = weigh if weigh is not None else _default_weigh
+        self.clear()
+
+    def clear(self):
+        """Removes every record and resets the counters."""
+        if self.max_entries is not None:
+            self.table = HashTable.presized(self.max_entries)
+        else:
+            self.table = HashTable()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # lru: sentinel of the circular list, its _NEXT is the most recently used record
+        self._head = [None, None, 0, None, None]
+        self._head[_PREV] = self._head[_NEXT] = self._head
+        # clock: the ring of records (None for a free position), the free positions and the hand
+        self._ring = []
+        self._free = []
+        self._hand = 0
+
+    def _weight(self, value):
+        """Returns the sweeps a clock record with value survives: 1, plus up to 3 for its depth."""
+        if self.depth is None:
+            return 1
+        return 1 + min(max(self.depth(value), 0), _MAX_DEPTH_BONUS)
+
+    def _link(self, record):
+        """Puts a new record at the front of the lru list, or on the clock."""
+        if self.policy == 'lru':
+            head = self._head
+            record[_PREV] = head
+            record[_NEXT] = head[_NEXT]
+            head[_NEXT][_PREV] = record
+            head[_NEXT] = record
+        else:
+            record[_COUNTER] = self._weight(record[_VALUE])
+            if self._free:
+                slot = self._free.pop()
+                self._ring[slot] = record
+            else:
+                slot = len(self._ring)
+                self._ring.append(record)
+            record[_SLOT] = slot
+
+    def _unlink(self, record):
+        """Takes a record off the lru list, or off the clock."""
+        if self.policy == 'lru':
+            record[_PREV][_NEXT] = record[_NEXT]
+            record[_NEXT][_PREV] = record[_PREV]
+        else:
+            self._ring[record[_SLOT]] = None
+            self._free.append(record[_SLOT])
+
+    def _touch(self, record):
+        """Marks a record as just used."""
+        if self.policy == 'lru':
+            self._unlink(record)
+            self._link(record)
+        else:
+            record[_COUNTER] = self._weight(record[_VALUE])
+
+    def _victim(self):
+        """Returns the record to evict next. The table must not be empty."""
+        if self.policy == 'lru':
+            oldest = self._head[_PREV]
+            if self.depth is not None and oldest[_PREV] is not self._head:
+                second = oldest[_PREV]
+                if self.depth(second[_VALUE]) < self.depth(oldest[_VALUE]):
+                    return second
+            return oldest
+
+        ring = self._ring
+        while True:
+            if self._hand >= len(ring):
+                self._hand = 0
+            record = ring[self._hand]
+            self._hand += 1
+            if record is None:
+                continue
+            if record[_COUNTER] > 0:
+                record[_COUNTER] -= 1
+                continue
+            return record
+
+    def _discard(self, record):
+        """Removes a record from the table and from the eviction order."""
+        self.table.remove(record[_KEY])
+        self._unlink(record)
+        self.bytes -= record[_BYTES]
+
+    def _make_room(self, entries, nbytes):
+        """Evicts records until entries more records of nbytes more bytes fit within the bounds."""
+        while len(self.table) > 0 and (
+                (self.max_entries is not None and len(self.table) + entries > self.max_entries)
+                or (self.max_bytes is not None and self.bytes + nbytes > self.max_bytes)):
+            self._discard(self._victim())
+            self.evictions += 1
+
+    def insert(self, key, value):
+        """
+        Inserts a new key-value pair, evicting other records if there is no room for it.
+
+        Parameters:
+        key (any): The key to be inserted.
+        value (any): The value to be associated with the key.
+
+        Returns:
+        bool: False if the key already exists in the table or the record alone is larger
+              than max_bytes, True otherwise.
+        """
+        if self.table.search(key) is not None:
+            return False
+        nbytes = self.weigh(key, value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return False
+
+        self._make_room(1, nbytes)
+        record = [key, value, nbytes, None, None]
+        self.table.insert(key, record)
+        self._link(record)
+        self.bytes += nbytes
+        return True
+
+    def modify(self, key, value):
+        """
+        Modifies the value of an existing key and marks the record as used. If the new value
+        is larger and the table goes over max_bytes, other records are evicted, or the record
+        itself if it alone is larger than max_bytes.
+
+        Parameters:
+        key (any): The key whose value is to be modified.
+        value (any): The new value to be associated with the key.
+
+        Returns:
+        bool: True if the key was found and the value was modified, False otherwise.
+        """
+        record = self.table.search(key)
+        if record is None:
+            return False
+        nbytes = self.weigh(key, value)
+        self.bytes += nbytes - record[_BYTES]
+        record[_VALUE] = value
+        record[_BYTES] = nbytes
+        self._touch(record)
+        if self.max_bytes is not None and self.bytes > self.max_bytes:
+            # take the record off while making room so that it is not the one evicted
+            self._discard(record)
+            if nbytes > self.max_bytes:
+                self.evictions += 1
+                return True
+            self._make_room(1, nbytes)
+            self.table.insert(key, record)
+            self._link(record)
+            self.bytes += nbytes
+        return True
+
+    def remove(self, key):
+        """
+        Removes the key-value pair associated with the given key.
+
+        Parameters:
+        key (any): The key to be removed.
+
+        Returns:
+        bool: True if the key was found and removed, False otherwise.
+        """
+        record = self.table.search(key)
+        if record is None:
+            return False
+        self._discard(record)
+        return True
+
+    def search(self, key):
+        """Searches for the value associated with the key, marking the record as used."""
+        record = self.table.search(key)
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(record)
+        return record[_VALUE]
+
+    def capacity(self):
+        """Returns the number of slots in the underlying table."""
+        return self.table.capacity()
+
+    def __len__(self):
+        """Returns the number of records stored in the table."""
+        return len(self.table)
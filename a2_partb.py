@@ -1,6 +1,18 @@
 import copy
-from a1_partc import Queue
-from a1_partd import overflow
+import operator
+import time
+from array import array
+from a1_partd import board_tally, get_grid_tables, overflow_iterative
+import overflow_numpy
+from transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+
+class SearchTimeout(Exception):
+    """Raised inside a GameTree search when its deadline has passed."""
+
+
+class SearchCancelled(Exception):
+    """Raised inside a GameTree search when its cancel event has been set."""
 
 def copy_board(board):
     """
@@ -14,6 +26,67 @@ def copy_board(board):
     """
     return copy.deepcopy(board)
 
+def pack_board(board):
+    """
+    Packs a board into a flat array of one signed byte per cell, row by row.
+
+    Parameters:
+    board (list of list of int): The game board.
+
+    Returns:
+    array: The packed board, typecode 'b'.
+    """
+    return array('b', sum(board, []))
+
+def unpack_board(cells, cols):
+    """
+    Unpacks a board packed by pack_board.
+
+    Parameters:
+    cells (array): The packed board.
+    cols (int): The number of columns in the board.
+
+    Returns:
+    list of list of int: The game board.
+    """
+    flat = cells.tolist()
+    return [flat[i:i + cols] for i in range(0, len(flat), cols)]
+
+_cell_limits = {}
+
+def cell_limits(rows, cols):
+    """
+    Returns the overflow point of every cell of a board, row by row, as used by
+    a1_partd.get_overflow_list: 2 in a corner, 3 on an edge and 4 inside. Results are
+    cached per board size.
+
+    Parameters:
+    rows (int): The number of rows in the board.
+    cols (int): The number of columns in the board.
+
+    Returns:
+    list of int: The overflow point of each cell.
+    """
+    limits = _cell_limits.get((rows, cols))
+    if limits is None:
+        limits = sum(get_grid_tables(rows, cols)[1], [])
+        _cell_limits[(rows, cols)] = limits
+    return limits
+
+def add_piece_to_tally(tally, cell, player):
+    """
+    Updates a board tally in place for one piece being added to a cell, which must be
+    empty or already the player's.
+
+    Parameters:
+    tally (list of int): The a1_partd.board_tally() of the board.
+    cell (int): The value of the cell before the piece is added.
+    player (int): The player adding the piece, 1 or -1.
+    """
+    if cell == 0:
+        tally[0 if player > 0 else 1] += 1
+    tally[2 if player > 0 else 3] += 1
+
 def evaluate_board(board, player):
     """
     Evaluates the board for a given player.
@@ -42,9 +115,154 @@ def evaluate_board(board, player):
     
     return score
 
+def evaluate_tally(tally, player):
+    """
+    Evaluates a board for a given player from its tally, giving the same score as evaluate_board.
+
+    Parameters:
+    tally (list of int): The a1_partd.board_tally() of the board.
+    player (int): The player for whom the board is being evaluated, 1 or -1.
+
+    Returns:
+    int or float: The score of the board, float('inf') if the player has won and
+                  float('-inf') if the opponent has won.
+    """
+    positive, negative, positive_sum, negative_sum = tally
+    if player > 0:
+        own, other = positive, negative
+    else:
+        own, other = negative, positive
+    if other == 0:
+        return float('inf')
+    if own == 0:
+        return float('-inf')
+    return (positive_sum - negative_sum) * player
+
 class GameTree:
-    class Node:
-        def __init__(self, board, depth, player, tree_height=4,move=None):
+    class NodeBase:
+        """
+        Tree building shared by Node and CompactNode. Subclasses provide get_moves(),
+        play() and make_child().
+
+        Every node keeps the board_tally() of its board. Moves update a copy of the parent's
+        tally as cells change instead of recounting, so leaves are scored and checked for a
+        win in constant time.
+        """
+        __slots__ = ()
+
+        def generate_children(self, tree_height):
+            """
+            Generates child nodes for the current node.
+
+            Parameters:
+            tree_height (int): The maximum height of the game tree.
+            """            
+            moves = self.get_moves()
+            for move, (new_board, tally) in zip(moves, self.play_moves(moves)):
+                self.children.append(self.make_child(new_board, tree_height, move, tally=tally))
+
+        def expand(self, tree_height, order=None):
+            """
+            Lazily generates the child nodes of this node, in the same order as generate_children.
+
+            A child (and the move simulation and overflow behind it) is only built when the
+            caller asks for the next one, so a search that stops early never pays for the rest.
+            The children are not stored in self.children and have no children of their own.
+
+            Parameters:
+            tree_height (int): The maximum height of the game tree.
+            order (list of tuple of int, optional): Moves to try first, in this order. Moves in
+                                                    it that are not legal here are skipped. Default is None.
+
+            Yields:
+            Node: The next child node.
+            """
+            for r, c in self.order_moves(order):
+                new_board, tally = self.play(r, c)
+                yield self.make_child(new_board, tree_height, (r, c), lazy=True, tally=tally)
+
+        def order_moves(self, order=None):
+            """
+            Lists the moves available at this node, with the moves in order first.
+
+            Parameters:
+            order (list of tuple of int, optional): Moves to put first, in this order. Moves in
+                                                    it that are not legal here are skipped. Default is None.
+
+            Returns:
+            list of tuple of int: The moves, otherwise in generation order.
+            """
+            moves = self.get_moves()
+            if order:
+                first = []
+                for move in order:
+                    if move in moves and move not in first:
+                        first.append(move)
+                moves = first + [move for move in moves if move not in first]
+            return moves
+
+        def play_moves(self, moves):
+            """
+            Plays each of a list of moves on its own copy of this node's board.
+
+            Parameters:
+            moves (list of tuple of int): The (row, col) of each move.
+
+            Returns:
+            list of tuple: The (board, tally) after each move, as returned by play.
+            """
+            return [self.play(r, c) for r, c in moves]
+
+        def simulate_move(self, row, col):
+            """
+            Plays a move on a copy of this node's board and resolves the overflow.
+
+            Parameters:
+            row (int): The row of the move.
+            col (int): The column of the move.
+
+            Returns:
+            The board after the move, in this node's representation.
+            """
+            return self.play(row, col)[0]
+
+        def overflow(self, board, tally=None):
+            """
+            Handles the overflow logic from Assignment 1.
+
+            Uses the iterative engine without a queue, since the intermediate boards are not needed.
+
+            Parameters:
+            board (list of list of int): The game board to handle overflow.
+            tally (list of int, optional): The tally of board, updated in place. Default is None.
+
+            Returns:
+            list of list of int: The game board after handling overflow.
+            """
+            overflow_iterative(board, None, tally)
+            return board
+
+        def is_terminal(self):
+            """
+            Checks if the node is a terminal node (i.e., every cell belongs to one player).
+
+            Returns:
+            bool: True if the node is terminal, False otherwise.
+            """
+            positive, negative = self.tally[0], self.tally[1]
+            return positive == self.size() or negative == self.size()
+
+        def evaluate(self):
+            """
+            Scores this node's board for its player from its tally; the same score as evaluate_board.
+
+            Returns:
+            int or float: The score of the board.
+            """
+            return evaluate_tally(self.tally, self.player)
+
+    class Node(NodeBase):
+        def __init__(self, board, depth, player, tree_height=4,move=None, lazy=False, tally=None):
             """
             Initializes a node in the game tree.
 
@@ -55,6 +273,9 @@ class GameTree:
                           Positive values represent the player, negative values represent the opponent.
             tree_height (int, optional): The maximum height of the game tree. Default is 4.
             move (tuple of int, optional): The move that led to this node. Default is None.
+            lazy (bool, optional): If True, no children are generated here; they are produced
+                                   one at a time by expand() instead. Default is False.
+            tally (list of int, optional): The board_tally() of board, if already known. Default is None.
 
             Attributes:
             board (list of list of int): The game board at this node.
@@ -63,6 +284,8 @@ class GameTree:
             children (list of Node): The child nodes of this node.
             score (int or None): The score of this node. Default is None.
             move (tuple of int or None): The move that led to this node. Default is None.
+            key (int or None): Zobrist hash of the board, set while searching with a transposition table.
+            tally (list of int): The board_tally() of the board.
             """
             self.board = board
             self.depth = depth 
@@ -70,62 +293,248 @@ class GameTree:
             self.children = []
             self.score = None
             self.move = move  
+            self.key = None
+            self.tally = tally if tally is not None else board_tally(board)
             
-            if depth < tree_height - 1 and not self.is_terminal():
+            if not lazy and depth < tree_height - 1 and not self.is_terminal():
                 self.generate_children(tree_height)
 
-        def is_terminal(self):
+        def size(self):
+            """Returns the number of cells on the board."""
+            return len(self.board) * len(self.board[0])
+
+        def get_moves(self):
             """
-            Checks if the node is a terminal node (i.e., no further moves possible).
+            Lists the moves available to the player at this node, in generation order.
 
             Returns:
-            bool: True if the node is terminal, False otherwise.
+            list of tuple of int: The (row, col) of every cell the player owns.
             """
-            return all(cell > 0 for row in self.board for cell in row) or \
-                all(cell < 0 for row in self.board for cell in row)
+            return [(r, c) for r in range(len(self.board)) for c in range(len(self.board[r]))
+                    if self.board[r][c] * self.player > 0]
 
-        def generate_children(self, tree_height):
+        def make_child(self, board, tree_height, move, lazy=False, tally=None):
             """
-            Generates child nodes for the current node.
+            Creates a child node one level below this one.
 
             Parameters:
+            board (list of list of int): The board after the move.
             tree_height (int): The maximum height of the game tree.
-            """            
-            for r in range(len(self.board)):
-                for c in range(len(self.board[r])):
-                    if self.board[r][c] * self.player > 0:
-                        new_board = self.simulate_move(r, c)
-                        self.children.append(GameTree.Node(new_board, self.depth + 1, self.player, tree_height,move=(r, c)))
+            move (tuple of int): The move that led to the child.
+            lazy (bool, optional): If True, the child generates no children of its own. Default is False.
+            tally (list of int, optional): The tally of board, if known. Default is None.
 
-        def simulate_move(self, row, col):
+            Returns:
+            Node: The child node.
             """
-            Creates a deep copy of the given board.
+            return GameTree.Node(board, self.depth + 1, self.player, tree_height, move=move, lazy=lazy, tally=tally)
+
+        def play(self, row, col):
+            """
+            Plays a move on a copy of this node's board and resolves the overflow, keeping
+            the tally up to date.
 
             Parameters:
-            board (list of list of int): The game board to be copied.
+            row (int): The row of the move.
+            col (int): The column of the move.
 
             Returns:
-            list of list of int: A deep copy of the given board.
+            tuple: (board, tally) after the move.
             """
             new_board = [row.copy() for row in self.board]
+            tally = self.tally[:]
+            add_piece_to_tally(tally, new_board[row][col], self.player)
             new_board[row][col] += self.player
-            return self.overflow(new_board)
+            return self.overflow(new_board, tally), tally
+
+    class BatchNode(Node):
+        """
+        A Node that generates all of its children with one call to the numpy overflow
+        backend (overflow_numpy.simulate_moves) instead of one overflow per move. expand()
+        therefore simulates every move up front, even those a search prunes.
+        """
 
-        def overflow(self, board):
+        def make_child(self, board, tree_height, move, lazy=False, tally=None):
             """
-            Handles the overflow logic from Assignment 1.
+            Creates a child node one level below this one.
 
             Parameters:
-            board (list of list of int): The game board to handle overflow.
+            board (list of list of int): The board after the move.
+            tree_height (int): The maximum height of the game tree.
+            move (tuple of int): The move that led to the child.
+            lazy (bool, optional): If True, the child generates no children of its own. Default is False.
+            tally (list of int, optional): The tally of board, if known. Default is None.
 
             Returns:
-            list of list of int: The game board after handling overflow.
+            BatchNode: The child node.
             """
-            tmpQ=Queue()
-            overflow(board,tmpQ)
-            return board
+            return GameTree.BatchNode(board, self.depth + 1, self.player, tree_height, move=move, lazy=lazy,
+                                      tally=tally)
+
+        def play_moves(self, moves):
+            """
+            Plays each of a list of moves on its own copy of this node's board, resolving all
+            of the overflows in one numpy batch. The batch does not track tallies, so each
+            child counts its own board.
+
+            Parameters:
+            moves (list of tuple of int): The (row, col) of each move.
+
+            Returns:
+            list of tuple: The (board, None) after each move.
+            """
+            return [(board, None) for board in overflow_numpy.simulate_moves(self.board, self.player, moves)]
+
+        def expand(self, tree_height, order=None):
+            """
+            Generates the child nodes of this node like Node.expand, simulating all moves in one batch.
+
+            Parameters:
+            tree_height (int): The maximum height of the game tree.
+            order (list of tuple of int, optional): Moves to try first, in this order. Default is None.
+
+            Yields:
+            BatchNode: The next child node.
+            """
+            moves = self.order_moves(order)
+            for move, (new_board, tally) in zip(moves, self.play_moves(moves)):
+                yield self.make_child(new_board, tree_height, move, lazy=True, tally=tally)
+
+    class CompactNode(NodeBase):
+        """
+        A Node that stores its board as a flat array('b') of one signed byte per cell and has
+        no __dict__, which makes a fully built tree much smaller. The board attribute unpacks
+        the cells into a list of lists on demand.
+        """
+        __slots__ = ('cells', 'cols', 'depth', 'player', 'children', 'score', 'move', 'key', 'tally')
+
+        def __init__(self, board, depth, player, tree_height=4, move=None, lazy=False, cols=None, tally=None):
+            """
+            Initializes a compact node in the game tree.
+
+            Parameters:
+            board (list of list of int or array): The game board, or its packed cells if cols is given.
+            depth (int): The depth of this node in the game tree.
+            player (int): The player making the move at this node.
+            tree_height (int, optional): The maximum height of the game tree. Default is 4.
+            move (tuple of int, optional): The move that led to this node. Default is None.
+            lazy (bool, optional): If True, no children are generated here. Default is False.
+            cols (int, optional): The number of columns, when board is already packed. Default is None.
+            tally (list of int, optional): The board_tally() of the board, if already known. Default is None.
+
+            Attributes:
+            cells (array): The packed board, row by row.
+            cols (int): The number of columns in the board.
+            Other attributes are as for Node.
+            """
+            if cols is None:
+                cols = len(board[0])
+                if tally is None:
+                    tally = board_tally(board)
+                board = pack_board(board)
+            elif tally is None:
+                tally = board_tally((board,))
+            self.cells = board
+            self.cols = cols
+            self.depth = depth
+            self.player = player
+            self.children = []
+            self.score = None
+            self.move = move
+            self.key = None
+            self.tally = tally
+
+            if not lazy and depth < tree_height - 1 and not self.is_terminal():
+                self.generate_children(tree_height)
+
+        @property
+        def board(self):
+            """list of list of int: The game board at this node, unpacked."""
+            return unpack_board(self.cells, self.cols)
+
+        def size(self):
+            """Returns the number of cells on the board."""
+            return len(self.cells)
+
+        def get_moves(self):
+            """
+            Lists the moves available to the player at this node, in generation order.
+
+            Returns:
+            list of tuple of int: The (row, col) of every cell the player owns.
+            """
+            cols = self.cols
+            player = self.player
+            return [divmod(i, cols) for i, cell in enumerate(self.cells) if cell * player > 0]
+
+        def make_child(self, cells, tree_height, move, lazy=False, tally=None):
+            """
+            Creates a child node one level below this one.
+
+            Parameters:
+            cells (array): The packed board after the move.
+            tree_height (int): The maximum height of the game tree.
+            move (tuple of int): The move that led to the child.
+            lazy (bool, optional): If True, the child generates no children of its own. Default is False.
+            tally (list of int, optional): The tally of the board, if known. Default is None.
+
+            Returns:
+            CompactNode: The child node.
+            """
+            return GameTree.CompactNode(cells, self.depth + 1, self.player, tree_height, move=move,
+                                        lazy=lazy, cols=self.cols, tally=tally)
 
-    def __init__(self, board, player, tree_height = 4):
+        def is_stable(self):
+            """Returns True if no cell of this node's board is at its overflow point."""
+            limits = cell_limits(len(self.cells) // self.cols, self.cols)
+            return all(map(operator.lt, map(abs, self.cells), limits))
+
+        def play_moves(self, moves):
+            """
+            Plays each of a list of moves on its own copy of this node's board, checking
+            only once whether the board has a cell at its overflow point.
+
+            Parameters:
+            moves (list of tuple of int): The (row, col) of each move.
+
+            Returns:
+            list of tuple: The (cells, tally) after each move, as returned by play.
+            """
+            stable = self.is_stable()
+            return [self.play(r, c, stable) for r, c in moves]
+
+        def play(self, row, col, stable=None):
+            """
+            Plays a move on a copy of this node's board and resolves the overflow, keeping
+            the tally up to date.
+
+            When no cell is at its overflow point after the move, the packed cells are copied
+            and updated directly.
+
+            Parameters:
+            row (int): The row of the move.
+            col (int): The column of the move.
+            stable (bool, optional): The result of is_stable(), if already known. Default is None.
+
+            Returns:
+            tuple: (cells, tally) after the move, the board packed.
+            """
+            cols = self.cols
+            index = row * cols + col
+            tally = self.tally[:]
+            add_piece_to_tally(tally, self.cells[index], self.player)
+            if abs(self.cells[index] + self.player) < cell_limits(len(self.cells) // cols, cols)[index] and \
+                    (stable if stable is not None else self.is_stable()):
+                # nothing can overflow, so skip unpacking the board
+                new_cells = self.cells[:]
+                new_cells[index] += self.player
+                return new_cells, tally
+            new_board = self.board
+            new_board[row][col] += self.player
+            return pack_board(self.overflow(new_board, tally)), tally
+
+    def __init__(self, board, player, tree_height = 4, pruning=False, table=None, deadline=None, order=None, compact=False,
+                 backend='python', cancel=None):
         """
         Initializes the game tree.
 
@@ -134,11 +543,70 @@ class GameTree:
         player (int): The player making the first move. 
                       Positive values represent the player, negative values represent the opponent.
         tree_height (int, optional): The maximum height of the game tree. Default is 4.
+        pruning (bool, optional): If True, get_move() uses alpha-beta search and the tree is
+                                  expanded lazily while searching instead of being built here.
+                                  Default is False.
+        table (TranspositionTable, optional): Table of already searched positions, which may be
+                                              shared between trees. Implies pruning. Default is None.
+        deadline (float, optional): time.perf_counter() value after which the pruned search raises
+                                    SearchTimeout. Default is None (no deadline).
+        order (list of tuple of int, optional): Root moves to search first, in this order. Default is None.
+        compact (bool, optional): If True, the tree is made of CompactNode instead of Node. Default is False.
+        backend (str, optional): How children are generated: 'python' resolves each move's overflow
+                                 on its own, 'numpy' resolves all of a node's moves in one batch
+                                 (BatchNode, requires numpy, not combined with compact). Default is 'python'.
+        cancel (threading.Event, optional): Event another thread sets to stop the pruned search, which
+                                            then raises SearchCancelled. Default is None.
         """
         self.player = player
         self.board = copy_board(board)
-        self.root = self.Node(board, 0, player, tree_height)
+        self.tree_height = tree_height
+        self.table = table
+        self.pruning = pruning or table is not None
+        self.deadline = deadline
+        self.cancel = cancel
+        self.order = order
+        if backend == 'numpy':
+            if compact:
+                raise ValueError("the numpy backend cannot be combined with compact nodes")
+            if overflow_numpy.np is None:
+                raise ImportError("the numpy backend requires numpy")
+            node_type = self.BatchNode
+        elif backend == 'python':
+            node_type = self.CompactNode if compact else self.Node
+        else:
+            raise ValueError("unknown backend: {}".format(backend))
+        if node_type is self.BatchNode and not self.pruning:
+            self.root = node_type(board, 0, player, tree_height, lazy=True)
+            self.build_levels()
+        else:
+            self.root = node_type(board, 0, player, tree_height, lazy=self.pruning)
+
 
+    def build_levels(self):
+        """
+        Builds the whole tree one level at a time, simulating every move of every node on a
+        level in a single numpy batch. The tree is the same as the one built node by node.
+        """
+        level = [self.root]
+        while level:
+            parents = []
+            moves = []
+            boards = []
+            for node in level:
+                if node.depth < self.tree_height - 1 and not node.is_terminal():
+                    for move in node.get_moves():
+                        parents.append(node)
+                        moves.append(move)
+                        boards.append(node.board)
+            if not moves:
+                break
+            new_boards = overflow_numpy.simulate_batch(boards, self.player, moves)
+            level = []
+            for parent, move, new_board in zip(parents, moves, new_boards):
+                child = parent.make_child(new_board, self.tree_height, move, lazy=True)
+                parent.children.append(child)
+                level.append(child)
 
     def get_move(self):
         """
@@ -147,6 +615,8 @@ class GameTree:
         Returns:
         tuple of int: The best move for the player.
         """
+        if self.pruning:
+            return self.alphabeta_root()
         self.minimax(self.root, True)
         best_move = max(self.root.children, key=lambda child: child.score)
         return best_move.move
@@ -164,7 +634,7 @@ class GameTree:
         int: The score of the node.
         """
         if not node.children:
-            node.score = evaluate_board(node.board, node.player)
+            node.score = node.evaluate()
             return node.score
 
         if maximizing:
@@ -174,7 +644,162 @@ class GameTree:
 
         return node.score
 
+    def alphabeta_root(self):
+        """
+        Alpha-beta search from the root, returning the same move as minimax.
+
+        Root children are searched in generation order (or self.order first) and a child only
+        replaces the current best on a strictly greater score, so ties go to the first move
+        searched, as with max(). The root children are kept in self.root.children.
+
+        Returns:
+        tuple of int: The best move for the player.
+        """
+        root = self.root
+        best_move = None
+        best_score = None
+        alpha = float('-inf')
+        if self.table is not None:
+            root.key = self.table.hasher.hash_board(root.board)
+        if root.depth < self.tree_height - 1 and not root.is_terminal():
+            for child in root.expand(self.tree_height, self.order):
+                root.children.append(child)
+                if self.table is not None:
+                    child.key = self.table.hasher.update(root.key, root.board, child.board)
+                score = self.alphabeta(child, False, alpha, float('inf'))
+                if best_score is None or score > best_score:
+                    best_score = score
+                    best_move = child.move
+                    alpha = max(alpha, score)
+
+        if best_move is None:
+            raise ValueError('get_move() called on a tree with no moves')
+        root.score = best_score
+        return best_move
+
+    def alphabeta(self, node, maximizing, alpha, beta):
+        """
+        Minimax with alpha-beta pruning, expanding children only as they are visited.
+
+        With a transposition table, positions with moves left to search are looked up before
+        expanding and stored afterwards, with the bound the score represents. The best move
+        recorded for a position, from a search of any depth, is tried first.
+
+        Parameters:
+        node (Node): The current node in the game tree.
+        maximizing (bool): True if the current move is maximizing, False if minimizing.
+        alpha (int or float): The score the maximizing side is already assured of.
+        beta (int or float): The score the minimizing side is already assured of.
+
+        Returns:
+        int or float: The score of the node. If the score falls outside (alpha, beta),
+                      the value returned is a bound on it on the same side.
+
+        Raises:
+        SearchTimeout: If the tree has a deadline and it has passed.
+        SearchCancelled: If the tree's cancel event has been set.
+        """
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchCancelled()
+        if node.depth >= self.tree_height - 1 or node.is_terminal():
+            node.score = node.evaluate()
+            return node.score
+
+        table = self.table
+        depth = self.tree_height - 1 - node.depth
+        order = None
+        if table is not None:
+            position = table.position_key(node.key, node.player, maximizing)
+            entry, move = table.probe(position, depth)
+            if move is not None:
+                order = [move]
+            if entry is not None:
+                score, _, bound, _ = entry
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    node.score = score
+                    return score
+
+        alpha_start, beta_start = alpha, beta
+        best = None
+        best_move = None
+        for child in node.expand(self.tree_height, order):
+            if table is not None:
+                child.key = table.hasher.update(node.key, node.board, child.board)
+            score = self.alphabeta(child, not maximizing, alpha, beta)
+            if maximizing:
+                if best is None or score > best:
+                    best = score
+                    best_move = child.move
+                    alpha = max(alpha, best)
+            else:
+                if best is None or score < best:
+                    best = score
+                    best_move = child.move
+                    beta = min(beta, best)
+            if alpha >= beta:
+                break
+
+        if best is None:
+            best = node.evaluate()
+        if table is not None:
+            if best <= alpha_start:
+                bound = UPPER
+            elif best >= beta_start:
+                bound = LOWER
+            else:
+                bound = EXACT
+            table.store(position, best, depth, bound, best_move)
+        node.score = best
+        return best
+
     def clear_tree(self):
         """Clears the tree for garbage collection."""
         self.root = None
+
+
+def get_timed_move(board, player, time_limit, table=None, max_height=32, cancel=None):
+    """
+    Finds a move by iterative deepening within a time budget.
+
+    Searches with tree heights 2, 3, 4, ... and returns the best move of the last height
+    that finished before the deadline. The first height always runs to completion so there
+    is always a move. Each height searches the root moves in the order the previous height
+    scored them, and the transposition table supplies the best move found so far for
+    positions further down.
+
+    Parameters:
+    board (list of list of int): The game board.
+    player (int): The player to move.
+    time_limit (int or float): The time budget in milliseconds.
+    table (TranspositionTable, optional): Table to search with, which may be shared between calls.
+                                          Default is a new table for this call.
+    max_height (int, optional): The largest tree height to search. Default is 32.
+    cancel (threading.Event, optional): Event that stops the search when set. Default is None.
+
+    Returns:
+    tuple of int: The best move found for the player.
+
+    Raises:
+    SearchCancelled: If cancel was set before the search finished.
+    """
+    deadline = time.perf_counter() + time_limit / 1000
+    if table is None:
+        table = TranspositionTable()
+
+    best_move = None
+    order = None
+    for height in range(2, max_height + 1):
+        tree = GameTree(board, player, height, table=table,
+                        deadline=deadline if best_move is not None else None, order=order, cancel=cancel)
+        try:
+            best_move = tree.get_move()
+        except SearchTimeout:
+            break
+        order = [child.move for child in sorted(tree.root.children, key=lambda child: child.score, reverse=True)]
+        tree.clear_tree()
+        if time.perf_counter() >= deadline:
+            break
+    return best_move
     
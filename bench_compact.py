@@ -0,0 +1,46 @@
+#   Benchmark of peak memory and build time for GameTree with Node and with CompactNode.
+#   To use this, run: python bench_compact.py
+
+import time
+import tracemalloc
+from a2_partb import GameTree
+from benchmark import make_boards
+
+
+def measure(board, tree_height, compact):
+    """Returns (seconds, peak bytes) to build one full tree, the time being the best of 7 runs."""
+    tracemalloc.start()
+    tree = GameTree(board, 1, tree_height, compact=compact)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    tree.clear_tree()
+
+    best = None
+    for _ in range(7):
+        start = time.perf_counter()
+        GameTree(board, 1, tree_height, compact=compact)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, peak
+
+
+def main():
+    boards = make_boards(3, seed=99, density=0.5)
+    print(f"{'height':>6} {'node':>12} {'time':>9} {'peak KiB':>10} {'time/Node':>10} {'peak/Node':>10}")
+    for tree_height in (3, 4, 5):
+        node = None
+        for compact in (False, True):
+            total_time = 0
+            total_peak = 0
+            for board in boards:
+                elapsed, peak = measure(board, tree_height, compact)
+                total_time += elapsed
+                total_peak += peak
+            if node is None:
+                node = (total_time, total_peak)
+            name = "CompactNode" if compact else "Node"
+            print(f"{tree_height:>6} {name:>12} {total_time:8.3f}s {total_peak // 1024:>10} "
+                  f"{total_time / node[0]:>10.2f} {total_peak / node[1]:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#   Benchmark of memory per entry and operations per second for the chained HashTable
+#   and the open addressing OpenHashTable, and of insert latency percentiles for HashTable
+#   resizing all at once and incrementally.
+#   To use this, run: python bench_hashtable.py
+
+import functools
+import gc
+import random
+import time
+import tracemalloc
+from a2_parta import HashTable, OpenHashTable
+
+ENGINES = (("chained", HashTable), ("open", OpenHashTable))
+
+
+def make_keys(count, seed=1):
+    """Returns count distinct string keys from a fixed seed."""
+    rng = random.Random(seed)
+    return ["key%d" % rng.getrandbits(48) for _ in range(count)]
+
+
+def memory_per_entry(engine, keys):
+    """Returns the bytes the table itself allocates per entry, not counting the keys and values."""
+    tracemalloc.start()
+    table = engine()
+    for key in keys:
+        table.insert(key, key)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / len(table)
+
+
+def ops_per_second(engine, keys):
+    """Returns a dict of operations per second for insert, search (hits and misses), modify and remove."""
+    missing = [key + "x" for key in keys]
+    rates = {}
+
+    def timed(name, function):
+        best = None
+        for _ in range(3):
+            table = engine()
+            if name != "insert":
+                for key in keys:
+                    table.insert(key, key)
+            start = time.perf_counter()
+            function(table)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        rates[name] = len(keys) / best
+
+    timed("insert", lambda table: [table.insert(key, key) for key in keys])
+    timed("search", lambda table: [table.search(key) for key in keys])
+    timed("miss", lambda table: [table.search(key) for key in missing])
+    timed("modify", lambda table: [table.modify(key, 0) for key in keys])
+    timed("remove", lambda table: [table.remove(key) for key in keys])
+    return rates
+
+
+def insert_latencies(engine, keys):
+    """
+    Returns the time of every insert, in microseconds, filling one table from empty.
+    The garbage collector is off while timing (as in timeit) so its pauses do not hide the resizes.
+    """
+    table = engine()
+    clock = time.perf_counter
+    latencies = []
+    gc.disable()
+    try:
+        for key in keys:
+            start = clock()
+            table.insert(key, key)
+            latencies.append((clock() - start) * 1e6)
+    finally:
+        gc.enable()
+    return latencies
+
+
+def percentile(ordered, fraction):
+    """Returns the value at fraction (0 to 1) of a sorted list."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    print(f"{'entries':>8} {'engine':>8} {'B/entry':>8} {'insert':>10} {'search':>10} "
+          f"{'miss':>10} {'modify':>10} {'remove':>10}   (ops/s)")
+    for count in (1000, 10000, 100000):
+        keys = make_keys(count)
+        for name, engine in ENGINES:
+            memory = memory_per_entry(engine, keys)
+            rates = ops_per_second(engine, keys)
+            print(f"{count:>8} {name:>8} {memory:8.1f} {rates['insert']:10.0f} {rates['search']:10.0f} "
+                  f"{rates['miss']:10.0f} {rates['modify']:10.0f} {rates['remove']:10.0f}")
+
+    print()
+    print(f"{'entries':>8} {'resize':>12} {'p50':>8} {'p99':>8} {'p99.9':>8} {'max':>10}   (insert, us)")
+    keys = make_keys(500000, seed=2)
+    for name, engine in (("all at once", HashTable),
+                         ("incremental", functools.partial(HashTable, incremental=True))):
+        ordered = sorted(insert_latencies(engine, keys))
+        print(f"{len(keys):>8} {name:>12} {percentile(ordered, 0.5):8.2f} {percentile(ordered, 0.99):8.2f} "
+              f"{percentile(ordered, 0.999):8.2f} {ordered[-1]:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
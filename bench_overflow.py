@@ -0,0 +1,65 @@
+#   Benchmark of overflow against overflow_iterative on long chain reactions and larger grids.
+#   To use this, run: python bench_overflow.py
+
+import random
+import sys
+import time
+from a1_partc import Queue
+from a1_partd import overflow, overflow_iterative
+
+
+def cascade_grid(cols):
+    """A 3 row grid whose top row is one short of overflowing everywhere: one long chain reaction."""
+    grid = [[2] * cols, [0] * cols, [0] * cols]
+    grid[2][cols - 1] = -1
+    return grid
+
+
+def busy_grid(size, seed):
+    """A square grid filled close to the overflow point, with both players' pieces."""
+    rng = random.Random(seed)
+    grid = []
+    for r in range(size):
+        row = []
+        for c in range(size):
+            limit = 4 - (r in (0, size - 1)) - (c in (0, size - 1))
+            row.append(rng.choice((1, -1)) * rng.randint(limit - 1, limit))
+        grid.append(row)
+    return grid
+
+
+def time_engine(engine, grid, use_queue, repeat=3):
+    """Returns (best seconds, waves) for running engine on copies of grid, or (None, None) on RecursionError."""
+    best = None
+    waves = None
+    for _ in range(repeat):
+        copy = [row[:] for row in grid]
+        start = time.perf_counter()
+        try:
+            waves = engine(copy, Queue()) if use_queue else engine(copy)
+        except RecursionError:
+            return None, None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, waves
+
+
+def main():
+    sys.setrecursionlimit(10000)
+    cases = [("cascade 3x%d" % cols, cascade_grid(cols)) for cols in (100, 400, 1600)]
+    cases += [("busy %dx%d" % (size, size), busy_grid(size, size)) for size in (5, 20, 60)]
+
+    print(f"{'case':>16} {'waves':>6} {'overflow':>10} {'iterative':>10} {'no queue':>10} {'speedup':>8}")
+    for name, grid in cases:
+        base, waves = time_engine(overflow, grid, True)
+        iterative, iterative_waves = time_engine(overflow_iterative, grid, True)
+        bare, _ = time_engine(overflow_iterative, grid, False)
+        if base is None:
+            print(f"{name:>16} {iterative_waves:>6} {'recursion':>10} {iterative:9.4f}s {bare:9.4f}s {'-':>8}")
+            continue
+        assert waves == iterative_waves
+        print(f"{name:>16} {waves:>6} {base:9.4f}s {iterative:9.4f}s {bare:9.4f}s {base / bare:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
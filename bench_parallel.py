@@ -0,0 +1,35 @@
+#   Benchmark of ParallelSearch speedup against the number of worker processes.
+#   To use this, run: python bench_parallel.py [tree_height]
+
+import os
+import sys
+import time
+from a2_partb import GameTree
+from benchmark import make_boards
+from parallel_search import ParallelSearch
+
+
+def main():
+    tree_height = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    boards = make_boards(4)
+
+    start = time.perf_counter()
+    expected = [GameTree(board, 1, tree_height, pruning=True).get_move() for board in boards]
+    serial = time.perf_counter() - start
+    print(f"tree height {tree_height}, {len(boards)} boards")
+    print(f"serial      {serial:8.3f}s")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        with ParallelSearch(workers) as search:
+            search.get_move(boards[0], 1, 2)  # start the worker processes before timing
+            start = time.perf_counter()
+            moves = [search.get_move(board, 1, tree_height) for board in boards]
+            elapsed = time.perf_counter() - start
+        assert moves == expected, "parallel search chose a different move"
+        print(f"workers {workers:3} {elapsed:8.3f}s  speedup {serial / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#   Benchmark of cold start for precomputed position data: filling a HashTable from scratch
+#   against opening a snapshot with mmap, and the cost of searching each.
+#   To use this, run: python bench_snapshot.py
+
+import os
+import random
+import struct
+import tempfile
+import time
+from a2_parta import HashTable
+from table_snapshot import SnapshotTable, save_snapshot
+
+
+def main():
+    rng = random.Random(1)
+    count = 200000
+    keys = [struct.pack("<Q", rng.getrandbits(64)) for _ in range(count)]
+    items = [(key, struct.pack("<bb", rng.randrange(5), rng.randrange(6))) for key in keys]
+    probes = rng.sample(keys, 10000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "positions.snap")
+        start = time.perf_counter()
+        save_snapshot(path, items, 8, 2)
+        print(f"save {count} records: {time.perf_counter() - start:.3f}s, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        table = HashTable.presized(count)
+        table.insert_many(items)
+        print(f"HashTable fill:       {time.perf_counter() - start:.4f}s")
+        start = time.perf_counter()
+        table.search_many(probes)
+        print(f"HashTable {len(probes)} searches: {time.perf_counter() - start:.4f}s")
+
+        start = time.perf_counter()
+        snapshot = SnapshotTable(path)
+        print(f"SnapshotTable open:   {time.perf_counter() - start:.6f}s")
+        start = time.perf_counter()
+        for key in probes:
+            snapshot.search(key)
+        print(f"SnapshotTable {len(probes)} searches: {time.perf_counter() - start:.4f}s")
+        snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
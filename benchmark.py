@@ -0,0 +1,411 @@
+#   Reproducible performance benchmarks for the overflow engines, GameTree, HashTable and
+#   the a1_partc containers. Boards and keys come from fixed seeds so runs are comparable.
+#   To use this, run: python benchmark.py --output baseline.json
+#   and later:        python benchmark.py --compare baseline.json
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from a1_partc import Stack, Queue, Deque
+from a1_partd import overflow, overflow_iterative
+from a2_parta import HashTable, OpenHashTable
+from a2_partb import GameTree
+
+CORPUS_SEED = 20240601
+ROWS = 5
+COLS = 6
+
+
+def best_time(setup, repeat):
+    """
+    Runs a benchmark repeat times and returns the fastest run. Only the callable that
+    setup returns is timed, so the time setup takes to build its state is excluded.
+
+    Parameters:
+    setup (callable): Called with no arguments before each run, returns the callable to time.
+    repeat (int): Number of runs.
+
+    Returns:
+    float: The fastest run in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        timed = setup()
+        if not callable(timed):
+            raise TypeError("benchmark set up must return the function to time")
+        start = time.perf_counter()
+        timed()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def corpus(count, seed=CORPUS_SEED):
+    """
+    Builds a fixed set of positions by playing random valid moves from the starting board.
+
+    Parameters:
+    count (int): Number of positions.
+    seed (int, optional): Seed for the moves. Default is CORPUS_SEED.
+
+    Returns:
+    list of tuple: (board, player, move) where board is the position before player plays
+                   move, every board settled and still undecided.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = [[0] * COLS for _ in range(ROWS)]
+        board[0][0] = 1
+        board[ROWS - 1][COLS - 1] = -1
+        player = 1
+        for _ in range(rng.randint(6, 40)):
+            moves = [(r, c) for r in range(ROWS) for c in range(COLS) if board[r][c] * player >= 0]
+            move = rng.choice(moves)
+            positions.append(([row[:] for row in board], player, move))
+            board[move[0]][move[1]] += player
+            overflow_iterative(board)
+            player = -player
+            signs = {cell > 0 for row in board for cell in row if cell != 0}
+            if len(signs) < 2 or len(positions) >= count:
+                break
+    return positions
+
+
+def make_boards(count, seed=1234, rows=ROWS, cols=COLS, density=0.8):
+    """
+    Builds a fixed set of mid-game boards, none with a cell at its overflow point.
+
+    Parameters:
+    count (int): Number of boards.
+    seed (int, optional): Seed for the cells. Default is 1234.
+    rows (int, optional): Number of rows on each board. Default is ROWS.
+    cols (int, optional): Number of columns on each board. Default is COLS.
+    density (float, optional): Chance that a cell holds pieces. Default is 0.8.
+
+    Returns:
+    list of list of list of int: The boards.
+    """
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = [[0] * cols for _ in range(rows)]
+        for r in range(rows):
+            for c in range(cols):
+                limit = 3 - (r in (0, rows - 1)) - (c in (0, cols - 1))
+                if rng.random() < density:
+                    board[r][c] = rng.choice((1, -1)) * rng.randint(1, limit)
+        boards.append(board)
+    return boards
+
+
+def bench_overflow(repeat, quick):
+    """Times both overflow engines on every move of the corpus, and on one long chain reaction."""
+    results = {}
+    positions = corpus(200 if quick else 1000)
+    grids = []
+    for board, player, (row, col) in positions:
+        grid = [r[:] for r in board]
+        grid[row][col] += player
+        grids.append(grid)
+
+    def run(engine, with_queue):
+        def setup():
+            copies = [[r[:] for r in grid] for grid in grids]
+            if with_queue:
+                return lambda: [engine(grid, Queue()) for grid in copies]
+            return lambda: [engine(grid) for grid in copies]
+        return setup
+
+    results["overflow/corpus/recursive"] = best_time(run(overflow, True), repeat)
+    results["overflow/corpus/iterative"] = best_time(run(overflow_iterative, True), repeat)
+    results["overflow/corpus/iterative_no_queue"] = best_time(run(overflow_iterative, False), repeat)
+
+    cols = 200 if quick else 600
+    cascade = [[2] * cols, [0] * cols, [0] * cols]
+    cascade[2][cols - 1] = -1
+    results["overflow/cascade/iterative"] = best_time(
+        lambda: (lambda grid: lambda: overflow_iterative(grid))([r[:] for r in cascade]), repeat)
+    return results
+
+
+def bench_gametree(repeat, quick):
+    """Times GameTree construction and get_move per tree height, with and without pruning."""
+    results = {}
+    positions = corpus(40, seed=CORPUS_SEED + 1)[::4 if quick else 2]
+    heights = (2, 3) if quick else (2, 3, 4)
+    for height in heights:
+        results[f"gametree/build/h{height}"] = best_time(
+            lambda: lambda: [GameTree(board, player, height) for board, player, _ in positions], repeat)
+
+        def minimax_setup():
+            trees = [GameTree(board, player, height) for board, player, _ in positions]
+            return lambda: [tree.get_move() for tree in trees]
+        results[f"gametree/get_move/h{height}"] = best_time(minimax_setup, repeat)
+
+        results[f"gametree/alphabeta/h{height}"] = best_time(
+            lambda: lambda: [GameTree(board, player, height, pruning=True).get_move()
+                             for board, player, _ in positions], repeat)
+    return results
+
+
+def bench_hashtable(repeat, quick):
+    """
+    Times insert (growing from the default capacity), search, remove, _resize and the bulk
+    insert_many and search_many for the chained HashTable and the open addressing OpenHashTable.
+    """
+    results = {}
+    sizes = (1000, 10000) if quick else (1000, 10000, 100000)
+    for prefix, engine in (("hashtable", HashTable), ("hashtable_open", OpenHashTable)):
+        for size in sizes:
+            rng = random.Random(CORPUS_SEED + size)
+            keys = ["key%d" % rng.getrandbits(48) for _ in range(size)]
+
+            def filled():
+                table = engine()
+                for key in keys:
+                    table.insert(key, key)
+                return table
+
+            def insert_setup():
+                table = engine()
+                return lambda: [table.insert(key, key) for key in keys]
+
+            def search_setup():
+                table = filled()
+                return lambda: [table.search(key) for key in keys]
+
+            def remove_setup():
+                table = filled()
+                return lambda: [table.remove(key) for key in keys]
+
+            def resize_setup():
+                table = filled()
+                return table._resize
+
+            def insert_many_setup():
+                table = engine()
+                pairs = [(key, key) for key in keys]
+                return lambda: table.insert_many(pairs)
+
+            def search_many_setup():
+                table = filled()
+                return lambda: table.search_many(keys)
+
+            results[f"{prefix}/insert/{size}"] = best_time(insert_setup, repeat)
+            results[f"{prefix}/search/{size}"] = best_time(search_setup, repeat)
+            results[f"{prefix}/remove/{size}"] = best_time(remove_setup, repeat)
+            results[f"{prefix}/resize/{size}"] = best_time(resize_setup, repeat)
+            results[f"{prefix}/insert_many/{size}"] = best_time(insert_many_setup, repeat)
+            results[f"{prefix}/search_many/{size}"] = best_time(search_many_setup, repeat)
+    return results
+
+
+def bench_containers(repeat, quick):
+    """Times filling and emptying Stack, Queue and Deque at several sizes."""
+    results = {}
+    sizes = (1000, 10000) if quick else (1000, 10000, 100000)
+    for size in sizes:
+        items = list(range(size))
+
+        def stack_setup():
+            def run():
+                stack = Stack()
+                for item in items:
+                    stack.push(item)
+                while not stack.is_empty():
+                    stack.pop()
+            return run
+
+        def queue_setup():
+            def run():
+                queue = Queue()
+                for item in items:
+                    queue.enqueue(item)
+                while not queue.is_empty():
+                    queue.dequeue()
+            return run
+
+        def deque_back_front_setup():
+            def run():
+                deque = Deque()
+                for item in items:
+                    deque.push_back(item)
+                while not deque.is_empty():
+                    deque.pop_front()
+            return run
+
+        def deque_front_back_setup():
+            def run():
+                deque = Deque()
+                for item in items:
+                    deque.push_front(item)
+                while not deque.is_empty():
+                    deque.pop_back()
+            return run
+
+        def deque_index_setup():
+            deque = Deque()
+            for item in items:
+                deque.push_back(item)
+            return lambda: [deque[i] for i in range(size)]
+
+        results[f"containers/stack/{size}"] = best_time(stack_setup, repeat)
+        results[f"containers/queue/{size}"] = best_time(queue_setup, repeat)
+        results[f"containers/deque_back_front/{size}"] = best_time(deque_back_front_setup, repeat)
+        results[f"containers/deque_front_back/{size}"] = best_time(deque_front_back_setup, repeat)
+        results[f"containers/deque_index/{size}"] = best_time(deque_index_setup, repeat)
+
+    # the ring buffer Queue and Deque also scale to a million items
+    for size in sizes + (() if quick else (1000000,)):
+        items = list(range(size))
+
+        def queue_steady_setup():
+            # a BFS like pattern: the queue stays short while many items pass through it
+            def run():
+                queue = Queue()
+                for item in items:
+                    queue.enqueue(item)
+                    queue.enqueue(item)
+                    queue.dequeue()
+                while not queue.is_empty():
+                    queue.dequeue()
+            return run
+
+        def queue_bulk_setup():
+            def run():
+                queue = Queue()
+                queue.enqueue_many(items)
+                queue.drain()
+            return run
+
+        def deque_window_setup():
+            # a sliding window of 64 items, as in a work stealing or windowed maximum loop
+            def run():
+                deque = Deque()
+                for item in items:
+                    deque.push_back(item)
+                    if len(deque) > 64:
+                        deque.pop_front()
+                for _ in deque:
+                    pass
+            return run
+
+        def deque_rotate_setup():
+            deque = Deque()
+            deque.extend_right(items)
+            deque.push_back(size)
+            return lambda: [deque.rotate(step) for step in (1, -1, 1000, -1000)]
+
+        results[f"containers/queue_steady/{size}"] = best_time(queue_steady_setup, repeat)
+        results[f"containers/queue_bulk/{size}"] = best_time(queue_bulk_setup, repeat)
+        results[f"containers/deque_window/{size}"] = best_time(deque_window_setup, repeat)
+        results[f"containers/deque_rotate/{size}"] = best_time(deque_rotate_setup, repeat)
+    return results
+
+
+SUITES = {
+    "overflow": bench_overflow,
+    "gametree": bench_gametree,
+    "hashtable": bench_hashtable,
+    "containers": bench_containers,
+}
+
+
+def run_suites(names, repeat, quick):
+    """
+    Runs the named benchmark suites.
+
+    Parameters:
+    names (list of str): Keys of SUITES to run.
+    repeat (int): Runs per benchmark; the fastest is kept.
+    quick (bool): If True, use smaller inputs.
+
+    Returns:
+    dict: The report, with "meta" describing the run and "results" mapping benchmark name to seconds.
+    """
+    results = {}
+    for name in names:
+        results.update(SUITES[name](repeat, quick))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "quick": quick,
+            "corpus_seed": CORPUS_SEED,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """
+    Compares a report against a baseline report.
+
+    Parameters:
+    report (dict): The current report.
+    baseline (dict): The baseline report.
+    threshold (float): Allowed slowdown as a fraction; 0.1 flags anything over 10% slower.
+
+    Returns:
+    list of tuple: (name, baseline seconds, current seconds, ratio, regressed) for each
+                   benchmark present in both reports.
+    """
+    rows = []
+    for name, seconds in sorted(report["results"].items()):
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = seconds / base if base > 0 else float('inf')
+        rows.append((name, base, seconds, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks.")
+    parser.add_argument("suites", nargs="*",
+                        help="suites to run: %s (default: all)" % ", ".join(sorted(SUITES)))
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, the fastest is kept")
+    parser.add_argument("--quick", action="store_true", help="use smaller inputs")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="slowdown that counts as a regression (default: 0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.suites) - set(SUITES))
+    if unknown:
+        parser.error("unknown suite(s): %s" % ", ".join(unknown))
+    names = args.suites or sorted(SUITES)
+    report = run_suites(names, args.repeat, args.quick)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = 0
+        for name, base, seconds, ratio, regressed in compare(report, baseline, args.threshold):
+            flag = "REGRESSION" if regressed else ""
+            regressions += regressed
+            print(f"{name:45} {base * 1000:10.3f}ms {seconds * 1000:10.3f}ms {ratio:6.2f}x {flag}",
+                  file=sys.stderr)
+        if regressions:
+            print(f"{regressions} regression(s) over {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
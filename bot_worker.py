@@ -0,0 +1,92 @@
+#   Runs bot searches off the UI thread, so game.py keeps drawing frames while a bot thinks.
+#   Has no pygame dependency, so it can be used and tested without a window.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from a2_partb import SearchCancelled
+
+
+def _think(bot, board, cancel):
+    """Runs one search in the worker thread."""
+    return bot.get_play(board, cancel)
+
+
+class BotWorker:
+    def __init__(self):
+        """
+        Initializes a worker with one background thread for bot searches.
+
+        One search runs at a time. start() hands a board to the thread and returns at once,
+        the caller polls take() every frame until the move is ready, and cancel() stops the
+        search in progress: the bot's cancel event is set, so its GameTree gives up at the
+        next node, and the result is dropped either way.
+
+        Attributes:
+        future (Future): The search in progress or finished but not yet taken, or None.
+        started (float): time.perf_counter() when the current search started.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot")
+        self.future = None
+        self.cancel_event = None
+        self.started = 0
+
+    def start(self, bot, board):
+        """
+        Starts a search for bot's move on board, cancelling any search already in progress.
+
+        Parameters:
+        bot (PlayerOne or PlayerTwo): The bot to ask for a move. Its get_play must accept a cancel event.
+        board (list of list of int): The board; the caller must not change it while the search runs.
+        """
+        self.cancel()
+        self.cancel_event = threading.Event()
+        self.started = time.perf_counter()
+        self.future = self.executor.submit(_think, bot, board, self.cancel_event)
+
+    def pending(self):
+        """Returns True if a search was started and its move has not been taken or cancelled."""
+        return self.future is not None
+
+    def thinking(self):
+        """Returns True while a search is still running."""
+        return self.future is not None and not self.future.done()
+
+    def elapsed(self):
+        """Returns the seconds the pending search has been running, 0 if there is none."""
+        if self.future is None:
+            return 0
+        return time.perf_counter() - self.started
+
+    def take(self):
+        """
+        Returns the move of a finished search, once.
+
+        Returns:
+        tuple of int or None: The bot's (row, col), or None if no search has finished.
+
+        Raises:
+        Exception: Whatever the bot's get_play raised, other than SearchCancelled.
+        """
+        if self.future is None or not self.future.done():
+            return None
+        future = self.future
+        self.future = None
+        self.cancel_event = None
+        try:
+            return future.result()
+        except SearchCancelled:
+            return None
+
+    def cancel(self):
+        """Stops the search in progress, if any, and forgets its result."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.future = None
+        self.cancel_event = None
+
+    def shutdown(self):
+        """Cancels any search and waits for the thread to finish."""
+        self.cancel()
+        self.executor.shutdown(wait=True)
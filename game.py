@@ -9,12 +9,15 @@
 #   https://creativecommons.org/licenses/by/3.0/
 
 import pygame
+import os
 import sys
 import math
-import copy
+import time
 
-from a1_partd import overflow
 from a1_partc import Queue
+from bot_worker import BotWorker
+from game_board import GameBoard, redo_move, undo_move
+from opening_book import BOOK_FILE
 from player1 import PlayerOne
 from player2 import PlayerTwo 
 
@@ -26,12 +29,22 @@ class Dropdown:
         self.height = height
         self.options = options
         self.current_option = 0
+        self.font = pygame.font.Font(None, 36)
+        self.surfaces = {}
+
+    def surface(self):
+        # the dropdown as drawn, composed once per option
+        surface = self.surfaces.get(self.current_option)
+        if surface is None:
+            surface = pygame.Surface((self.width, self.height))
+            surface.fill(WHITE)
+            pygame.draw.rect(surface, BLACK, (0, 0, self.width, self.height), 2)
+            surface.blit(text_cache.render(self.font, self.options[self.current_option]), (5, 5))
+            self.surfaces[self.current_option] = surface
+        return surface
 
     def draw(self, window):
-        pygame.draw.rect(window, BLACK, (self.x, self.y, self.width, self.height), 2)
-        font = pygame.font.Font(None, 36)
-        text = font.render(self.options[self.current_option], 1, BLACK)
-        window.blit(text, (self.x + 5, self.y + 5))
+        window.blit(self.surface(), (self.x, self.y))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -51,12 +64,21 @@ class Button:
         self.color = (200, 200, 200)
         self.hover_color = (150, 150, 150)
         self.active_color = self.color
+        self.surfaces = {}
+
+    def surface(self):
+        # the button as drawn, composed once per colour
+        surface = self.surfaces.get(self.active_color)
+        if surface is None:
+            surface = pygame.Surface(self.rect.size)
+            surface.fill(self.active_color)
+            text_surf = text_cache.render(self.font, self.text)
+            surface.blit(text_surf, text_surf.get_rect(center=surface.get_rect().center))
+            self.surfaces[self.active_color] = surface
+        return surface
 
     def draw(self, window):
-        pygame.draw.rect(window, self.active_color, self.rect)
-        text_surf = self.font.render(self.text, True, (0, 0, 0))
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        window.blit(text_surf, text_rect)
+        window.blit(self.surface(), self.rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -68,116 +90,111 @@ class Button:
             else:
                 self.active_color = self.color
 
-class Board:
+class TextCache:
+    def __init__(self, limit=256):
+        # rendered text surfaces by (font, text, colour); emptied when it reaches limit entries
+        self.surfaces = {}
+        self.limit = limit
+
+    def render(self, font, text, color=(0, 0, 0)):
+        key = (id(font), text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.limit:
+                self.surfaces.clear()
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+        return surface
+
+class Renderer:
+    def __init__(self, window, background):
+        # draws named regions of the window and sends only the ones that changed to the display
+        self.window = window
+        self.background = background
+        self.regions = {}   # name -> (rect, surface) last drawn
+        self.overlays = {}  # name -> rect of surfaces drawn on top of the regions
+        self.dirty = []
+        self.full = True
+
+    def invalidate(self):
+        # redraw the whole window on the next frame
+        self.full = True
+
+    def begin_frame(self):
+        if self.full:
+            self.window.fill(self.background)
+
+    def region(self, name, pos, surface):
+        # surfaces are cached, so the same surface object means the same picture
+        rect = surface.get_rect(topleft=pos)
+        drawn = self.regions.get(name)
+        if not self.full and drawn is not None and drawn[1] is surface and drawn[0] == rect:
+            return
+        if drawn is not None and drawn[0] != rect:
+            self.window.fill(self.background, drawn[0])
+            self.dirty.append(drawn[0])
+        self.window.fill(self.background, rect)
+        self.window.blit(surface, rect)
+        self.dirty.append(rect)
+        self.regions[name] = (rect, surface)
+
+    def text(self, name, font, text, pos, color=(0, 0, 0)):
+        self.region(name, pos, text_cache.render(font, text, color))
+
+    def hide(self, name):
+        drawn = self.regions.pop(name, None)
+        if drawn is not None:
+            self.window.fill(self.background, drawn[0])
+            self.dirty.append(drawn[0])
+
+    def overlay(self, name, pos, surface):
+        # drawn over the regions after them, again whenever something under it was redrawn
+        rect = surface.get_rect(topleft=pos)
+        if self.full or self.overlays.get(name) != rect or rect.collidelist(self.dirty) != -1:
+            self.window.blit(surface, rect)
+            self.dirty.append(rect)
+        self.overlays[name] = rect
+
+    def hide_overlay(self, name):
+        if self.overlays.pop(name, None) is not None:
+            self.invalidate()
+
+    def flush(self):
+        if self.full:
+            pygame.display.update()
+            self.full = False
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.dirty = []
+
+class Board(GameBoard):
     def __init__(self,width,height, p1_sprites, p2_sprites):
-        self.width = width
-        self.height = height
-        self.board = [[0 for _ in range(width)] for _ in range(height)]
+        super().__init__(width, height)
         self.p1_sprites = p1_sprites
         self.p2_sprites = p2_sprites
-        self.board[0][0] = 1
-        self.board[self.height-1][self.width-1] = -1
-        self.turn = 0
-        self.history = []
-
-    def get_board(self):
-        current_board = []
-        for i in range(self.height):
-            current_board.append(self.board[i].copy())
-        return current_board
-
-    def valid_move(self, row,col,player):
-        if row >= 0  and row < self.height and col >= 0 and col < self.width and (self.board[row][col]==0 or self.board[row][col]/abs(self.board[row][col]) == player):
-            return True
-        return False
-
-    def add_piece(self, row, col, player, bot_move=False):
-        if self.valid_move(row, col, player):
-            if not bot_move:
-                self.history.append(copy.deepcopy(self.board)) 
-            self.board[row][col] += player
-            self.turn += 1
-            return True
-        return False
-
-    def check_win(self):
-        if(self.turn > 0):
-            num_p1 = 0
-            num_p2 = 0
-            for i in range(self.height):
-                for j in range(self.width):
-                    if(self.board[i][j] > 0):
-                        if num_p2 > 0:
-                            return 0
-                        num_p1 += 1
-                    elif(self.board[i][j] < 0):
-                        if num_p1 > 0:
-                            return 0
-                        num_p2 += 1
-            if(num_p1 == 0):
-                return -1
-            if(num_p2== 0):
-                return 1
-        return 0
-
-    def do_overflow(self,q):
-        oldboard = []
-        for i in range(self.height):
-            oldboard.append(self.board[i].copy())
-        numsteps = overflow(self.board, q)
-        if(numsteps != 0):
-            self.set(oldboard)
-        return numsteps
-    
-    def set(self, newboard):
-        for row in range(self.height):
-            for col in range(self.width):
-                self.board[row][col] = newboard[row][col]
-
-    def draw(self, window, frame):
-        for row in range(GRID_SIZE[0]):
-            for col in range(GRID_SIZE[1]):
-                rect = pygame.Rect(col * CELL_SIZE + X_OFFSET, row * CELL_SIZE+Y_OFFSET, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(window, BLACK, rect, 1)
+        self.cells = {}
+
+    def cell_surface(self, value, sprite_frame):
+        # one cell, border and gems, composed once per (value, sprite frame)
+        surface = self.cells.get((value, sprite_frame))
+        if surface is None:
+            surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
+            surface.fill(WHITE)
+            pygame.draw.rect(surface, BLACK, (0, 0, CELL_SIZE, CELL_SIZE), 1)
+            sprite = self.p1_sprites if value > 0 else self.p2_sprites
+            for pos in GEM_POSITIONS.get(abs(value), ()):
+                surface.blit(sprite[sprite_frame], pos)
+            self.cells[(value, sprite_frame)] = surface
+        return surface
+
+    def draw(self, renderer, frame):
         for row in range(self.height):
             for col in range(self.width):
-                if self.board[row][col] != 0:
-                    rpos = row * CELL_SIZE + Y_OFFSET
-                    cpos = col * CELL_SIZE + X_OFFSET
-                    if self.board[row][col] > 0:
-                        sprite = p1_sprites
-                    else:
-                        sprite = p2_sprites
-                    if abs(self.board[row][col]) == 1:
-                        cpos += CELL_SIZE //2 - 16
-                        rpos += CELL_SIZE //2 - 16
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                    elif abs(self.board[row][col]) == 2:
-                        cpos += CELL_SIZE //2 - 32
-                        rpos += CELL_SIZE //2 - 16
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                        cpos += 32
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-
-                    elif abs(self.board[row][col]) == 3:
-                        cpos += CELL_SIZE //2 - 16
-                        rpos += 8
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                        cpos = col * CELL_SIZE + X_OFFSET + CELL_SIZE //2 - 32
-                        rpos += CELL_SIZE //2
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                        cpos += 32
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                    elif abs(self.board[row][col]) == 4:
-                        cpos += CELL_SIZE //2 - 32
-                        rpos += 8
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                        rpos += CELL_SIZE //2
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                        cpos += 32
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
-                        rpos -= CELL_SIZE //2
-                        window.blit(sprite[math.floor(frame)], (cpos, rpos))
+                value = self.board[row][col]
+                # empty cells do not animate
+                sprite_frame = math.floor(frame) if value != 0 else 0
+                renderer.region(("cell", row, col), (col * CELL_SIZE + X_OFFSET, row * CELL_SIZE + Y_OFFSET),
+                                self.cell_surface(value, sprite_frame))
 
 
 
@@ -189,7 +206,9 @@ WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 X_OFFSET = 0
 Y_OFFSET = 100
-FULL_DELAY = 5
+FULL_DELAY = 600  # milliseconds each step of an overflow is shown
+FPS = 60
+SPRITE_DELAY = 200  # milliseconds each frame of the gem animation is shown
 EASY = 2
 NORMAL = 3
 HARD = 4
@@ -204,6 +223,15 @@ p2_sprites = []
 
 player_id = [1 , -1]
 
+# where the gems go in a cell holding 1 to 4 of them
+GEM_POSITIONS = {
+    1: [(CELL_SIZE // 2 - 16, CELL_SIZE // 2 - 16)],
+    2: [(CELL_SIZE // 2 - 32, CELL_SIZE // 2 - 16), (CELL_SIZE // 2, CELL_SIZE // 2 - 16)],
+    3: [(CELL_SIZE // 2 - 16, 8), (CELL_SIZE // 2 - 32, 8 + CELL_SIZE // 2), (CELL_SIZE // 2, 8 + CELL_SIZE // 2)],
+    4: [(CELL_SIZE // 2 - 32, 8), (CELL_SIZE // 2 - 32, 8 + CELL_SIZE // 2),
+        (CELL_SIZE // 2, 8 + CELL_SIZE // 2), (CELL_SIZE // 2, 8)],
+}
+
 
 for i in range(8):
     curr_sprite = pygame.Rect(32*i,0,32,32)
@@ -235,7 +263,8 @@ buttons = [
     Button(940, 110, 50, 30, '-', decrease_p1_difficulty),
     Button(880, 170, 50, 30, '+', increase_p2_difficulty),
     Button(940, 170, 50, 30, '-', decrease_p2_difficulty),
-    Button(0,600,150,50, "Undo Move", lambda: undo_move(choice[0] == 1 or choice[1] == 1))
+    Button(0,600,150,50, "Undo Move", lambda: undo_clicked()),
+    Button(160,600,150,50, "Redo Move", lambda: redo_clicked())
 ]
 
 def get_difficulty_text(tree_height):
@@ -248,22 +277,32 @@ def get_difficulty_text(tree_height):
     else:
         return str(tree_height)
     
-def undo_move(bot_turn=False):
-
-    if board.history:
-        board.board = board.history.pop()
-        board.turn -= 1
-        if bot_turn:
-            board.turn -= 1
-            status[1] = ""
-        return True
-
-    return False
+def finish_overflow():
+    # jumps to the end of an overflow being shown, so its cells are all in the undo log
+    global overflowing
+    if overflowing:
+        steps = overflow_boards.drain()
+        if steps:
+            board.set(steps[-1])
+        overflowing = False
+
+def undo_clicked():
+    finish_overflow()
+    if undo_move(board, worker):
+        status[1] = ""
+
+def redo_clicked():
+    finish_overflow()
+    if redo_move(board, worker):
+        status[1] = ""
 
 
 pygame.font.init()
 font = pygame.font.Font(None, 36)  # Change the size as needed
 bigfont = pygame.font.Font(None, 108)
+text_cache = TextCache()
+renderer = Renderer(window, WHITE)
+clock = pygame.time.Clock()
 # Create the game board
 # board = [[0 for _ in range(GRID_SIZE[0])] for _ in range(GRID_SIZE[1])]
 player1_dropdown = Dropdown(650, 100, 200, 50, ['Human', 'AI'])
@@ -277,19 +316,34 @@ overflow_boards = Queue()
 overflowing = False
 numsteps = 0
 has_winner = False
-bots = [PlayerOne(), PlayerTwo()]
+# the bots play from the opening book if one has been generated with opening_book.py
+book = BOOK_FILE if os.path.exists(BOOK_FILE) else None
+bots = [PlayerOne(book=book), PlayerTwo(book=book)]
+# bots search in the background so the window keeps drawing while they think
+worker = BotWorker()
 grid_col = -1
 grid_row = -1
 choice = [None, None]
+elapsed_ms = 0         # time the last frame took, from clock.tick
+show_fps = True        # toggled with the F key
+frame_ms = 0           # smoothed time spent on each frame, not counting the wait for the next one
+fps_text = ""
+fps_updated = 0
 while running:
+    frame_start = time.perf_counter()
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+            show_fps = not show_fps
         else:
             player1_dropdown.handle_event(event)
             player2_dropdown.handle_event(event)
-            choice[0] = player1_dropdown.get_choice()
-            choice[1] = player2_dropdown.get_choice()
+            new_choice = [player1_dropdown.get_choice(), player2_dropdown.get_choice()]
+            if new_choice != choice:
+                # the player whose move was being searched may no longer be a bot
+                worker.cancel()
+            choice[0], choice[1] = new_choice
             for button in buttons:
                 button.handle_event(event)
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -298,11 +352,6 @@ while running:
                 col = x - X_OFFSET    
                 grid_row, grid_col = row // CELL_SIZE, col // CELL_SIZE
 
-    player1_dropdown.draw(window)
-    player2_dropdown.draw(window)
-    for button in buttons:
-        button.draw(window)
-
     win = board.check_win()
     if win != 0:
         winner = 1
@@ -314,12 +363,12 @@ while running:
         if overflowing:
             status[0] = "Overflowing"
             if not overflow_boards.is_empty():
-                if repeat_step == FULL_DELAY:
+                if repeat_step >= FULL_DELAY:
                     next = overflow_boards.dequeue()
                     board.set(next)
                     repeat_step = 0
                 else:
-                    repeat_step += 1
+                    repeat_step += elapsed_ms
             else:
                 overflowing = False
 
@@ -328,14 +377,21 @@ while running:
             status[0] = "Player " + str(current_player + 1) + "'s turn"
             make_move = False
             if choice[current_player] == 1:
-                (grid_row,grid_col) = bots[current_player].get_play(board.get_board())
-                status[1] = "Bot chose row {}, col {}".format(grid_row, grid_col)
-                if not board.valid_move(grid_row, grid_col, player_id[current_player]):
-                       has_winner = True
-                       # if p1 makes an invalid move, p2 wins.  if p2 makes an invalid move p1 wins
-                       winner = ((current_player + 1) % 2) + 1 
+                if not worker.pending():
+                    worker.start(bots[current_player], board.get_board())
+                bot_move = worker.take()
+                if bot_move is None:
+                    dots = "." * (int(worker.elapsed() * 3) % 4)
+                    status[1] = "{} is thinking{}".format(bots[current_player].get_name(), dots)
                 else:
-                    make_move = True
+                    (grid_row,grid_col) = bot_move
+                    status[1] = "Bot chose row {}, col {}".format(grid_row, grid_col)
+                    if not board.valid_move(grid_row, grid_col, player_id[current_player]):
+                           has_winner = True
+                           # if p1 makes an invalid move, p2 wins.  if p2 makes an invalid move p1 wins
+                           winner = ((current_player + 1) % 2) + 1 
+                    else:
+                        make_move = True
             else:
                 if board.valid_move(grid_row, grid_col, player_id[current_player]):
                     make_move = True
@@ -349,56 +405,60 @@ while running:
                 grid_row = -1
                 grid_col = -1
 
-    # Draw the game board
-    window.fill(WHITE)
-    board.draw(window,frame)
-    window.blit(p1_sprites[math.floor(frame)], (600, 100))
-    window.blit(p2_sprites[math.floor(frame)], (600, 160))
-    frame = (frame + 0.5) % 8
-    player1_dropdown.draw(window)
-    player2_dropdown.draw(window)
-
-    total_moves = font.render(f"Total number of moves in the game: {board.turn}", True, (0,0,0,0))
-    window.blit(total_moves, (700, 700))
+    # Draw the game board; only regions that changed are redrawn and sent to the display
+    frame = (pygame.time.get_ticks() / SPRITE_DELAY) % 8
+    renderer.begin_frame()
+    board.draw(renderer, frame)
+    renderer.region("p1 sprite", (600, 100), p1_sprites[math.floor(frame)])
+    renderer.region("p2 sprite", (600, 160), p2_sprites[math.floor(frame)])
+    renderer.region("p1 dropdown", (player1_dropdown.x, player1_dropdown.y), player1_dropdown.surface())
+    renderer.region("p2 dropdown", (player2_dropdown.x, player2_dropdown.y), player2_dropdown.surface())
 
+    renderer.text("moves", font, f"Total number of moves in the game: {board.turn}", (700, 700))
 
     elapsed_time_ms = pygame.time.get_ticks()
     elapsed_time_sec = elapsed_time_ms // 1000  # Convert to seconds
 
     minutes = elapsed_time_sec // 60
     seconds = elapsed_time_sec % 60
-    timer_text = font.render(f"Total Time: {minutes:02}:{seconds:02}", True, (0,0,0,0))
+    renderer.text("timer", font, f"Total Time: {minutes:02}:{seconds:02}", (20, 20))
+
+    for i in range(2):
+        names = ("p%d +" % (i + 1), "p%d -" % (i + 1), "p%d difficulty" % (i + 1))
+        if choice[i] == 1:
+            renderer.region(names[0], buttons[2 * i].rect.topleft, buttons[2 * i].surface())
+            renderer.region(names[1], buttons[2 * i + 1].rect.topleft, buttons[2 * i + 1].surface())
+            renderer.text(names[2], font, f"Difficulty: {get_difficulty_text(bots[i].difficulty)}", (1000, 110 + 60 * i))
+        else:
+            for name in names:
+                renderer.hide(name)
 
-    window.blit(timer_text, (20, 20))
-    
-    if choice[0] == 1:
-        buttons[0].draw(window)
-        buttons[1].draw(window)
-        p1_difficulty = font.render(f"Difficulty: {get_difficulty_text(bots[0].difficulty)}", True, BLACK)
-        window.blit(p1_difficulty, (1000, 110))
-    
-    if choice[1] == 1:
-        buttons[2].draw(window)
-        buttons[3].draw(window)
-        p2_difficulty = font.render(f"Difficulty: {get_difficulty_text(bots[1].difficulty)}", True, BLACK)
-        window.blit(p2_difficulty, (1000, 170))
-    
-    buttons[4].draw(window)
+    renderer.region("undo", buttons[4].rect.topleft, buttons[4].surface())
+    renderer.region("redo", buttons[5].rect.topleft, buttons[5].surface())
 
-    if not has_winner:  
-        text = font.render(status[0], True, (0, 0, 0))  # Black color
-        window.blit(text, (X_OFFSET, 750 ))
-        text = font.render(status[1], True, (0, 0, 0))  # Black color
-        window.blit(text, (X_OFFSET,  700 ))
+    if show_fps:
+        if elapsed_time_ms - fps_updated >= 500:
+            fps_text = f"{clock.get_fps():5.1f} fps {frame_ms:5.2f} ms/frame"
+            fps_updated = elapsed_time_ms
+        renderer.text("fps", font, fps_text, (900, 20))
     else:
-        text = bigfont.render("Player " + str(winner)  + " wins!", True, (0, 0, 0))  # Black color
-        window.blit(text, (300, 250))
-
-
+        renderer.hide("fps")
 
+    if not has_winner:  
+        renderer.text("status", font, status[0], (X_OFFSET, 750))
+        renderer.text("bot status", font, status[1], (X_OFFSET, 700))
+        renderer.hide_overlay("winner")
+    else:
+        renderer.hide("status")
+        renderer.hide("bot status")
+        renderer.overlay("winner", (300, 250), text_cache.render(bigfont, "Player " + str(winner) + " wins!"))
 
-    pygame.display.update()
-    pygame.time.delay(100)
+    renderer.flush()
+    frame_ms = 0.9 * frame_ms + 0.1 * (time.perf_counter() - frame_start) * 1000
+    elapsed_ms = clock.tick(FPS)
 
+worker.shutdown()
+for bot in bots:
+    bot.close()
 pygame.quit()
 sys.exit()
@@ -0,0 +1,200 @@
+#   The rules of the game, without any drawing, so that they can be used without pygame.
+#   game.py's Board adds the sprites and drawing on top of this class.
+
+from a1_partc import Deque
+from a1_partd import overflow, overflow_iterative
+
+UNDO_LIMIT = 1000
+
+class GameBoard:
+    def __init__(self, width, height, undo_limit=UNDO_LIMIT, verify=False):
+        self.width = width
+        self.height = height
+        self.board = [[0 for _ in range(width)] for _ in range(height)]
+        self.board[0][0] = 1
+        self.board[self.height-1][self.width-1] = -1
+        self.turn = 0
+        # number of cells each player holds, kept up to date by every change to the board so
+        # check_win need not scan it.  verify makes check_win compare them with a full scan
+        self.counts = self.count_cells()
+        self.verify = verify
+        # undo log: one step per human move, each a list of (row, col, old, new) for every cell
+        # the move changed, along with its overflow and anything played after it up to the next
+        # human move.  undo_steps holds (turn before the human move, step) and redo_steps
+        # (turn when the step was undone, step), so undo and redo put the turn back too, however
+        # many moves the step ended up with.  at most undo_limit steps are kept, the oldest are
+        # dropped first
+        self.undo_limit = undo_limit
+        self.undo_steps = Deque()
+        self.redo_steps = Deque()
+        self.step = None
+
+    def tally(self, old, new):
+        # updates the cell counts for one cell changing from old to new
+        if old > 0:
+            self.counts[0] -= 1
+        elif old < 0:
+            self.counts[1] -= 1
+        if new > 0:
+            self.counts[0] += 1
+        elif new < 0:
+            self.counts[1] += 1
+
+    def count_cells(self):
+        # counts each player's cells with a full scan of the board
+        cells = [0, 0]
+        for row in self.board:
+            for value in row:
+                if value > 0:
+                    cells[0] += 1
+                elif value < 0:
+                    cells[1] += 1
+        return cells
+
+    def recount(self):
+        # brings the cell counts back in line after the board was changed directly
+        self.counts = self.count_cells()
+
+    def record(self, row, col, new):
+        # sets a cell, logging the change in the current undo step
+        old = self.board[row][col]
+        if old != new:
+            if self.step is not None:
+                self.step.append((row, col, old, new))
+            if not self.redo_steps.is_empty():
+                self.redo_steps = Deque()
+            self.tally(old, new)
+            self.board[row][col] = new
+
+    def begin_step(self):
+        # starts a new undo step; a new step makes the undone steps impossible to redo
+        self.step = []
+        self.undo_steps.push_back((self.turn, self.step))
+        if len(self.undo_steps) > self.undo_limit:
+            self.undo_steps.pop_front()
+        self.redo_steps = Deque()
+
+    def can_undo(self):
+        return not self.undo_steps.is_empty()
+
+    def can_redo(self):
+        return not self.redo_steps.is_empty()
+
+    def undo(self):
+        # puts back the board as it was before the last human move, in O(cells changed)
+        if self.undo_steps.is_empty():
+            return False
+        turn, step = self.undo_steps.pop_back()
+        for row, col, old, new in reversed(step):
+            self.tally(new, old)
+            self.board[row][col] = old
+        self.redo_steps.push_back((self.turn, step))
+        self.turn = turn
+        # changes from here on belong to the step now last, as a full copy taken before its
+        # human move would have put them back too
+        last = self.undo_steps.get_back()
+        self.step = None if last is None else last[1]
+        return True
+
+    def redo(self):
+        # plays the last undone step again
+        if self.redo_steps.is_empty():
+            return False
+        turn, step = self.redo_steps.pop_back()
+        for row, col, old, new in step:
+            self.tally(old, new)
+            self.board[row][col] = new
+        self.undo_steps.push_back((self.turn, step))
+        self.turn = turn
+        # later changes (e.g. the overflow still to be shown) belong to the last step again
+        self.step = step
+        return True
+
+    def get_board(self):
+        current_board = []
+        for i in range(self.height):
+            current_board.append(self.board[i].copy())
+        return current_board
+
+    def valid_move(self, row,col,player):
+        if row >= 0  and row < self.height and col >= 0 and col < self.width and (self.board[row][col]==0 or self.board[row][col]/abs(self.board[row][col]) == player):
+            return True
+        return False
+
+    def add_piece(self, row, col, player, bot_move=False):
+        if self.valid_move(row, col, player):
+            if not bot_move:
+                self.begin_step()
+            self.record(row, col, self.board[row][col] + player)
+            self.turn += 1
+            return True
+        return False
+
+    def check_win(self):
+        if self.verify and self.counts != self.count_cells():
+            raise RuntimeError("cell counts %s do not match a full scan %s" % (self.counts, self.count_cells()))
+        if(self.turn > 0):
+            if(self.counts[0] == 0):
+                return -1
+            if(self.counts[1] == 0):
+                return 1
+        return 0
+
+    def do_overflow(self,q):
+        # the board is left as it is; the caller plays the states in q back with set() to animate the overflow
+        return overflow(self.get_board(), q)
+
+    def resolve_overflow(self):
+        # applies the whole overflow at once, for playing without animation
+        oldboard = self.get_board()
+        numsteps = overflow_iterative(self.board)
+        for row in range(self.height):
+            if self.board[row] != oldboard[row]:
+                for col in range(self.width):
+                    old = oldboard[row][col]
+                    new = self.board[row][col]
+                    if old != new:
+                        self.tally(old, new)
+                        if self.step is not None:
+                            self.step.append((row, col, old, new))
+                        if not self.redo_steps.is_empty():
+                            self.redo_steps = Deque()
+        return numsteps
+
+    def set(self, newboard):
+        for row in range(self.height):
+            for col in range(self.width):
+                self.record(row, col, newboard[row][col])
+
+
+def undo_move(board, worker):
+    """
+    Undoes the last human move, along with any bot moves played after it.
+
+    The bot search in progress, if any, is cancelled first: it is for the position being undone.
+    The turn goes back to the human who made the move, whether or not a bot had replied yet.
+
+    Parameters:
+    board (GameBoard): The board.
+    worker (BotWorker): The worker searching bot moves for the board.
+
+    Returns:
+    bool: True if a move was undone, False if there was none to undo.
+    """
+    worker.cancel()
+    return board.undo()
+
+
+def redo_move(board, worker):
+    """
+    Plays the last undone human move again, along with the bot moves that followed it.
+
+    Parameters:
+    board (GameBoard): The board.
+    worker (BotWorker): The worker searching bot moves for the board.
+
+    Returns:
+    bool: True if a move was redone, False if there was none to redo.
+    """
+    worker.cancel()
+    return board.redo()
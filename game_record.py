@@ -0,0 +1,399 @@
+#   Compact binary game records, replayed one move at a time, and a batch validator.
+#
+#   A record file is any number of games back to back, each one:
+#     header:  magic (8 bytes), version, width, height, flags (unsigned 8 bit each),
+#              winner (signed 8 bit: 1, 2, or 0 for no winner), move count (unsigned 32 bit),
+#              crc32 of the final board (unsigned 32 bit), little endian
+#     moves:   one byte per move, row * width + col; player 1 moves first and players alternate
+#     timings: only if flags has HAS_TIMINGS, one unsigned 32 bit microsecond count per move,
+#              NO_TIMING for moves that were not timed
+#   A game that ended on an invalid move has INVALID_END in flags, and that move is the last one.
+#   To validate every game in some files, run: python game_record.py games.a2g --engine recursive
+
+import argparse
+import collections
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from a1_partd import board_tally, overflow, overflow_iterative
+
+MAGIC = b"A2GAME\x00\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sBBBBbII")
+HAS_TIMINGS = 1
+INVALID_END = 2
+NO_TIMING = 0xFFFFFFFF
+
+player_id = [1, -1]
+
+
+class GameRecord:
+    def __init__(self, width, height, moves, checksum, winner=0, invalid=False, timings=None):
+        """
+        Initializes a record of one game.
+
+        Parameters:
+        width (int): Number of columns on the board.
+        height (int): Number of rows on the board.
+        moves (list of tuple): The (row, col) of every move, player 1's first.
+        checksum (int): board_checksum() of the board the game ended with.
+        winner (int, optional): 1 or 2 for the player who won, 0 for none. Default is 0.
+        invalid (bool, optional): True if the game ended on an invalid move, its last. Default is False.
+        timings (list, optional): Milliseconds each move took, None for moves that were not
+                                  timed, or None if no move was. Default is None.
+        """
+        self.width = width
+        self.height = height
+        self.moves = moves
+        self.checksum = checksum
+        self.winner = winner
+        self.invalid = invalid
+        self.timings = timings
+
+
+class _Discard:
+    """A stand-in for the queue a1_partd.overflow fills, that keeps none of the boards."""
+
+    def enqueue(self, item):
+        pass
+
+
+def _overflow_recursive(grid):
+    return overflow(grid, _Discard())
+
+
+# the overflow implementations a replay can use
+ENGINES = {"recursive": _overflow_recursive, "iterative": overflow_iterative}
+
+
+def board_checksum(board):
+    """
+    Checksums a board the same way in every process.
+
+    Parameters:
+    board (list of list of int): The board.
+
+    Returns:
+    int: The crc32 of the board's cells, row by row.
+    """
+    cells = [value for row in board for value in row]
+    return zlib.crc32(struct.pack("<%di" % len(cells), *cells))
+
+
+def encode_game(record):
+    """
+    Packs a game into the record format.
+
+    Parameters:
+    record (GameRecord): The game.
+
+    Returns:
+    bytes: The game's header, moves and timings.
+
+    Raises:
+    ValueError: If the board has more than 256 cells or a move is off the board.
+    """
+    width, height = record.width, record.height
+    if width * height > 256:
+        raise ValueError("a %dx%d board has too many cells for one byte per move" % (height, width))
+    cells = bytearray()
+    for row, col in record.moves:
+        if not (0 <= row < height and 0 <= col < width):
+            raise ValueError("move (%d, %d) is off a %dx%d board" % (row, col, height, width))
+        cells.append(row * width + col)
+
+    flags = 0
+    timings = b""
+    if record.timings is not None:
+        flags |= HAS_TIMINGS
+        timings = struct.pack("<%dI" % len(record.moves),
+                              *(NO_TIMING if ms is None else min(round(ms * 1000), NO_TIMING - 1)
+                                for ms in record.timings))
+    if record.invalid:
+        flags |= INVALID_END
+    header = HEADER.pack(MAGIC, VERSION, width, height, flags, record.winner, len(record.moves), record.checksum)
+    return header + bytes(cells) + timings
+
+
+def write_game(output, record):
+    """Appends a game to a binary file open for writing."""
+    output.write(encode_game(record))
+
+
+def read_raw_games(stream):
+    """
+    Reads the games in a record file one at a time, without decoding them.
+
+    Parameters:
+    stream (file): A binary file.
+
+    Yields:
+    bytes: Each game's header, moves and timings.
+
+    Raises:
+    ValueError: If the file holds something other than whole games of this version.
+    """
+    while True:
+        header = stream.read(HEADER.size)
+        if not header:
+            return
+        if len(header) != HEADER.size:
+            raise ValueError("record file ends in the middle of a game header")
+        magic, version, width, height, flags, winner, count, checksum = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a version %d game record" % VERSION)
+        size = count * (5 if flags & HAS_TIMINGS else 1)
+        body = stream.read(size)
+        if len(body) != size:
+            raise ValueError("record file ends in the middle of a game")
+        yield header + body
+
+
+def decode_game(data):
+    """
+    Unpacks one game packed by encode_game.
+
+    Parameters:
+    data (bytes): The game's header, moves and timings.
+
+    Returns:
+    GameRecord: The game.
+    """
+    magic, version, width, height, flags, winner, count, checksum = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a version %d game record" % VERSION)
+    start = HEADER.size
+    moves = [divmod(cell, width) for cell in data[start:start + count]]
+    timings = None
+    if flags & HAS_TIMINGS:
+        timings = [None if micros == NO_TIMING else micros / 1000
+                   for micros in struct.unpack_from("<%dI" % count, data, start + count)]
+    return GameRecord(width, height, moves, checksum, winner, bool(flags & INVALID_END), timings)
+
+
+def read_games(stream):
+    """Reads the games in a record file one at a time, as GameRecords."""
+    for data in read_raw_games(stream):
+        yield decode_game(data)
+
+
+def replay(record, engine="recursive"):
+    """
+    Plays a recorded game back one move at a time.
+
+    Only the current board is kept: it is changed in place by every move and its overflow,
+    so the caller must copy it to keep a position.
+
+    Parameters:
+    record (GameRecord): The game.
+    engine (str, optional): The key in ENGINES of the overflow to apply. Default is "recursive",
+                            a1_partd.overflow.
+
+    Yields:
+    tuple: (row, col, player, board, waves) after every move: the move, the player who made it
+           (1 or -1), the board and the number of overflow waves the move set off. An invalid
+           last move is yielded with the board unchanged and waves None.
+    """
+    apply_overflow = ENGINES[engine]
+    board = [[0] * record.width for _ in range(record.height)]
+    board[0][0] = 1
+    board[record.height - 1][record.width - 1] = -1
+    for turn, (row, col) in enumerate(record.moves):
+        player = player_id[turn % 2]
+        value = board[row][col]
+        if value != 0 and (value > 0) != (player > 0):
+            yield row, col, player, board, None
+            return
+        board[row][col] = value + player
+        yield row, col, player, board, apply_overflow(board)
+
+
+def check_game(record, engine="recursive"):
+    """
+    Replays a recorded game and checks that it plays out the way it was recorded.
+
+    Parameters:
+    record (GameRecord): The game.
+    engine (str, optional): The key in ENGINES of the overflow to apply. Default is "recursive".
+
+    Returns:
+    tuple: (problem, waves, longest) where problem is None if the game checks out and a
+           description of the first difference otherwise, waves is the total number of
+           overflow waves and longest the most waves any one move set off.
+    """
+    waves = longest = 0
+    board = None
+    last = len(record.moves) - 1
+    for turn, (row, col, player, board, move_waves) in enumerate(replay(record, engine)):
+        if move_waves is None:
+            if turn != last or not record.invalid:
+                return "move %d (%d, %d) is invalid" % (turn, row, col), waves, longest
+            winner = 2 if player == 1 else 1
+            break
+        waves += move_waves
+        longest = max(longest, move_waves)
+        winner = 0
+        if move_waves:
+            # a move that sets off no overflow only adds to a cell of its own, so cannot win
+            positive, negative = board_tally(board)[:2]
+            winner = 1 if negative == 0 else 2 if positive == 0 else 0
+        if winner != 0 and turn != last:
+            return "the game was won at move %d of %d" % (turn, last + 1), waves, longest
+    else:
+        if record.invalid:
+            return "the last move is not invalid", waves, longest
+        if board is None:
+            winner = 0
+    if winner != record.winner:
+        return "winner is %d, recorded %d" % (winner, record.winner), waves, longest
+    if board is not None and board_checksum(board) != record.checksum:
+        return "the final board differs", waves, longest
+    return None, waves, longest
+
+
+def new_summary():
+    """Returns the empty totals that check_games adds to."""
+    return {"games": 0, "moves": 0, "p1_wins": 0, "p2_wins": 0, "draws": 0, "invalid": 0,
+            "waves": 0, "longest": 0, "timed_moves": 0, "move_ms": 0.0, "problems": []}
+
+
+def check_games(raw_games, engine="recursive", first=0, max_problems=20):
+    """
+    Checks a batch of games and totals them.
+
+    Parameters:
+    raw_games (list of bytes): Games as yielded by read_raw_games.
+    engine (str, optional): The key in ENGINES of the overflow to apply. Default is "recursive".
+    first (int, optional): The number of the first game in the batch, for the problems list. Default is 0.
+    max_problems (int, optional): Most problems to list. Default is 20.
+
+    Returns:
+    dict: The totals, as from new_summary; problems lists (game number, description).
+    """
+    summary = new_summary()
+    for number, data in enumerate(raw_games, first):
+        record = decode_game(data)
+        problem, waves, longest = check_game(record, engine)
+        summary["games"] += 1
+        summary["moves"] += len(record.moves)
+        summary["p1_wins"] += record.winner == 1
+        summary["p2_wins"] += record.winner == 2
+        summary["draws"] += record.winner == 0
+        summary["invalid"] += record.invalid
+        summary["waves"] += waves
+        summary["longest"] = max(summary["longest"], longest)
+        if record.timings is not None:
+            timed = [ms for ms in record.timings if ms is not None]
+            summary["timed_moves"] += len(timed)
+            summary["move_ms"] += sum(timed)
+        if problem is not None and len(summary["problems"]) < max_problems:
+            summary["problems"].append((number, problem))
+    return summary
+
+
+def _check_games_batch(batch):
+    """Unpacks a (raw_games, engine, first) tuple for check_games in a worker process."""
+    return check_games(*batch)
+
+
+def merge_summary(summary, part, max_problems=20):
+    """Adds the totals in part to summary."""
+    for key, value in part.items():
+        if key == "longest":
+            summary[key] = max(summary[key], value)
+        elif key == "problems":
+            summary[key].extend(value[:max_problems - len(summary[key])])
+        else:
+            summary[key] += value
+
+
+def _batches(paths, engine, batch_size):
+    first = 0
+    for path in paths:
+        with open(path, "rb") as stream:
+            batch = []
+            for data in read_raw_games(stream):
+                batch.append(data)
+                if len(batch) == batch_size:
+                    yield batch, engine, first
+                    first += len(batch)
+                    batch = []
+            if batch:
+                yield batch, engine, first
+                first += len(batch)
+
+
+def validate(paths, engine="recursive", workers=None, batch_size=1000):
+    """
+    Replays every game in some record files across a pool of processes.
+
+    The files are read a batch at a time, and at most two batches per worker are read ahead,
+    so only the batches being checked are in memory.
+
+    Parameters:
+    paths (list of str): The record files.
+    engine (str, optional): The key in ENGINES of the overflow to apply. Default is "recursive".
+    workers (int, optional): Number of worker processes, or 0 to check in this process.
+                             Default is os.cpu_count().
+    batch_size (int, optional): Games handed to a worker at a time. Default is 1000.
+
+    Returns:
+    dict: The totals, as from new_summary.
+    """
+    summary = new_summary()
+    if workers == 0:
+        for batch in _batches(paths, engine, batch_size):
+            merge_summary(summary, _check_games_batch(batch))
+        return summary
+    workers = workers or os.cpu_count() or 1
+    # Executor.map would read every batch and queue it before returning a result, so keep
+    # at most two batches per worker in flight, merging them in the order they were read
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(paths, engine, batch_size):
+            if len(pending) == 2 * workers:
+                merge_summary(summary, pending.popleft().result())
+            pending.append(pool.submit(_check_games_batch, batch))
+        while pending:
+            merge_summary(summary, pending.popleft().result())
+    return summary
+
+
+def print_summary(summary, elapsed, out=sys.stdout):
+    """Prints the totals of a validate run."""
+    games = summary["games"]
+    moves = summary["moves"]
+    print(f"{games} games, {moves} moves ({moves / games if games else 0:.1f} per game), "
+          f"p1 {summary['p1_wins']} / p2 {summary['p2_wins']} / draws {summary['draws']}, "
+          f"invalid {summary['invalid']}", file=out)
+    print(f"overflow waves {summary['waves']} ({summary['waves'] / moves if moves else 0:.2f} per move, "
+          f"longest {summary['longest']})", file=out)
+    if summary["timed_moves"]:
+        print(f"timed moves {summary['timed_moves']}, mean {summary['move_ms'] / summary['timed_moves']:.2f}ms",
+              file=out)
+    print(f"checked in {elapsed:.1f}s ({games / elapsed if elapsed else 0:.0f} games/s)", file=out)
+    for number, problem in summary["problems"]:
+        print(f"game {number}: {problem}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded games and check that they play out as recorded.")
+    parser.add_argument("paths", nargs="+", help="game record files")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="recursive", help="overflow implementation")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores, 0: no pool)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="games handed to a worker at a time")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = validate(args.paths, args.engine, args.workers, args.batch_size)
+    print_summary(summary, time.perf_counter() - start)
+    return 1 if summary["problems"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
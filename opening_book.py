@@ -0,0 +1,201 @@
+#   Opening book: the bots' moves for every position of the first few plies, searched offline.
+#
+#   Every game starts from the same board, so the positions of the opening are the same in
+#   every game and their moves need not be searched again each time.  The book is a
+#   table_snapshot file:
+#     key:    player to move (signed 8 bit), rows, cols (unsigned 8 bit each), then the board
+#             packed by a2_partb.pack_board, one signed byte per cell
+#     value:  row, col of the move and the depth it was searched to (unsigned 8 bit each)
+#   To write one, run: python opening_book.py --plies 3 --depth 5 --output opening_book.snap
+
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from a1_partd import overflow_iterative
+from a2_parta import HashTable
+from a2_partb import GameTree, pack_board
+from table_snapshot import SnapshotTable, save_snapshot
+from transposition import TranspositionTable
+
+ROWS = 5
+COLS = 6
+KEY_HEADER = struct.Struct("<bBB")
+BOOK_VALUE = struct.Struct("<BBB")
+# the book game.py hands its bots, if it has been generated
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.snap")
+
+
+def position_key(board, player):
+    """
+    Packs a position into a book key.
+
+    Parameters:
+    board (list of list of int): The game board.
+    player (int): The player to move, 1 or -1.
+
+    Returns:
+    bytes or None: The key, or None if a cell does not fit in a signed byte (no book has such positions).
+    """
+    try:
+        cells = pack_board(board).tobytes()
+    except OverflowError:
+        return None
+    return KEY_HEADER.pack(player, len(board), len(board[0])) + cells
+
+
+class OpeningBook:
+    def __init__(self, path):
+        """
+        Opens an opening book written by generate_book.
+
+        The file is mapped rather than read (see table_snapshot.SnapshotTable), so opening
+        it is quick and a lookup costs a few microseconds.
+
+        Parameters:
+        path (str): The book file.
+        """
+        self.table = SnapshotTable(path)
+
+    def get_move(self, board, player, min_depth=0):
+        """
+        Looks up the book move for a position.
+
+        Parameters:
+        board (list of list of int): The game board.
+        player (int): The player to move, 1 or -1.
+        min_depth (int, optional): Moves searched less deeply than this are not used. Default is 0.
+
+        Returns:
+        tuple of int or None: The (row, col) to play, or None if the position is not in the book.
+        """
+        key = position_key(board, player)
+        if key is None:
+            return None
+        value = self.table.search(key)
+        if value is None:
+            return None
+        row, col, depth = BOOK_VALUE.unpack(value)
+        if depth < min_depth:
+            return None
+        return (row, col)
+
+    def __len__(self):
+        """Returns the number of positions in the book."""
+        return len(self.table)
+
+    def close(self):
+        """Closes the book file."""
+        self.table.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def opening_positions(plies, rows=ROWS, cols=COLS):
+    """
+    Lists every position reachable from the start of a game in fewer than plies moves.
+
+    Parameters:
+    plies (int): The number of plies the book covers.
+    rows (int, optional): Number of rows on the board. Default is ROWS.
+    cols (int, optional): Number of columns on the board. Default is COLS.
+
+    Returns:
+    list of tuple: (key, board, player) for each position that is not already won, each once
+                   however many move orders lead to it.
+    """
+    board = [[0] * cols for _ in range(rows)]
+    board[0][0] = 1
+    board[rows - 1][cols - 1] = -1
+    frontier = [(board, 1)]
+    seen = HashTable.presized(1024)
+    positions = []
+    for ply in range(plies):
+        next_frontier = []
+        for board, player in frontier:
+            key = position_key(board, player)
+            if key is None or seen.search(key) is not None:
+                continue
+            seen.insert(key, True)
+            positions.append((key, board, player))
+            if ply == plies - 1:
+                continue
+            for row in range(rows):
+                for col in range(cols):
+                    if board[row][col] * player < 0:
+                        continue
+                    child = [line[:] for line in board]
+                    child[row][col] += player
+                    overflow_iterative(child)
+                    cells = [value for line in child for value in line]
+                    if any(value > 0 for value in cells) and any(value < 0 for value in cells):
+                        next_frontier.append((child, -player))
+        frontier = next_frontier
+    return positions
+
+
+def _search_position(board, player, depth, table=None):
+    tree = GameTree(board, player, tree_height=depth, pruning=True, table=table)
+    move = tree.get_move()
+    tree.clear_tree()
+    return move
+
+
+def _search_position_spec(spec):
+    """Unpacks a (board, player, depth) tuple for _search_position in a worker process."""
+    return _search_position(*spec)
+
+
+def generate_book(path, plies=3, depth=5, rows=ROWS, cols=COLS, workers=None):
+    """
+    Searches every position of the first plies plies and writes the moves to a book.
+
+    Parameters:
+    path (str): The book file to write.
+    plies (int, optional): The number of plies the book covers. Default is 3.
+    depth (int, optional): The tree height every position is searched with. Default is 5.
+    rows (int, optional): Number of rows on the board. Default is ROWS.
+    cols (int, optional): Number of columns on the board. Default is COLS.
+    workers (int, optional): Number of worker processes, or 0 to search in this process,
+                             sharing one transposition table. Default is os.cpu_count().
+
+    Returns:
+    int: The number of positions written.
+    """
+    positions = opening_positions(plies, rows, cols)
+    specs = [(board, player, depth) for key, board, player in positions]
+    if workers == 0:
+        table = TranspositionTable()
+        moves = [_search_position(*spec, table=table) for spec in specs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            moves = list(pool.map(_search_position_spec, specs, chunksize=16))
+    items = [(key, BOOK_VALUE.pack(row, col, depth)) for (key, board, player), (row, col) in zip(positions, moves)]
+    return save_snapshot(path, items, len(positions[0][0]), BOOK_VALUE.size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the opening positions and write an opening book.")
+    parser.add_argument("--plies", type=int, default=3, help="plies of the opening the book covers")
+    parser.add_argument("--depth", type=int, default=5, help="tree height each position is searched with")
+    parser.add_argument("--rows", type=int, default=ROWS, help="number of rows on the board")
+    parser.add_argument("--cols", type=int, default=COLS, help="number of columns on the board")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores, 0: no pool)")
+    parser.add_argument("--output", default=BOOK_FILE, help="file the book is written to")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = generate_book(args.output, args.plies, args.depth, args.rows, args.cols, args.workers)
+    print(f"{count} positions searched to depth {args.depth} in {time.perf_counter() - start:.1f}s, "
+          f"book in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+from a1_partd import get_grid_tables
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the functions below need it
+    np = None
+
+
+def _require_numpy():
+    """Raises ImportError if numpy is not installed."""
+    if np is None:
+        raise ImportError('the numpy overflow backend requires numpy')
+
+
+def overflow_batch(boards):
+    """
+    Applies the overflow process to many boards at once, in place.
+
+    Each board goes through exactly the waves a1_partd.overflow would apply to it, but every
+    wave is applied to all boards still overflowing together with array operations: the
+    overflowing cells are found by comparing against the cell limits, and the pieces they
+    spread are counted by adding the overflow mask shifted one cell in each direction.
+
+    Args:
+        boards (numpy.ndarray): Boards of shape (N, rows, cols) and dtype int8.
+
+    Returns:
+        numpy.ndarray: The number of overflow operations performed on each board, shape (N,).
+    """
+    _require_numpy()
+    count, rows, cols = boards.shape
+    limits = np.array(get_grid_tables(rows, cols)[1], dtype=np.int8)
+    waves = np.zeros(count, dtype=np.int64)
+    active = np.arange(count)
+
+    while active.size:
+        current = boards[active]
+        overflowing = np.abs(current) >= limits
+        flat = overflowing.reshape(active.size, -1)
+        keep = flat.any(axis=1) & (current > 0).any(axis=(1, 2)) & (current < 0).any(axis=(1, 2))
+        if not keep.all():
+            active = active[keep]
+            current = current[keep]
+            overflowing = overflowing[keep]
+            flat = flat[keep]
+            if not active.size:
+                break
+
+        # the sign of a wave is taken from its first overflowing cell in row order
+        first = flat.argmax(axis=1)
+        signs = np.where(current.reshape(active.size, -1)[np.arange(active.size), first] > 0, 1, -1)
+        signs = signs.astype(np.int8)[:, None, None]
+
+        received = np.zeros(current.shape, dtype=np.int8)
+        received[:, 1:, :] += overflowing[:, :-1, :]
+        received[:, :-1, :] += overflowing[:, 1:, :]
+        received[:, :, 1:] += overflowing[:, :, :-1]
+        received[:, :, :-1] += overflowing[:, :, 1:]
+
+        current[overflowing] = 0
+        current = np.where(received > 0, signs * (np.abs(current) + received), current)
+        boards[active] = current
+        waves[active] += 1
+
+    return waves
+
+
+def simulate_moves(board, player, moves):
+    """
+    Plays each move on its own copy of a board and resolves all of the overflows in one batch.
+
+    Args:
+        board (list of list of int): The game board.
+        player (int): The player making the moves, 1 or -1.
+        moves (list of tuple of int): The (row, col) of each move.
+
+    Returns:
+        list of list of list of int: The board after each move, in the order of moves.
+    """
+    _require_numpy()
+    if not moves:
+        return []
+    boards = np.repeat(np.array(board, dtype=np.int8)[None], len(moves), axis=0)
+    return _play_and_overflow(boards, player, moves)
+
+
+def simulate_batch(boards, player, moves):
+    """
+    Plays one move on each of many boards and resolves all of the overflows in one batch.
+
+    Args:
+        boards (list of list of list of int): The boards, all the same size.
+        player (int): The player making the moves, 1 or -1.
+        moves (list of tuple of int): The (row, col) of the move for each board.
+
+    Returns:
+        list of list of list of int: Each board after its move.
+    """
+    _require_numpy()
+    if not moves:
+        return []
+    return _play_and_overflow(np.array(boards, dtype=np.int8), player, moves)
+
+
+def _play_and_overflow(boards, player, moves):
+    """
+    Adds player's piece at moves[i] on boards[i] and resolves overflow on all of them.
+
+    Args:
+        boards (numpy.ndarray): Boards of shape (N, rows, cols) and dtype int8, modified in place.
+        player (int): The player making the moves, 1 or -1.
+        moves (list of tuple of int): N (row, col) moves.
+
+    Returns:
+        list of list of list of int: The resulting boards.
+    """
+    move_rows, move_cols = zip(*moves)
+    boards[np.arange(len(moves)), move_rows, move_cols] += player
+    overflow_batch(boards)
+    return boards.tolist()
@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from a2_partb import GameTree, SearchCancelled
+
+# seconds between checks of a caller's cancel event while the workers search
+CANCEL_POLL = 0.01
+
+# best root score found so far by any worker, and the number of the search the pool is
+# running, set up by _init_worker in each process
+_best_score = None
+_generation = None
+
+
+def _init_worker(best_score, generation):
+    """
+    Stores the shared best-so-far score and search number in a worker process.
+
+    Parameters:
+    best_score (multiprocessing.Value): The shared score, a double.
+    generation (multiprocessing.RawValue): The number of the search in progress, an int.
+    """
+    global _best_score, _generation
+    _best_score = best_score
+    _generation = generation
+
+
+class _Superseded:
+    """Stands in for a cancel event in a worker: set once the pool has moved past its search."""
+
+    def __init__(self, generation):
+        self.generation = generation
+
+    def is_set(self):
+        return _generation.value != self.generation
+
+
+def _just_below(score):
+    """
+    Returns an alpha bound just below a score, so a child scoring exactly that score is still
+    searched to its exact value. Scores are integers or infinite.
+
+    Parameters:
+    score (int or float): The best root score found so far.
+
+    Returns:
+    float: The bound to search with.
+    """
+    if score == float('inf'):
+        return sys.float_info.max
+    if score == float('-inf'):
+        return score
+    return score - 0.5
+
+
+def _search_root_move(board, player, tree_height, move, generation):
+    """
+    Searches the subtree under one root move in a worker process.
+
+    The search starts from the best root score any worker has published, and publishes its
+    own score if it beats it. A score at or below that bound may only be a bound itself, but
+    it is then lower than the best score and cannot be chosen.
+
+    Parameters:
+    board (list of list of int): The root board.
+    player (int): The player to move at the root.
+    tree_height (int): The maximum height of the game tree.
+    move (tuple of int): The root move to search.
+    generation (int): The number of the search this move belongs to. Once the pool starts
+                      another search, or this one is cancelled, the move's search stops.
+
+    Returns:
+    int or float: The score of the move.
+
+    Raises:
+    SearchCancelled: If the search the move belongs to was cancelled or superseded.
+    """
+    tree = GameTree(board, player, tree_height, pruning=True, cancel=_Superseded(generation))
+    child = next(tree.root.expand(tree_height, [move]))
+    alpha = _just_below(_best_score.value)
+    score = tree.alphabeta(child, False, alpha, float('inf'))
+    with _best_score.get_lock():
+        # a search that was superseded must not raise the bound of the one after it
+        if _generation.value == generation and score > _best_score.value:
+            _best_score.value = score
+    return score
+
+
+class ParallelSearch:
+    def __init__(self, workers=None):
+        """
+        Initializes a pool of worker processes that search root moves in parallel.
+
+        Parameters:
+        workers (int, optional): The number of worker processes. Default is os.cpu_count().
+
+        Attributes:
+        workers (int): The number of worker processes.
+        """
+        self.workers = workers if workers else os.cpu_count()
+        self._best_score = multiprocessing.Value('d', float('-inf'))
+        self._generation = multiprocessing.RawValue('i', 0)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self._best_score, self._generation))
+
+    def _next_generation(self):
+        """Starts a new search number, which stops every worker still on an older search."""
+        with self._best_score.get_lock():
+            self._generation.value += 1
+            self._best_score.value = float('-inf')
+        return self._generation.value
+
+    def get_move(self, board, player, tree_height=4, cancel=None):
+        """
+        Finds the best move by searching each root move in a worker process.
+
+        Gives the same move as GameTree(board, player, tree_height).get_move(): the first
+        move, in generation order, with the highest score. Only one search may run on a
+        pool at a time.
+
+        Parameters:
+        board (list of list of int): The game board.
+        player (int): The player to move.
+        tree_height (int, optional): The maximum height of the game tree. Default is 4.
+        cancel (threading.Event, optional): Event another thread sets to stop the search, which
+                                            then stops the workers' searches too and raises
+                                            SearchCancelled. Default is None.
+
+        Returns:
+        tuple of int: The best move for the player.
+        """
+        root = GameTree.Node(board, 0, player, tree_height, lazy=True)
+        moves = []
+        if tree_height > 1 and not root.is_terminal():
+            moves = root.get_moves()
+        if not moves:
+            raise ValueError('get_move() called on a position with no moves')
+
+        generation = self._next_generation()
+        futures = [self._pool.submit(_search_root_move, board, player, tree_height, move, generation)
+                   for move in moves]
+        if cancel is not None:
+            pending = set(futures)
+            while pending:
+                if cancel.is_set():
+                    for future in futures:
+                        future.cancel()
+                    self._next_generation()
+                    raise SearchCancelled()
+                done, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+        scores = [future.result() for future in futures]
+
+        best = 0
+        for i in range(1, len(scores)):
+            if scores[i] > scores[best]:
+                best = i
+        return moves[best]
+
+    def shutdown(self):
+        """Stops the worker processes."""
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
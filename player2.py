@@ -1,16 +1,54 @@
-from a2_partb import GameTree
+from a2_partb import GameTree, get_timed_move
+from opening_book import OpeningBook
+from parallel_search import ParallelSearch
 
 class PlayerTwo:
 
-    def __init__(self, name = "P2 Bot", difficulty = 4):
+    def __init__(self, name = "P2 Bot", difficulty = 4, table = None, time_limit = None, workers = None, book = None):
         self.name = name
         self.difficulty = difficulty
+        # optional TranspositionTable kept across get_play calls
+        self.table = table
+        # optional per-move time budget in milliseconds; replaces the fixed difficulty depth
+        self.time_limit = time_limit
+        # optional number of worker processes to search root moves on; the pool starts on first use
+        # and is stopped by close().  a transposition table cannot be shared with the workers
+        if table is not None and workers is not None and workers > 1:
+            raise ValueError("a transposition table cannot be used with more than one worker")
+        self.workers = workers
+        self.search = None
+        # optional opening book file; opened on first use, its moves are played without searching
+        # when they were searched at least as deep as difficulty
+        self.book = book
+        self.opening = None
 
     def get_name(self):
         return self.name
 
-    def get_play(self, board):
-        tree = GameTree(board, -1, tree_height= self.difficulty)
+    def get_play(self, board, cancel=None):
+        # cancel: optional threading.Event; setting it from another thread stops the search with SearchCancelled
+        if self.book is not None:
+            if self.opening is None:
+                self.opening = OpeningBook(self.book)
+            move = self.opening.get_move(board, -1, self.difficulty)
+            if move is not None:
+                return move
+        if self.time_limit is not None:
+            return get_timed_move(board, -1, self.time_limit, table=self.table, cancel=cancel)
+        if self.workers is not None and self.workers > 1:
+            if self.search is None:
+                self.search = ParallelSearch(self.workers)
+            return self.search.get_move(board, -1, self.difficulty, cancel)
+        tree = GameTree(board, -1, tree_height= self.difficulty, pruning=True, table=self.table, cancel=cancel)
         (row,col) = tree.get_move()
         tree.clear_tree()
-        return (row,col)
\ No newline at end of file
+        return (row,col)
+
+    def close(self):
+        # stops the worker processes and closes the opening book, if they were started
+        if self.search is not None:
+            self.search.shutdown()
+            self.search = None
+        if self.opening is not None:
+            self.opening.close()
+            self.opening = None
\ No newline at end of file
@@ -0,0 +1,160 @@
+#   Read-only hash table snapshots on disk, searched in place through mmap.
+#
+#   A snapshot stores fixed-width byte keys and values in an open addressing table:
+#     header:  magic (8 bytes), version, key size, value size (unsigned 32 bit each),
+#              reserved (32 bit), slot count, record count (unsigned 64 bit each), little endian
+#     slots:   slot count records of (1 byte used flag, key, value)
+#   The slot count is a power of two at least twice the record count, and a key's first
+#   slot comes from a stable hash of its bytes (blake2b, not hash(), which differs between
+#   processes), so any process opening the file finds the same keys in the same slots.
+
+import hashlib
+import mmap
+import os
+import struct
+
+MAGIC = b"A2SNAP\x00\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIIQQ")
+
+
+def stable_hash(key):
+    """
+    Hashes bytes the same way in every process.
+
+    Parameters:
+    key (bytes): The key.
+
+    Returns:
+    int: A 64 bit hash of key.
+    """
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def save_snapshot(path, items, key_size, value_size):
+    """
+    Writes key-value pairs to a snapshot file.
+
+    The file is written next to path and then renamed over it, so readers never see a
+    partly written snapshot.
+
+    Parameters:
+    path (str): The file to write.
+    items (iterable of tuple): The (key, value) pairs, each key key_size bytes and each
+                               value value_size bytes.
+    key_size (int): The width of every key in bytes.
+    value_size (int): The width of every value in bytes.
+
+    Returns:
+    int: The number of records written.
+
+    Raises:
+    ValueError: If a key or value has the wrong width, or a key appears twice.
+    """
+    items = list(items)
+    slots = 2
+    while slots < 2 * len(items):
+        slots *= 2
+    record_size = 1 + key_size + value_size
+    data = bytearray(slots * record_size)
+    mask = slots - 1
+
+    for key, value in items:
+        if len(key) != key_size or len(value) != value_size:
+            raise ValueError("snapshot keys must be %d bytes and values %d bytes" % (key_size, value_size))
+        index = stable_hash(key) & mask
+        while data[index * record_size]:
+            offset = index * record_size + 1
+            if data[offset:offset + key_size] == key:
+                raise ValueError("key %r appears twice" % (bytes(key),))
+            index = (index + 1) & mask
+        offset = index * record_size
+        data[offset] = 1
+        data[offset + 1:offset + record_size] = key + value
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, key_size, value_size, 0, slots, len(items)))
+        output.write(data)
+    os.replace(temporary, path)
+    return len(items)
+
+
+class SnapshotTable:
+    def __init__(self, path):
+        """
+        Opens a snapshot file for searching, read only.
+
+        The file is mapped into memory rather than read, so opening it costs the same for
+        any size, only the slots a search touches are loaded, and every process opening the
+        same file shares its pages through the page cache.
+
+        Parameters:
+        path (str): The snapshot file.
+
+        Raises:
+        ValueError: If the file is not a snapshot of a version this code reads.
+        """
+        self.path = path
+        with open(path, "rb") as snapshot:
+            self._map = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError("%s is not a table snapshot" % path)
+        magic, version, key_size, value_size, _, slots, size = HEADER.unpack_from(self._map)
+        record_size = 1 + key_size + value_size
+        if magic != MAGIC or version != VERSION or len(self._map) != HEADER.size + slots * record_size:
+            self._map.close()
+            raise ValueError("%s is not a version %d table snapshot" % (path, VERSION))
+        self.key_size = key_size
+        self.value_size = value_size
+        self.size = size
+        self._slots = slots
+        self._record_size = record_size
+
+    def search(self, key):
+        """
+        Searches for the value associated with the key.
+
+        Parameters:
+        key (bytes): The key, key_size bytes long.
+
+        Returns:
+        bytes or None: The value, or None if the key is not in the snapshot.
+        """
+        if len(key) != self.key_size:
+            return None
+        data = self._map
+        record_size = self._record_size
+        key_size = self.key_size
+        mask = self._slots - 1
+        index = stable_hash(key) & mask
+        while True:
+            offset = HEADER.size + index * record_size
+            if not data[offset]:
+                return None
+            if data[offset + 1:offset + 1 + key_size] == key:
+                return data[offset + 1 + key_size:offset + record_size]
+            index = (index + 1) & mask
+
+    def __contains__(self, key):
+        """Returns True if the key is in the snapshot."""
+        return self.search(key) is not None
+
+    def capacity(self):
+        """Returns the number of slots in the snapshot."""
+        return self._slots
+
+    def __len__(self):
+        """Returns the number of records stored in the snapshot."""
+        return self.size
+
+    def close(self):
+        """Unmaps the file."""
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,157 @@
+#
+#   These are the unit tests for the containers in a1_partc
+#   To use this, run: python test_a1_partc.py
+
+import collections
+import random
+import unittest
+from a1_partc import Queue, Deque
+
+
+class A1CTestCase(unittest.TestCase):
+    """These are the test cases for the a1_partc containers"""
+
+    def test_queue_capacity(self):
+        queue = Queue()
+        self.assertEqual(queue.capacity(), 10)
+        for i in range(10):
+            queue.enqueue(i)
+        self.assertEqual(queue.capacity(), 10)
+        queue.enqueue(10)
+        self.assertEqual(queue.capacity(), 20)
+
+        queue = Queue(4)
+        queue.enqueue_many(range(9))
+        self.assertEqual(queue.capacity(), 16)
+        self.assertEqual(len(queue), 9)
+
+        queue = Queue(0)
+        queue.enqueue('a')
+        self.assertEqual(queue.dequeue(), 'a')
+
+    def test_queue_wraps_around(self):
+        queue = Queue(4)
+        for i in range(3):
+            queue.enqueue(i)
+        self.assertEqual(queue.dequeue(), 0)
+        self.assertEqual(queue.dequeue(), 1)
+        # the back wraps around to the start of the slots
+        queue.enqueue_many([3, 4, 5])
+        self.assertEqual(queue.capacity(), 4)
+        self.assertEqual(queue.get_front(), 2)
+        # growing while wrapped keeps the order
+        queue.enqueue(6)
+        self.assertEqual(queue.capacity(), 8)
+        self.assertEqual(queue.drain(), [2, 3, 4, 5, 6])
+        self.assertTrue(queue.is_empty())
+        self.assertEqual(queue.get_front(), None)
+        self.assertRaises(IndexError, queue.dequeue)
+
+    def test_queue_against_deque(self):
+        rng = random.Random(1)
+        queue = Queue(3)
+        reference = collections.deque()
+        for _ in range(5000):
+            action = rng.random()
+            if action < 0.45:
+                queue.enqueue(action)
+                reference.append(action)
+            elif action < 0.55:
+                items = [rng.random() for _ in range(rng.randint(0, 7))]
+                queue.enqueue_many(items)
+                reference.extend(items)
+            elif action < 0.98:
+                if reference:
+                    self.assertEqual(queue.dequeue(), reference.popleft())
+                else:
+                    self.assertRaises(IndexError, queue.dequeue)
+            else:
+                self.assertEqual(queue.drain(), list(reference))
+                reference.clear()
+            self.assertEqual(len(queue), len(reference))
+            self.assertEqual(queue.get_front(), reference[0] if reference else None)
+            self.assertGreaterEqual(queue.capacity(), len(queue))
+
+    def test_deque_capacity_and_wrap(self):
+        deque = Deque(4)
+        deque.push_front(1)
+        deque.push_back(2)
+        deque.push_front(0)
+        self.assertEqual(deque.capacity(), 4)
+        self.assertEqual([deque[i] for i in range(3)], [0, 1, 2])
+        self.assertEqual(list(deque), [0, 1, 2])
+        deque.push_back(3)
+        deque.push_front(-1)
+        self.assertEqual(deque.capacity(), 8)
+        self.assertEqual(list(deque), [-1, 0, 1, 2, 3])
+        self.assertEqual(deque.get_front(), -1)
+        self.assertEqual(deque.get_back(), 3)
+        self.assertRaises(IndexError, deque.__getitem__, 5)
+        self.assertRaises(IndexError, deque.__getitem__, -1)
+
+        deque = Deque(0)
+        self.assertRaises(IndexError, deque.pop_front)
+        self.assertRaises(IndexError, deque.pop_back)
+        deque.extend_right('ab')
+        deque.extend_left('cd')
+        self.assertEqual(list(deque), ['d', 'c', 'a', 'b'])
+        self.assertEqual(deque.capacity(), 4)
+
+    def test_deque_rotate(self):
+        for cap in (5, 16):
+            deque = Deque(cap)
+            deque.extend_right(range(5))
+            deque.rotate(2)
+            self.assertEqual(list(deque), [3, 4, 0, 1, 2])
+            deque.rotate(-3)
+            self.assertEqual(list(deque), [1, 2, 3, 4, 0])
+            deque.rotate(9)
+            self.assertEqual(list(deque), [2, 3, 4, 0, 1])
+        Deque().rotate(3)
+
+    def test_deque_against_deque(self):
+        rng = random.Random(2)
+        deque = Deque(3)
+        reference = collections.deque()
+        for _ in range(5000):
+            action = rng.randrange(9)
+            if action == 0:
+                deque.push_front(action)
+                reference.appendleft(action)
+            elif action == 1:
+                deque.push_back(action)
+                reference.append(action)
+            elif action in (2, 3):
+                if reference:
+                    self.assertEqual(deque.pop_front(), reference.popleft())
+                else:
+                    self.assertRaises(IndexError, deque.pop_front)
+            elif action in (4, 5):
+                if reference:
+                    self.assertEqual(deque.pop_back(), reference.pop())
+                else:
+                    self.assertRaises(IndexError, deque.pop_back)
+            elif action == 6:
+                items = [rng.random() for _ in range(rng.randint(0, 5))]
+                if rng.random() < 0.5:
+                    deque.extend_left(items)
+                    reference.extendleft(items)
+                else:
+                    deque.extend_right(items)
+                    reference.extend(items)
+            elif action == 7:
+                steps = rng.randint(-7, 7)
+                deque.rotate(steps)
+                reference.rotate(steps)
+            elif reference:
+                k = rng.randrange(len(reference))
+                self.assertEqual(deque[k], reference[k])
+            self.assertEqual(len(deque), len(reference))
+            self.assertEqual(deque.get_front(), reference[0] if reference else None)
+            self.assertEqual(deque.get_back(), reference[-1] if reference else None)
+            self.assertGreaterEqual(deque.capacity(), len(deque))
+        self.assertEqual(list(deque), list(reference))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#
+#   These are the unit tests for the iterative overflow engine in a1_partd
+#   To use this, run: python test_a1_partd.py
+
+import random
+import unittest
+from a1_partc import Queue
+from a1_partd import overflow, overflow_iterative
+
+
+def drain(queue):
+    states = []
+    while not queue.is_empty():
+        states.append(queue.dequeue())
+    return states
+
+
+class A1DTestCase(unittest.TestCase):
+    """Checks that overflow_iterative behaves exactly like overflow"""
+
+    def assert_same_overflow(self, grid):
+        expected_grid = [row[:] for row in grid]
+        expected_queue = Queue()
+        expected = overflow(expected_grid, expected_queue)
+
+        actual_grid = [row[:] for row in grid]
+        actual_queue = Queue()
+        self.assertEqual(overflow_iterative(actual_grid, actual_queue), expected)
+        self.assertEqual(actual_grid, expected_grid)
+        self.assertEqual(drain(actual_queue), drain(expected_queue))
+
+        no_queue_grid = [row[:] for row in grid]
+        self.assertEqual(overflow_iterative(no_queue_grid), expected)
+        self.assertEqual(no_queue_grid, expected_grid)
+
+    def test_random_grids(self):
+        rng = random.Random(42)
+        for _ in range(300):
+            rows, cols = rng.randint(1, 7), rng.randint(2, 7)
+            grid = [[rng.choice((1, -1)) * rng.randint(0, 4) for _ in range(cols)] for _ in range(rows)]
+            self.assert_same_overflow(grid)
+
+    def test_played_moves(self):
+        # boards reached by actually playing, where chain reactions are long
+        rng = random.Random(7)
+        for _ in range(40):
+            grid = [[0] * 6 for _ in range(5)]
+            grid[0][0] = 1
+            grid[4][5] = -1
+            player = 1
+            for _ in range(60):
+                moves = [(r, c) for r in range(5) for c in range(6) if grid[r][c] * player >= 0]
+                r, c = rng.choice(moves)
+                grid[r][c] += player
+                self.assert_same_overflow(grid)
+                overflow(grid, Queue())
+                player = -player
+
+    def test_no_overflow(self):
+        self.assert_same_overflow([[1, 0, 0], [0, -2, 0], [0, 0, 0]])
+        self.assert_same_overflow([[2, 3, 2], [3, 4, 3], [2, 3, 2]])
+
+    def test_long_cascade_without_recursion(self):
+        # a top row one short of overflowing, so the reaction runs along it one step per wave,
+        # more waves than the recursion limit allows overflow() to handle
+        cols = 3000
+        grid = [[2] * cols, [0] * cols, [0] * cols]
+        grid[2][cols - 1] = -1
+        self.assertGreater(overflow_iterative(grid), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,12 @@
 #   These are the unit tests for functions and classes of assingment 1 part E
 #   To use this, run: python test_a2_parta.py
 
+import collections
+import random
+import sys
+import threading
 import unittest
-from a2_parta import HashTable
+from a2_parta import BoundedHashTable, ConcurrentHashTable, HashTable, OpenHashTable
 
 class A2ATestCase(unittest.TestCase):
     """These are the test cases for functions and classes of a2"""
@@ -309,7 +313,637 @@ class A2ATestCase(unittest.TestCase):
             else:
                 self.assertEqual(table.search(keys[i]),values[i])
 
+    def test_HashTable_bulk(self):
+        self.assertEqual(HashTable.presized(0).capacity(), 32)
+        self.assertEqual(HashTable.presized(22).capacity(), 32)
+        self.assertEqual(HashTable.presized(23).capacity(), 64)
+        self.assertEqual(HashTable.presized(1000, capacity=8).capacity(), 2048)
 
+        table = HashTable.presized(1000)
+        self.assertEqual(table.insert_many((i, -i) for i in range(1000)), 1000)
+        self.assertEqual(table.capacity(), 2048)
+        self.assertEqual(len(table), 1000)
+
+        # one growth covers the whole batch; existing and repeated keys keep their first value
+        table = HashTable(8)
+        table.insert(1, 'one')
+        self.assertEqual(table.insert_many([(1, 'uno'), (2, 'two'), (3, 'three'), (2, 'dos')]), 2)
+        self.assertEqual(table.capacity(), 8)
+        self.assertEqual(table.insert_many((str(i), i) for i in range(40)), 40)
+        self.assertEqual(table.capacity(), 64)
+        self.assertEqual(len(table), 43)
+
+        self.assertEqual(table.search_many([1, 2, 3, 4, '39']), ['one', 'two', 'three', None, 39])
+        self.assertEqual(table.remove_many([1, 4, 1, '0', '1']), 3)
+        self.assertEqual(len(table), 40)
+        self.assertEqual(table.search_many([1, '0', '2']), [None, None, 2])
+        self.assertEqual(table.capacity(), 64)
+
+
+KEYS = ["apple", "banana", "strawberry", "mango", "orange", "lichee", "peach", "pear",
+        "grape", "nectarine", "blackberry", "clementine", "apricot", "cantaloupe", "honeydew", "pineapple",
+        "blueberry", "coconut", "raspberry", "cherry", "lettuce", "mushroom", "carrot", "broccoli",
+        "pepper", "onion", "garlic", "shallots", "cabbage", "kale", "leeks", "beets",
+        "squash", "pumpkin", "potato", "tomato", "watercress", "yam", "taro", "okra",
+        "cilantros", "parsley", "basil", "sage", "thyme", "tumeric", "paprika", "cloves"]
+VALUES = [32, 16, 18, 19, 22, 25, 72, 12, 11, 33, 51, 43, 23, 71, 5, 13,
+          5, 17, 35, 12, 13, 44, 46, 76, 8, 10, 15, 18, 11, 64, 73, 7,
+          18, 15, 22, 73, 41, 56, 54, 36, 22, 34, 40, 34, 19, 8, 9, 52]
+
+
+class HashTableCases:
+    """
+    The cases of A2ATestCase, for any class with the HashTable interface. A test case mixes
+    this in and sets table_class (and table_options) to the table it runs them against.
+    """
+    table_class = HashTable
+    table_options = {}
+
+    def new_table(self, capacity=32):
+        """Creates an empty table of the class under test."""
+        return self.table_class(capacity, **self.table_options)
+
+    def presized_table(self, expected, capacity=32):
+        """Creates an empty presized table of the class under test."""
+        return self.table_class.presized(expected, capacity, **self.table_options)
+
+    def test_insert_search_modify(self):
+        table = self.new_table()
+        self.assertEqual((table.capacity(), len(table)), (32, 0))
+        self.assertEqual(self.new_table(128).capacity(), 128)
+        for i in range(22):
+            self.assertEqual(table.modify(KEYS[i], VALUES[i]), False)
+        for i in range(22):
+            self.assertEqual(table.insert(KEYS[i], VALUES[i]), True)
+            self.assertEqual((table.capacity(), len(table)), (32, i + 1))
+        for i in range(22):
+            self.assertEqual(table.insert(KEYS[i], VALUES[i] + 1), False)
+            self.assertEqual(table.search(KEYS[i]), VALUES[i])
+            self.assertEqual(table.modify(KEYS[i], VALUES[i] + 10), True)
+        self.assertEqual([table.search(key) for key in KEYS],
+                         [value + 10 for value in VALUES[:22]] + [None] * 26)
+        self.assertEqual((table.capacity(), len(table)), (32, 22))
+
+    def test_resize(self):
+        # the capacity doubles on the insert that takes the load over 0.7
+        table = self.new_table(8)
+        for i, capacity in enumerate([8] * 5 + [16] * 6 + [32] * 11 + [64] * 22 + [128] * 4):
+            table.insert(KEYS[i], VALUES[i])
+            self.assertEqual((table.capacity(), len(table)), (capacity, i + 1))
+            self.assertEqual([table.search(key) for key in KEYS[:i + 1]], VALUES[:i + 1])
+
+    def test_remove(self):
+        table = self.new_table()
+        for key, value in zip(KEYS, VALUES):
+            table.insert(key, value)
+        for i in range(0, 48, 2):
+            self.assertEqual(table.remove(KEYS[i]), True)
+            self.assertEqual(len(table), 47 - i // 2)
+        for i in range(0, 48, 2):
+            self.assertEqual(table.remove(KEYS[i]), False)
+        self.assertEqual((table.capacity(), len(table)), (128, 24))
+        self.assertEqual([table.search(key) for key in KEYS],
+                         [None if i % 2 == 0 else VALUES[i] for i in range(48)])
+
+    def test_bulk(self):
+        self.assertEqual(self.presized_table(0).capacity(), 32)
+        self.assertEqual(self.presized_table(22).capacity(), 32)
+        self.assertEqual(self.presized_table(23).capacity(), 64)
+        self.assertEqual(self.presized_table(1000, capacity=8).capacity(), 2048)
+
+        table = self.new_table(8)
+        table.insert(1, 'one')
+        self.assertEqual(table.insert_many([(1, 'uno'), (2, 'two'), (3, 'three'), (2, 'dos')]), 2)
+        self.assertEqual(table.insert_many((str(i), i) for i in range(40)), 40)
+        self.assertEqual((table.capacity(), len(table)), (64, 43))
+        self.assertEqual(table.search_many([1, 2, 3, 4, '39']), ['one', 'two', 'three', None, 39])
+        self.assertEqual(table.remove_many([1, 4, 1, '0', '1']), 3)
+        self.assertEqual(table.search_many([1, '0', '2']), [None, None, 2])
+        self.assertEqual((table.capacity(), len(table)), (64, 40))
+
+
+class A2AIncrementalTestCase(HashTableCases, unittest.TestCase):
+    """Runs the HashTable cases against a HashTable that resizes incrementally, plus its own cases"""
+    table_options = {'incremental': True}
+
+    def test_HashTable_incremental_resize(self):
+        table = HashTable(8, incremental=True, migrate_step=2)
+        for i in range(5):
+            table.insert(i, i)
+        self.assertEqual(table._old_table, None)
+
+        # crossing 0.7 load doubles the capacity without moving the old records yet
+        table.insert(5, 5)
+        self.assertEqual(table.capacity(), 16)
+        self.assertEqual(len(table), 6)
+        self.assertNotEqual(table._old_table, None)
+        self.assertEqual(sum(len(chain) for chain in table.table if chain), 0)
+
+        # each operation moves at most migrate_step buckets, and every record stays reachable
+        self.assertEqual(table.search(7), None)
+        self.assertEqual(table._migrated, 2)
+        self.assertEqual(table.insert(4, 40), False)
+        self.assertEqual(table.modify(5, 50), True)
+        self.assertEqual(table.remove(3), True)
+        self.assertEqual(table.search(5), 50)
+        self.assertEqual(table._old_table, None)
+        self.assertEqual([table.search(i) for i in range(6)], [0, 1, 2, None, 4, 50])
+        self.assertEqual(len(table), 5)
+
+    def test_HashTable_incremental_bulk(self):
+        # an incremental resize in progress is finished before a bulk operation
+        table = HashTable(8, incremental=True)
+        table.insert_many((i, i) for i in range(5))
+        table.insert(5, 5)
+        self.assertNotEqual(table._old_table, None)
+        self.assertEqual(table.search_many(range(7)), [0, 1, 2, 3, 4, 5, None])
+        self.assertEqual(table._old_table, None)
+
+    def test_HashTable_incremental_midway(self):
+        # stop a migration halfway: records in buckets not yet moved are still found,
+        # changed and removed in the old table, and never come back once moved
+        table = HashTable(16, incremental=True, migrate_step=1)
+        for i in range(12):
+            table.insert(i, i)
+        self.assertEqual((table.capacity(), table._migrated), (32, 0))
+
+        # 11 more inserts would grow the table again, so 16 buckets take 2 per operation
+        self.assertEqual(table._migrate_rate, 2)
+        self.assertEqual(table.search(0), 0)
+        self.assertEqual(table._migrated, 2)
+
+        # keys 10 and 11 hash to buckets 10 and 11 of the old table, which have not moved yet
+        self.assertEqual(table.insert(11, 110), False)
+        self.assertEqual(table.modify(11, 111), True)
+        self.assertEqual(table.remove(10), True)
+        self.assertEqual(table.insert(40, 40), True)
+        self.assertEqual(table._migrated, 10)
+        self.assertEqual(table._old_table[11], [(11, 111)])
+        self.assertEqual(table._old_table[10], [])
+        self.assertEqual(len(table), 12)
+
+        # the migration is over before the insert that grows the table again
+        for i in range(12, 22):
+            table.insert(i, i)
+        self.assertEqual(table._old_table, None)
+        self.assertEqual(table.capacity(), 32)
+        table.insert(22, 22)
+        self.assertEqual(table.capacity(), 64)
+        self.assertEqual(table.resizes, 2)
+        self.assertEqual(table.search_many([10, 11, 40]), [None, 111, 40])
+        self.assertEqual(len(table), 23)
+
+    def test_HashTable_incremental_bounded_steps(self):
+        # shrinking 2048 buckets to 32 at once leaves an old table 64 times the new one:
+        # moving it is spread over the inserts before the next growth, none moving it all
+        table = HashTable(8, incremental=True, migrate_step=2, shrink=True)
+        table.insert_many((i, i) for i in range(1000))
+        table.remove_many(range(990))
+        self.assertEqual((table.capacity(), len(table._old_table)), (32, 2048))
+
+        moved = []
+        migrate = table._migrate
+        table._migrate = lambda buckets: moved.append(buckets) or migrate(buckets)
+        # 13 inserts take the load over 0.7 again
+        for i in range(2000, 2013):
+            table.insert(i, i)
+        self.assertEqual(table.capacity(), 64)
+        self.assertEqual(max(moved), -(-2048 // 13))
+        self.assertEqual(table.search_many(range(990, 1000)), list(range(990, 1000)))
+        self.assertEqual(len(table), 23)
+
+    def test_HashTable_incremental_against_dict(self):
+        rng = random.Random(4)
+        table = HashTable(2, incremental=True, migrate_step=1)
+        reference = {}
+        for _ in range(20000):
+            key = rng.randrange(500)
+            action = rng.randrange(5)
+            if action < 2:
+                self.assertEqual(table.insert(key, -key), key not in reference)
+                reference.setdefault(key, -key)
+            elif action == 2:
+                self.assertEqual(table.modify(key, key), key in reference)
+                if key in reference:
+                    reference[key] = key
+            elif action == 3:
+                self.assertEqual(table.remove(key), key in reference)
+                reference.pop(key, None)
+            else:
+                self.assertEqual(table.search(key), reference.get(key))
+            self.assertEqual(len(table), len(reference))
+
+
+class A2AShrinkStatsTestCase(unittest.TestCase):
+    """These are the test cases for HashTable shrinking and stats"""
+
+    def test_HashTable_shrink(self):
+        table = HashTable(8, shrink=True)
+        table.insert_many((i, i) for i in range(100))
+        self.assertEqual(table.capacity(), 256)
+        self.assertEqual(table.resizes, 1)
+
+        # 44 records in 256 buckets is a load of 0.172, the first to fall below 0.175
+        for i in range(55):
+            table.remove(i)
+        self.assertEqual(table.capacity(), 256)
+        table.remove(55)
+        self.assertEqual(table.capacity(), 128)
+        self.assertEqual([table.search(i) for i in range(54, 58)], [None, None, 56, 57])
+
+        # growing again only happens back at 0.7 load
+        table.insert_many((i, i) for i in range(44))
+        self.assertEqual(table.capacity(), 128)
+
+        # shrinking stops at the initial capacity, also from remove_many
+        self.assertEqual(table.remove_many(range(100)), 88)
+        self.assertEqual(table.capacity(), 8)
+        self.assertEqual(len(table), 0)
+
+        table = HashTable(8)
+        table.insert_many((i, i) for i in range(100))
+        table.remove_many(range(100))
+        self.assertEqual(table.capacity(), 256)
+
+    def test_HashTable_stats(self):
+        table = HashTable(4)
+        stats = table.stats()
+        self.assertEqual(stats["size"], 0)
+        self.assertEqual(stats["longest_chain"], 0)
+        self.assertEqual(stats["chain_lengths"], {0: 4})
+        self.assertEqual(stats["resizes"], 0)
+
+        for key in (0, 4, 8, 1):
+            table._place(key, key)
+            table.size += 1
+        stats = table.stats()
+        self.assertEqual(stats["load_factor"], 1.0)
+        self.assertEqual(stats["longest_chain"], 3)
+        self.assertEqual(stats["chain_lengths"], {0: 2, 1: 1, 3: 1})
+        self.assertGreater(stats["memory_bytes"], 0)
+
+        # during an incremental resize the chains are those of the new table, and the
+        # records left in the old one are counted apart
+        table = HashTable(8, incremental=True, migrate_step=2)
+        for i in range(6):
+            table.insert(i, i)
+        table.search(0)
+        stats = table.stats()
+        self.assertEqual(stats["capacity"], 16)
+        self.assertEqual(stats["resizes"], 1)
+        self.assertEqual(sum(stats["chain_lengths"].values()), 16)
+        self.assertEqual(sum(length * count for length, count in stats["chain_lengths"].items()), 2)
+        self.assertEqual(stats["migrating"], 4)
+        self.assertEqual(HashTable(8).stats()["migrating"], 0)
+
+    def test_HashTable_incremental_shrink(self):
+        # an incremental table shrinks a few buckets per operation like it grows
+        table = HashTable(8, incremental=True, migrate_step=4, shrink=True)
+        table.insert_many((i, i) for i in range(100))
+        self.assertEqual(table.capacity(), 256)
+        table.remove_many(range(55))
+        table.remove(55)
+        self.assertEqual(table.capacity(), 128)
+        self.assertEqual(len(table._old_table), 256)
+        self.assertEqual(table._migrated, 0)
+        self.assertEqual(table.stats()["migrating"], 44)
+
+        # no shrinking again until the old table is empty
+        for i in range(56, 90):
+            self.assertEqual(table.remove(i), True)
+            self.assertEqual(table.capacity(), 128)
+        # 46 inserts would grow it again, so 256 buckets take 6 per operation
+        self.assertEqual(table._migrated, 34 * 6)
+        self.assertEqual([table.search(i) for i in range(88, 100)], [None] * 2 + list(range(90, 100)))
+        self.assertEqual(table._old_table, None)
+        self.assertEqual(table.remove(90), True)
+        self.assertEqual(table.capacity(), 32)
+        self.assertEqual(table.search_many(range(89, 100)), [None, None] + list(range(91, 100)))
+
+
+class A2ABoundedTestCase(unittest.TestCase):
+    """These are the test cases for BoundedHashTable"""
+
+    def test_BoundedHashTable_lru(self):
+        self.assertRaises(ValueError, BoundedHashTable)
+        self.assertRaises(ValueError, BoundedHashTable, 4, policy='fifo')
+        for limits in ({'max_entries': 0}, {'max_entries': -1}, {'max_bytes': 0}, {'max_bytes': -10},
+                       {'max_entries': 4, 'max_bytes': 0}, {'max_entries': 0, 'max_bytes': 100}):
+            self.assertRaises(ValueError, BoundedHashTable, **limits)
+        self.assertEqual(BoundedHashTable(1).max_entries, 1)
+
+        table = BoundedHashTable(3)
+        for key in "abc":
+            self.assertEqual(table.insert(key, key.upper()), True)
+        self.assertEqual(table.insert("a", "x"), False)
+        self.assertEqual(table.search("a"), "A")
+        self.assertEqual(table.insert("d", "D"), True)
+        # b was the least recently used
+        self.assertEqual(table.search("b"), None)
+        self.assertEqual(table.modify("c", "C2"), True)
+        table.insert("e", "E")
+        self.assertEqual([table.search(key) for key in "acde"], [None, "C2", "D", "E"])
+        self.assertEqual((table.hits, table.misses, table.evictions), (4, 2, 2))
+        self.assertEqual(len(table), 3)
+
+    def test_BoundedHashTable_against_ordered_dict(self):
+        rng = random.Random(5)
+        table = BoundedHashTable(50)
+        reference = collections.OrderedDict()
+        for _ in range(20000):
+            key = rng.randrange(120)
+            action = rng.randrange(4)
+            if action == 0:
+                self.assertEqual(table.insert(key, -key), key not in reference)
+                if key not in reference:
+                    if len(reference) == 50:
+                        reference.popitem(last=False)
+                    reference[key] = -key
+            elif action == 1:
+                self.assertEqual(table.modify(key, key), key in reference)
+                if key in reference:
+                    reference[key] = key
+                    reference.move_to_end(key)
+            elif action == 2:
+                self.assertEqual(table.remove(key), reference.pop(key, None) is not None)
+            else:
+                self.assertEqual(table.search(key), reference.get(key))
+                if key in reference:
+                    reference.move_to_end(key)
+            self.assertEqual(len(table), len(reference))
+
+    def test_BoundedHashTable_clock(self):
+        table = BoundedHashTable(3, policy='clock')
+        for key in "abc":
+            table.insert(key, key)
+        table.search("a")
+        table.insert("d", "d")
+        # a and then b and c are given their second chance, the hand then comes back to a
+        self.assertEqual([key for key in "abcd" if table.search(key) is not None], ["b", "c", "d"])
+        table.remove("c")
+        table.insert("e", "e")
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.evictions, 1)
+
+    def test_BoundedHashTable_depth_preferred(self):
+        for policy in ('lru', 'clock'):
+            table = BoundedHashTable(4, policy=policy, depth=lambda entry: entry[1])
+            for key in range(4):
+                table.insert(key, ("entry", 6 if key % 2 == 0 else 1))
+            # the shallow entry goes, though the deep one before it was used less recently
+            table.insert(4, ("entry", 0))
+            self.assertEqual([table.search(key) is not None for key in range(5)],
+                             [True, False, True, True, True])
+
+        # on the clock, deep entries outlive every shallow one
+        table.insert(5, ("entry", 0))
+        table.insert(6, ("entry", 0))
+        self.assertEqual(table.search(0), ("entry", 6))
+        self.assertEqual(table.search(2), ("entry", 6))
+        self.assertEqual(table.evictions, 3)
+
+    def test_BoundedHashTable_bytes(self):
+        table = BoundedHashTable(max_bytes=100, weigh=lambda key, value: len(value))
+        self.assertEqual(table.insert("a", "x" * 40), True)
+        self.assertEqual(table.insert("b", "x" * 40), True)
+        self.assertEqual(table.insert("c", "x" * 30), True)
+        self.assertEqual(table.search("a"), None)
+        self.assertEqual(table.bytes, 70)
+        self.assertEqual(table.insert("d", "x" * 101), False)
+        # growing c makes room by evicting b, not c itself
+        self.assertEqual(table.modify("c", "x" * 90), True)
+        self.assertEqual(table.search("b"), None)
+        self.assertEqual(table.search("c"), "x" * 90)
+        self.assertEqual(table.bytes, 90)
+        table.clear()
+        self.assertEqual((len(table), table.bytes, table.hits), (0, 0, 0))
+
+
+class A2AConcurrentTestCase(HashTableCases, unittest.TestCase):
+    """Runs the HashTable cases against ConcurrentHashTable, plus threaded cases"""
+    table_class = ConcurrentHashTable
+
+    def test_ConcurrentHashTable_threads(self):
+        # switch threads very often so operations and resizes interleave
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        table = ConcurrentHashTable(4, stripes=8)
+        threads = 8
+        references = [{} for _ in range(threads)]
+        errors = []
+
+        def work(worker):
+            # each thread owns the keys equal to worker modulo threads, and reads everyone's
+            rng = random.Random(worker)
+            reference = references[worker]
+            try:
+                for _ in range(4000):
+                    key = rng.randrange(600) * threads + worker
+                    action = rng.randrange(5)
+                    if action < 2:
+                        if table.insert(key, -key) != (key not in reference):
+                            errors.append(("insert", key))
+                        reference.setdefault(key, -key)
+                    elif action == 2:
+                        if table.modify(key, key) != (key in reference):
+                            errors.append(("modify", key))
+                        if key in reference:
+                            reference[key] = key
+                    elif action == 3:
+                        if table.remove(key) != (reference.pop(key, None) is not None):
+                            errors.append(("remove", key))
+                    else:
+                        if table.search(key) != reference.get(key):
+                            errors.append(("search", key))
+                        other = rng.randrange(600 * threads)
+                        if table.search(other) not in (None, other, -other):
+                            errors.append(("search other", other))
+            except Exception as error:
+                errors.append(("exception", error))
+
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        expected = {}
+        for reference in references:
+            expected.update(reference)
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(table.search_many(range(600 * threads)),
+                         [expected.get(key) for key in range(600 * threads)])
+        self.assertGreater(table.capacity(), 4)
+        self.assertLessEqual(len(table) / table.capacity(), 0.7)
+
+    def test_ConcurrentHashTable_stripes(self):
+        # an operation waits only for the lock of its own stripe
+        table = ConcurrentHashTable(8, stripes=4)
+        table.insert(1, 'one')
+        table.insert(2, 'two')
+        done = []
+        table._locks[1].acquire()
+        blocked = threading.Thread(target=lambda: done.append(table.modify(1, 'uno')))
+        free = threading.Thread(target=lambda: done.append(table.search(2)))
+        blocked.start()
+        free.start()
+        free.join(5)
+        self.assertEqual(done, ['two'])
+        self.assertTrue(blocked.is_alive())
+        table._locks[1].release()
+        blocked.join(5)
+        self.assertEqual(done, ['two', True])
+        self.assertEqual(table.search(1), 'uno')
+
+    def test_ConcurrentHashTable_same_keys(self):
+        # every thread races for the same few keys under one lock while the table grows:
+        # each key is inserted, and removed, by exactly one thread
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        table = ConcurrentHashTable(1, stripes=1)
+        threads = 8
+        start = threading.Barrier(threads)
+        inserted = [[] for _ in range(threads)]
+        removed = [[] for _ in range(threads)]
+
+        def work(worker):
+            start.wait()
+            inserted[worker] = [key for key in range(200) if table.insert(key, worker)]
+            start.wait()
+            removed[worker] = [key for key in range(0, 200, 2) if table.remove(key)]
+
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        self.assertEqual(sorted(key for keys in inserted for key in keys), list(range(200)))
+        self.assertEqual(sorted(key for keys in removed for key in keys), list(range(0, 200, 2)))
+        self.assertEqual(len(table), 100)
+        owners = {key: worker for worker, keys in enumerate(inserted) for key in keys}
+        self.assertEqual(table.search_many(range(200)),
+                         [None if key % 2 == 0 else owners[key] for key in range(200)])
+
+
+class CountedKey:
+    """A key that counts how many times it is hashed, always colliding on the same slot."""
+    calls = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        CountedKey.calls += 1
+        return 7
+
+    def __eq__(self, other):
+        return isinstance(other, CountedKey) and self.name == other.name
+
+
+class A2AOpenTestCase(HashTableCases, unittest.TestCase):
+    """Runs the HashTable cases against OpenHashTable, plus its own cases"""
+    table_class = OpenHashTable
+
+    def test_OpenHashTable_tombstones(self):
+        table = OpenHashTable(16)
+        keys = [CountedKey(i) for i in range(6)]
+        for i, key in enumerate(keys):
+            self.assertEqual(table.insert(key, i), True)
+
+        # removing from the middle of a probe run leaves the rest reachable
+        self.assertEqual(table.remove(keys[1]), True)
+        self.assertEqual(table.tombstones, 1)
+        for i, key in enumerate(keys):
+            self.assertEqual(table.search(key), None if i == 1 else i)
+
+        # the tombstone is reused, and the key is not inserted twice
+        self.assertEqual(table.insert(keys[3], 30), False)
+        self.assertEqual(table.insert(keys[1], 10), True)
+        self.assertEqual(table.tombstones, 0)
+        self.assertEqual(table.search(keys[1]), 10)
+
+        # removing the end of a run turns trailing tombstones back into empty slots
+        table.remove(keys[4])
+        table.remove(keys[5])
+        self.assertEqual(table.tombstones, 0)
+        self.assertEqual(table.capacity(), 16)
+        self.assertEqual(len(table), 4)
+
+        # resizing reuses the cached hashes
+        CountedKey.calls = 0
+        table._resize()
+        self.assertEqual(CountedKey.calls, 0)
+        self.assertEqual(table.capacity(), 32)
+        self.assertEqual([table.search(key) for key in keys[:4]], [0, 10, 2, 3])
+
+    def test_OpenHashTable_clear_tombstones(self):
+        table = OpenHashTable(32)
+        for key in range(22):
+            table.insert(key, key)
+        for key in range(20):
+            table.remove(key)
+        self.assertEqual((len(table), table.tombstones), (2, 20))
+
+        # a key whose probe runs through a tombstone takes that slot
+        self.assertEqual(table.insert(32, 32), True)
+        self.assertEqual(table.tombstones, 19)
+        self.assertEqual(table.keys[0], 32)
+
+        # a key placed in an empty slot that leaves too few of them clears every tombstone,
+        # keeping the capacity since the records themselves are well under the load limit
+        self.assertEqual(table.insert(22, 22), True)
+        self.assertEqual(table.insert(23, 23), True)
+        self.assertEqual(table.tombstones, 0)
+        self.assertEqual(table.capacity(), 32)
+        self.assertEqual(table.search_many([0, 20, 21, 22, 23, 32]), [None, 20, 21, 22, 23, 32])
+        self.assertEqual(len(table), 5)
+
+    def test_OpenHashTable_insert_many_tombstones(self):
+        # tombstones fill slots too: a bulk insert that would use up every empty slot
+        # must clear them first, or a probe for a new key never ends
+        table = OpenHashTable(64)
+        for key in range(44):
+            table.insert(key, key)
+        for key in range(1, 43):
+            table.remove(key)
+        self.assertEqual(table.tombstones, 42)
+
+        items = [(key, key) for key in range(44, 64)] + [(1000, 0)]
+        done = []
+        worker = threading.Thread(target=lambda: done.append(table.insert_many(items)), daemon=True)
+        worker.start()
+        worker.join(5)
+        self.assertEqual(done, [21])
+        self.assertEqual(table.tombstones, 0)
+        self.assertEqual(len(table), 23)
+        self.assertEqual(table.search_many([0, 1, 43, 63, 1000]), [0, None, 43, 63, 0])
+
+    def test_OpenHashTable_against_dict(self):
+        rng = random.Random(3)
+        table = OpenHashTable(4)
+        reference = {}
+        for _ in range(20000):
+            key = rng.randrange(300)
+            action = rng.randrange(4)
+            if action == 0:
+                self.assertEqual(table.insert(key, -key), key not in reference)
+                reference.setdefault(key, -key)
+            elif action == 1:
+                self.assertEqual(table.modify(key, key), key in reference)
+                if key in reference:
+                    reference[key] = key
+            elif action == 2:
+                self.assertEqual(table.remove(key), reference.pop(key, None) is not None)
+            else:
+                self.assertEqual(table.search(key), reference.get(key))
+            self.assertEqual(len(table), len(reference))
+            self.assertLessEqual((len(table) + table.tombstones) / table.capacity(), 0.7)
 
 
 if __name__ == '__main__':
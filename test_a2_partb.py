@@ -5,7 +5,29 @@
 
 
 import unittest
-from a2_partb import evaluate_board, GameTree
+import random
+import threading
+import time
+from a1_partd import board_tally, get_overflow_list
+from a2_partb import cell_limits, evaluate_board, evaluate_tally, GameTree, get_timed_move, pack_board, SearchCancelled, unpack_board
+from parallel_search import ParallelSearch
+from player1 import PlayerOne
+from player2 import PlayerTwo
+from transposition import TranspositionTable, ZobristHasher
+
+
+def random_board(rng, rows=5, cols=6):
+    """Builds a mid-game board with pieces for both players and no cell at its overflow point."""
+    board = [[0] * cols for _ in range(rows)]
+    for r in range(rows):
+        for c in range(cols):
+            edges = (r in (0, rows - 1)) + (c in (0, cols - 1))
+            limit = 3 - edges
+            if rng.random() < 0.6:
+                board[r][c] = rng.choice((1, -1)) * rng.randint(1, limit)
+    board[0][0] = 1
+    board[rows - 1][cols - 1] = -1
+    return board
 
 class A2BTestCase(unittest.TestCase):
     """These are the test cases for functions and classes of a2"""
@@ -133,6 +155,155 @@ class A2BTestCase(unittest.TestCase):
         self.assertNotEqual((row,col), (4,0))
         self.assertNotEqual((row,col), (4,5))
 
+    def test_alphabeta_matches_minimax(self):
+        rng = random.Random(2024)
+        for _ in range(12):
+            board = random_board(rng)
+            for player in (1, -1):
+                for height in (2, 3, 4):
+                    expected = GameTree(board, player, height).get_move()
+                    tree = GameTree(board, player, height, pruning=True)
+                    self.assertEqual(tree.get_move(), expected)
+                    # pruned search never builds grandchildren of the root eagerly
+                    self.assertTrue(all(not child.children for child in tree.root.children))
+
+    def test_transposition_table(self):
+        rng = random.Random(7)
+        hasher = ZobristHasher()
+        table = TranspositionTable()
+        for _ in range(8):
+            board = random_board(rng)
+            for player in (1, -1):
+                for height in (3, 4):
+                    expected = GameTree(board, player, height).get_move()
+                    self.assertEqual(GameTree(board, player, height, table=table).get_move(), expected)
+
+            # incremental hash update agrees with hashing the new board from scratch
+            tree = GameTree(board, 1, 2, pruning=True)
+            tree.get_move()
+            for child in tree.root.children:
+                self.assertEqual(hasher.update(hasher.hash_board(board), board, child.board),
+                                 hasher.hash_board(child.board))
+
+        # searching the same position again is answered from the shared table
+        hits = table.hits
+        GameTree(board, 1, 4, table=table).get_move()
+        self.assertGreater(table.hits, hits)
+        self.assertGreater(len(table), 0)
+
+        # a bounded table stays within its limit and still gives the same moves
+        table = TranspositionTable(max_entries=50)
+        for _ in range(4):
+            board = random_board(rng)
+            expected = GameTree(board, 1, 4).get_move()
+            self.assertEqual(GameTree(board, 1, 4, table=table).get_move(), expected)
+            self.assertLessEqual(len(table), 50)
+        self.assertGreater(table.table.evictions, 0)
+
+    def test_timed_move(self):
+        rng = random.Random(11)
+        board = random_board(rng)
+        # a generous budget reaches the requested height and agrees with the fixed-depth search
+        self.assertEqual(get_timed_move(board, 1, 60000, max_height=4), GameTree(board, 1, 4).get_move())
+
+        # a tiny budget still returns a legal move, and promptly
+        start = time.perf_counter()
+        (row, col) = get_timed_move(board, -1, 1)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertLess(board[row][col], 0)
+
+    def test_parallel_search_matches_serial(self):
+        rng = random.Random(5)
+        with ParallelSearch(2) as search:
+            for _ in range(6):
+                board = random_board(rng)
+                for player in (1, -1):
+                    self.assertEqual(search.get_move(board, player, 4), GameTree(board, player, 4).get_move())
+
+    def test_parallel_search_cancel(self):
+        rng = random.Random(9)
+        board = random_board(rng)
+        with ParallelSearch(2) as search:
+            cancel = threading.Event()
+            cancel.set()
+            self.assertRaises(SearchCancelled, search.get_move, board, 1, 4, cancel)
+
+            # a deep search is stopped in the workers too, not left running
+            cancel = threading.Event()
+            threading.Timer(0.2, cancel.set).start()
+            start = time.perf_counter()
+            self.assertRaises(SearchCancelled, search.get_move, board, 1, 12, cancel)
+
+            # the searches given up on neither hold up nor disturb the next one
+            self.assertEqual(search.get_move(board, -1, 4, threading.Event()), GameTree(board, -1, 4).get_move())
+            self.assertLess(time.perf_counter() - start, 5)
+
+    def test_players_close(self):
+        self.assertRaises(ValueError, PlayerOne, workers=2, table=TranspositionTable())
+        self.assertRaises(ValueError, PlayerTwo, workers=2, table=TranspositionTable())
+        board = random_board(random.Random(4))
+        for bot, player in ((PlayerOne(difficulty=3, workers=2), 1), (PlayerTwo(difficulty=3, workers=2), -1)):
+            self.assertEqual(bot.get_play(board), GameTree(board, player, 3).get_move())
+            self.assertIsNotNone(bot.search)
+            bot.close()
+            self.assertIsNone(bot.search)
+            bot.close()
+
+    def test_compact_nodes(self):
+        rng = random.Random(17)
+        for _ in range(8):
+            board = random_board(rng)
+            self.assertEqual(unpack_board(pack_board(board), 6), board)
+            for player in (1, -1):
+                tree = GameTree(board, player, 3)
+                compact = GameTree(board, player, 3, compact=True)
+                self.assertEqual(compact.get_move(), tree.get_move())
+                self.assertEqual([child.board for child in compact.root.children],
+                                 [child.board for child in tree.root.children])
+                self.assertEqual(GameTree(board, player, 4, pruning=True, compact=True).get_move(),
+                                 GameTree(board, player, 4).get_move())
+        self.assertFalse(hasattr(compact.root, '__dict__'))
+
+        # a board given with a cell already at its overflow point resolves it on every move
+        board = [[2, 1, 0], [0, 1, 0], [0, 0, -1]]
+        compact = GameTree(board, 1, 2, compact=True)
+        self.assertFalse(compact.root.is_stable())
+        self.assertEqual([child.board for child in compact.root.children],
+                         [child.board for child in GameTree(board, 1, 2).root.children])
+
+    def test_compact_nodes_one_row(self):
+        # on 1xN and Nx1 boards every cell is on an edge, so no cell overflows at its neighbour count
+        for rows, cols in ((1, 4), (1, 5), (4, 1), (2, 5)):
+            limits = cell_limits(rows, cols)
+            for index, limit in enumerate(limits):
+                board = [[0] * cols for _ in range(rows)]
+                board[index // cols][index % cols] = limit - 1
+                self.assertIsNone(get_overflow_list(board))
+                board[index // cols][index % cols] = limit
+                self.assertEqual(get_overflow_list(board), [(index // cols, index % cols)])
+
+        board = [[1, 2, 0, 0, -1]]
+        for player in (1, -1):
+            tree = GameTree(board, player, 3)
+            compact = GameTree(board, player, 3, compact=True)
+            self.assertEqual([child.board for child in compact.root.children],
+                             [child.board for child in tree.root.children])
+            self.assertEqual(compact.get_move(), tree.get_move())
+
+    def test_incremental_evaluation(self):
+        rng = random.Random(23)
+        for _ in range(10):
+            board = random_board(rng)
+            for player in (1, -1):
+                for compact in (False, True):
+                    nodes = [GameTree(board, player, 4, compact=compact).root]
+                    while nodes:
+                        node = nodes.pop()
+                        self.assertEqual(node.tally, board_tally(node.board))
+                        self.assertEqual(node.evaluate(), evaluate_board(node.board, player))
+                        self.assertEqual(evaluate_tally(node.tally, -player), evaluate_board(node.board, -player))
+                        nodes.extend(node.children)
+
 
 if __name__ == '__main__':
     unittest.main()
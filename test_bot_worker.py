@@ -0,0 +1,91 @@
+#
+#   These are the unit tests for the background bot worker
+#   To use this, run: python test_bot_worker.py
+
+import random
+import threading
+import time
+import unittest
+from a2_partb import GameTree, SearchCancelled
+from bot_worker import BotWorker
+from player1 import PlayerOne
+from player2 import PlayerTwo
+from test_a2_partb import random_board
+
+
+class SlowBot:
+    """A bot that searches until it is cancelled, or gives up after 10 seconds."""
+
+    def __init__(self):
+        self.stopped = threading.Event()
+
+    def get_play(self, board, cancel=None):
+        try:
+            end = time.perf_counter() + 10
+            while time.perf_counter() < end:
+                if cancel is not None and cancel.is_set():
+                    raise SearchCancelled()
+                time.sleep(0.001)
+            return (0, 0)
+        finally:
+            self.stopped.set()
+
+
+def wait_for_move(worker, timeout=30):
+    """Polls the worker like the game loop does, returning the move."""
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        move = worker.take()
+        if move is not None:
+            return move
+        time.sleep(0.005)
+    raise AssertionError("the bot did not answer in time")
+
+
+class BotWorkerTestCase(unittest.TestCase):
+    """These are the test cases for bot_worker.py"""
+
+    def setUp(self):
+        self.worker = BotWorker()
+        self.addCleanup(self.worker.shutdown)
+
+    def test_moves_match_direct_calls(self):
+        rng = random.Random(8)
+        for bot in (PlayerOne(difficulty=3), PlayerTwo(difficulty=3)):
+            board = random_board(rng)
+            self.assertFalse(self.worker.pending())
+            self.worker.start(bot, board)
+            self.assertTrue(self.worker.pending())
+            self.assertEqual(wait_for_move(self.worker), bot.get_play(board))
+            # a move is handed over once
+            self.assertFalse(self.worker.pending())
+            self.assertEqual(self.worker.take(), None)
+
+    def test_cancel(self):
+        bot = SlowBot()
+        self.worker.start(bot, None)
+        time.sleep(0.02)
+        self.assertTrue(self.worker.thinking())
+        self.worker.cancel()
+        self.assertFalse(self.worker.pending())
+        self.assertTrue(bot.stopped.wait(2))
+        self.assertEqual(self.worker.take(), None)
+
+        # starting a new search cancels the one in progress, and the new one answers
+        slow = SlowBot()
+        self.worker.start(slow, None)
+        board = random_board(random.Random(9))
+        self.worker.start(PlayerOne(difficulty=2), board)
+        self.assertTrue(slow.stopped.wait(2))
+        self.assertEqual(wait_for_move(self.worker), PlayerOne(difficulty=2).get_play(board))
+
+    def test_gametree_cancel(self):
+        board = random_board(random.Random(10))
+        cancel = threading.Event()
+        cancel.set()
+        self.assertRaises(SearchCancelled, GameTree(board, 1, 4, pruning=True, cancel=cancel).get_move)
+        self.assertRaises(SearchCancelled, PlayerTwo(time_limit=1000).get_play, board, cancel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+#
+#   These are the unit tests for the game rules and their undo log
+#   To use this, run: python test_game_board.py
+
+import copy
+import random
+import unittest
+from a1_partc import Queue
+from game_board import GameBoard, redo_move, undo_move
+
+
+def play_random(board, rng, player, bot_move=False, animate=False):
+    """Makes one random valid move for player, with its overflow, the way game.py does."""
+    moves = [(r, c) for r in range(board.height) for c in range(board.width)
+             if board.valid_move(r, c, player)]
+    row, col = rng.choice(moves)
+    board.add_piece(row, col, player, bot_move)
+    if animate:
+        q = Queue()
+        if board.do_overflow(q):
+            while not q.is_empty():
+                board.set(q.dequeue())
+    else:
+        board.resolve_overflow()
+
+
+class GameBoardTestCase(unittest.TestCase):
+
+    def test_undo_matches_snapshots(self):
+        # every undo must give back exactly the board a full copy taken before the move held
+        for seed in range(20):
+            rng = random.Random(seed)
+            board = GameBoard(6, 5)
+            snapshots = []
+            for turn in range(40):
+                if board.check_win() != 0:
+                    break
+                player = 1 if turn % 2 == 0 else -1
+                snapshots.append(copy.deepcopy(board.board))
+                play_random(board, rng, player, animate=seed % 2 == 0)
+            while snapshots:
+                self.assertTrue(board.undo())
+                self.assertEqual(board.board, snapshots.pop())
+            self.assertFalse(board.undo())
+
+    def test_bot_moves_undo_with_human_move(self):
+        # bot moves join the step of the human move before them, as in a game against a bot
+        rng = random.Random(7)
+        board = GameBoard(6, 5)
+        start = copy.deepcopy(board.board)
+        play_random(board, rng, 1)
+        after_human = copy.deepcopy(board.board)
+        play_random(board, rng, -1, bot_move=True)
+        after_bot = copy.deepcopy(board.board)
+
+        self.assertTrue(board.undo())
+        self.assertEqual(board.board, start)
+        self.assertTrue(board.redo())
+        self.assertEqual(board.board, after_bot)
+        self.assertNotEqual(after_human, after_bot)
+
+    def test_redo(self):
+        rng = random.Random(3)
+        board = GameBoard(5, 5)
+        states = [copy.deepcopy(board.board)]
+        for turn in range(10):
+            play_random(board, rng, 1 if turn % 2 == 0 else -1, animate=True)
+            states.append(copy.deepcopy(board.board))
+
+        for i in range(4):
+            board.undo()
+        self.assertEqual(board.board, states[-5])
+        self.assertTrue(board.can_redo())
+        for i in range(4):
+            self.assertTrue(board.redo())
+            self.assertEqual(board.board, states[-4 + i])
+        self.assertFalse(board.redo())
+
+        # a new move after an undo drops the steps that could have been redone
+        board.undo()
+        play_random(board, rng, -1)
+        self.assertFalse(board.can_redo())
+        self.assertFalse(board.redo())
+
+    def test_moves_after_undo(self):
+        # moves made after an undo join the step before them, so undoing that step still
+        # gives back the board from before its human move, and they make redo impossible
+        rng = random.Random(13)
+        board = GameBoard(6, 5)
+        play_random(board, rng, 1)
+        before = copy.deepcopy(board.board)
+        play_random(board, rng, -1)
+        play_random(board, rng, 1)
+        self.assertTrue(board.undo())
+        self.assertTrue(board.undo())
+        self.assertEqual(board.board, before)
+        play_random(board, rng, -1, bot_move=True)
+        self.assertFalse(board.can_redo())
+        play_random(board, rng, 1, bot_move=True, animate=True)
+        self.assertTrue(board.undo())
+        self.assertEqual(board.board, GameBoard(6, 5).board)
+        self.assertFalse(board.undo())
+
+    def test_undo_limit(self):
+        rng = random.Random(11)
+        board = GameBoard(6, 5, undo_limit=3)
+        states = [copy.deepcopy(board.board)]
+        for turn in range(8):
+            play_random(board, rng, 1 if turn % 2 == 0 else -1)
+            states.append(copy.deepcopy(board.board))
+
+        self.assertEqual(len(board.undo_steps), 3)
+        for i in range(3):
+            self.assertTrue(board.undo())
+        self.assertEqual(board.board, states[-4])
+        self.assertFalse(board.can_undo())
+
+    def test_no_undo_for_bot_games(self):
+        rng = random.Random(5)
+        board = GameBoard(5, 5)
+        play_random(board, rng, 1, bot_move=True)
+        play_random(board, rng, -1, bot_move=True)
+        self.assertFalse(board.can_undo())
+        self.assertFalse(board.undo())
+
+    def test_do_overflow_leaves_board(self):
+        board = GameBoard(4, 4)
+        board.board[0][0] = 2
+        board.board[1][1] = 3
+        board.recount()
+        before = copy.deepcopy(board.board)
+        q = Queue()
+        self.assertGreater(board.do_overflow(q), 0)
+        self.assertEqual(board.board, before)
+        self.assertFalse(q.is_empty())
+
+
+class FakeWorker:
+    """Stands in for bot_worker.BotWorker: a search is pending until cancelled."""
+
+    def __init__(self, searching=False):
+        self.searching = searching
+        self.cancels = 0
+
+    def pending(self):
+        return self.searching
+
+    def cancel(self):
+        self.cancels += 1
+        self.searching = False
+
+
+class UndoMoveTestCase(unittest.TestCase):
+
+    def test_undo_while_bot_searches(self):
+        # the human moved and the bot is still searching its reply: only the human move is undone
+        rng = random.Random(2)
+        board = GameBoard(6, 5)
+        start = copy.deepcopy(board.board)
+        play_random(board, rng, 1)
+        after_human = copy.deepcopy(board.board)
+        worker = FakeWorker(searching=True)
+        self.assertTrue(undo_move(board, worker))
+        self.assertEqual(worker.cancels, 1)
+        self.assertFalse(worker.pending())
+        self.assertEqual(board.turn, 0)
+        self.assertEqual(board.board, start)
+
+        # redo gives the move back, and the bot is to move again
+        self.assertTrue(redo_move(board, worker))
+        self.assertEqual(worker.cancels, 2)
+        self.assertEqual(board.turn, 1)
+        self.assertEqual(board.board, after_human)
+
+    def test_undo_after_bot_reply(self):
+        rng = random.Random(6)
+        board = GameBoard(6, 5)
+        worker = FakeWorker()
+        for turn in range(6):
+            # player 1 is human, player 2 a bot
+            play_random(board, rng, 1 if turn % 2 == 0 else -1, bot_move=turn % 2 == 1)
+        after = copy.deepcopy(board.board)
+        self.assertTrue(undo_move(board, worker))
+        self.assertEqual(board.turn, 4)
+        self.assertTrue(undo_move(board, worker))
+        self.assertEqual(board.turn, 2)
+        self.assertTrue(redo_move(board, worker))
+        self.assertTrue(redo_move(board, worker))
+        self.assertEqual(board.turn, 6)
+        self.assertEqual(board.board, after)
+        self.assertFalse(redo_move(board, worker))
+        self.assertEqual(worker.cancels, 5)
+
+    def test_undo_between_humans(self):
+        rng = random.Random(8)
+        board = GameBoard(6, 5)
+        for turn in range(3):
+            play_random(board, rng, 1 if turn % 2 == 0 else -1)
+        worker = FakeWorker()
+        for turn in (2, 1, 0):
+            self.assertTrue(undo_move(board, worker))
+            self.assertEqual(board.turn, turn)
+        self.assertFalse(undo_move(board, worker))
+        self.assertEqual(board.turn, 0)
+
+    def test_no_undo_between_bots(self):
+        rng = random.Random(9)
+        board = GameBoard(6, 5)
+        play_random(board, rng, 1, bot_move=True)
+        play_random(board, rng, -1, bot_move=True)
+        worker = FakeWorker(searching=True)
+        self.assertFalse(undo_move(board, worker))
+        self.assertEqual(worker.cancels, 1)
+        self.assertEqual(board.turn, 2)
+
+
+def scan_win(board):
+    """The win check as a full scan of the board, to compare the cell counts with."""
+    if board.turn == 0:
+        return 0
+    values = [value for row in board.board for value in row]
+    if not any(value > 0 for value in values):
+        return -1
+    if not any(value < 0 for value in values):
+        return 1
+    return 0
+
+
+class CellCountTestCase(unittest.TestCase):
+
+    def test_counts_follow_games(self):
+        # verify makes every check_win compare the counts with a full scan
+        for seed in range(30):
+            rng = random.Random(seed)
+            board = GameBoard(rng.randint(3, 7), rng.randint(3, 7), verify=True)
+            turn = 0
+            while board.check_win() == 0 and turn < 200:
+                player = 1 if turn % 2 == 0 else -1
+                play_random(board, rng, player, bot_move=turn % 3 == 2, animate=seed % 2 == 0)
+                self.assertEqual(board.check_win(), scan_win(board))
+                if rng.random() < 0.2 and board.undo():
+                    self.assertEqual(board.check_win(), scan_win(board))
+                    if rng.random() < 0.5:
+                        board.redo()
+                        self.assertEqual(board.check_win(), scan_win(board))
+                turn += 1
+            self.assertEqual(board.counts, board.count_cells())
+
+    def test_win(self):
+        board = GameBoard(3, 3, verify=True)
+        self.assertEqual(board.check_win(), 0)
+        board.add_piece(0, 1, 1)
+        board.set([[0, 2, 0], [1, 1, 0], [0, 0, 0]])
+        self.assertEqual(board.counts, [3, 0])
+        self.assertEqual(board.check_win(), 1)
+        board.undo()
+        self.assertEqual(board.counts, [1, 1])
+        self.assertEqual(board.check_win(), 0)
+
+    def test_verify_finds_direct_changes(self):
+        board = GameBoard(4, 4, verify=True)
+        board.turn = 1
+        board.board[2][2] = -1
+        with self.assertRaises(RuntimeError):
+            board.check_win()
+        board.recount()
+        self.assertEqual(board.counts, [1, 2])
+        self.assertEqual(board.check_win(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
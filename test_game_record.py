@@ -0,0 +1,139 @@
+#
+#   These are the unit tests for the game record format and replay
+#   To use this, run: python test_game_record.py
+
+import io
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+import game_record
+from game_board import GameBoard
+from game_record import (HEADER, GameRecord, board_checksum, check_game, decode_game, encode_game,
+                         merge_summary, read_games, replay, validate, write_game)
+from tournament import game_specs, run_tournament
+
+
+def random_game(seed, width=6, height=5, max_moves=200):
+    """Plays random valid moves with GameBoard until someone wins, and records the game."""
+    rng = random.Random(seed)
+    board = GameBoard(width, height)
+    moves = []
+    boards = []
+    while board.check_win() == 0 and len(moves) < max_moves:
+        player = 1 if board.turn % 2 == 0 else -1
+        move = rng.choice([(r, c) for r in range(height) for c in range(width) if board.valid_move(r, c, player)])
+        board.add_piece(move[0], move[1], player, True)
+        board.resolve_overflow()
+        moves.append(move)
+        boards.append(board.get_board())
+    win = board.check_win()
+    winner = 1 if win == 1 else 2 if win == -1 else 0
+    return GameRecord(width, height, moves, board_checksum(board.board), winner), boards
+
+
+class GameRecordTestCase(unittest.TestCase):
+
+    def test_encode_decode(self):
+        record, boards = random_game(1)
+        data = encode_game(record)
+        self.assertEqual(len(data), HEADER.size + len(record.moves))
+        decoded = decode_game(data)
+        self.assertEqual(decoded.moves, record.moves)
+        self.assertEqual((decoded.width, decoded.height, decoded.winner, decoded.invalid, decoded.checksum),
+                         (6, 5, record.winner, False, record.checksum))
+        self.assertIsNone(decoded.timings)
+
+        record.timings = [None, 1.5] + [0.25] * (len(record.moves) - 2)
+        data = encode_game(record)
+        self.assertEqual(len(data), HEADER.size + 5 * len(record.moves))
+        self.assertEqual(decode_game(data).timings, record.timings)
+
+        with self.assertRaises(ValueError):
+            encode_game(GameRecord(20, 20, [], 0))
+        with self.assertRaises(ValueError):
+            encode_game(GameRecord(6, 5, [(5, 0)], 0))
+
+    def test_replay(self):
+        # the replay goes through the same positions as GameBoard, with either overflow
+        for seed in range(10):
+            record, boards = random_game(seed)
+            for engine in ("recursive", "iterative"):
+                positions = [[row[:] for row in board] for (_, _, _, board, _) in replay(record, engine)]
+                self.assertEqual(positions, boards)
+                self.assertEqual(check_game(record, engine)[0], None)
+
+    def test_read_games(self):
+        records = [random_game(seed)[0] for seed in range(5)]
+        stream = io.BytesIO()
+        for record in records:
+            write_game(stream, record)
+        stream.seek(0)
+        self.assertEqual([game.moves for game in read_games(stream)], [record.moves for record in records])
+
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(stream.getvalue()[:-1])))
+        with self.assertRaises(ValueError):
+            list(read_games(io.BytesIO(b"x" * HEADER.size)))
+
+    def test_check_game_finds_changes(self):
+        record, boards = random_game(3)
+        self.assertIsNone(check_game(record)[0])
+        wrong_winner = GameRecord(6, 5, record.moves, record.checksum, 3 - record.winner)
+        self.assertIn("winner", check_game(wrong_winner)[0])
+        wrong_board = GameRecord(6, 5, record.moves, record.checksum ^ 1, record.winner)
+        self.assertIn("final board", check_game(wrong_board)[0])
+        # player 2 playing on player 1's corner is invalid
+        board = GameBoard(6, 5)
+        board.add_piece(0, 1, 1)
+        invalid = GameRecord(6, 5, [(0, 1), (0, 0)], board_checksum(board.board), 1, invalid=True)
+        self.assertIsNone(check_game(invalid)[0])
+        invalid.invalid = False
+        self.assertIn("invalid", check_game(invalid)[0])
+
+    def test_validate_tournament_record(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.a2g")
+            with open(path, "wb") as record:
+                run_tournament(game_specs(2, [2], [2, 3], seed=4, random_openings=2), io.StringIO(), 1, record)
+            with open(path, "ab") as record:
+                write_game(record, random_game(9)[0])
+
+            summary = validate([path], workers=0, batch_size=2)
+            self.assertEqual(summary["games"], 5)
+            self.assertEqual(summary["problems"], [])
+            self.assertGreater(summary["timed_moves"], 0)
+            self.assertEqual(summary["p1_wins"] + summary["p2_wins"] + summary["draws"], 5)
+            self.assertEqual(validate([path], "iterative", workers=1)["problems"], [])
+
+    def test_validate_reads_ahead_a_little(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.a2g")
+            with open(path, "wb") as record:
+                for seed in range(12):
+                    write_game(record, random_game(seed)[0])
+
+            # count the batches read when each result is merged: one worker keeps two in flight
+            pulled = []
+            read_when_merged = []
+            read_batches = game_record._batches
+
+            def batches(*args):
+                for batch in read_batches(*args):
+                    pulled.append(batch)
+                    yield batch
+
+            def merge(summary, part):
+                read_when_merged.append(len(pulled))
+                merge_summary(summary, part)
+
+            with mock.patch("game_record._batches", batches), mock.patch("game_record.merge_summary", merge):
+                summary = validate([path], workers=1, batch_size=1)
+            self.assertEqual(summary["games"], 12)
+            self.assertEqual(summary["problems"], [])
+            self.assertEqual(read_when_merged, [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 12, 12])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#
+#   These are the unit tests for the opening book
+#   To use this, run: python test_opening_book.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+from a2_partb import GameTree
+from opening_book import OpeningBook, generate_book, opening_positions, position_key
+from player1 import PlayerOne
+from player2 import PlayerTwo
+
+
+class OpeningBookTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "book.snap")
+        cls.count = generate_book(cls.path, plies=3, depth=3, workers=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_opening_positions(self):
+        positions = opening_positions(2)
+        # the start, then each of player 1's moves: any cell but player 2's corner
+        self.assertEqual(len(positions), 1 + 5 * 6 - 1)
+        self.assertEqual([player for key, board, player in positions], [1] + [-1] * 29)
+        self.assertEqual(len(set(key for key, board, player in opening_positions(3))), len(opening_positions(3)))
+
+    def test_book_matches_search(self):
+        book = OpeningBook(self.path)
+        positions = opening_positions(3)
+        self.assertEqual(len(book), self.count)
+        self.assertEqual(self.count, len(positions))
+        bots = {1: PlayerOne(difficulty=3), -1: PlayerTwo(difficulty=3)}
+        for key, board, player in positions[::10]:
+            self.assertEqual(book.get_move(board, player), bots[player].get_play(board))
+        key, board, player = positions[0]
+        self.assertIsNone(book.get_move(board, player, min_depth=4))
+        self.assertIsNone(book.get_move(board, -player))
+        book.close()
+
+    def test_keys(self):
+        board = [[1, 0], [0, -1]]
+        self.assertNotEqual(position_key(board, 1), position_key(board, -1))
+        self.assertNotEqual(position_key(board, 1), position_key([[1, 0, 0], [0, 0, -1]], 1))
+        self.assertIsNone(position_key([[200, 0], [0, -1]], 1))
+
+    def test_players_use_book(self):
+        bot = PlayerOne(difficulty=3, book=self.path)
+        self.assertIsNone(bot.opening)
+        start = opening_positions(1)[0][1]
+        with mock.patch("player1.GameTree") as tree:
+            move = bot.get_play(start)
+        tree.assert_not_called()
+        self.assertIsNotNone(bot.opening)
+        self.assertEqual(move, PlayerOne(difficulty=3).get_play(start))
+
+        # out of the book, or asked for a deeper search than the book's, the bot searches
+        board = [[2, 1, 0, 0, 0, 0], [1, 1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0], [0, 0, 0, -1, -1, 0], [0, 0, 0, 0, -1, -2]]
+        self.assertIsNone(bot.opening.get_move(board, -1))
+        self.assertEqual(PlayerTwo(difficulty=3, book=self.path).get_play(board), PlayerTwo(difficulty=3).get_play(board))
+        with mock.patch("player2.GameTree", wraps=GameTree) as tree:
+            PlayerTwo(difficulty=4, book=self.path).get_play(opening_positions(2)[1][1])
+        tree.assert_called_once()
+
+    def test_generate_with_pool(self):
+        path = os.path.join(self.directory.name, "pool.snap")
+        self.assertEqual(generate_book(path, plies=2, depth=2, workers=1), 30)
+        with OpeningBook(path) as book:
+            key, board, player = opening_positions(1)[0]
+            self.assertEqual(book.get_move(board, player), PlayerOne(difficulty=2).get_play(board))
+
+
+if __name__ == '__main__':
+    unittest.main()
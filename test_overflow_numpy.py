@@ -0,0 +1,44 @@
+#
+#   These are the unit tests for the numpy batched overflow backend
+#   To use this, run: python test_overflow_numpy.py
+
+import random
+import unittest
+from a1_partd import overflow_iterative
+from a2_partb import GameTree
+import overflow_numpy
+from test_a2_partb import random_board
+
+
+@unittest.skipIf(overflow_numpy.np is None, "numpy is not installed")
+class OverflowNumpyTestCase(unittest.TestCase):
+    """Checks that the batched backend gives the same boards and trees as the python one"""
+
+    def test_overflow_batch(self):
+        np = overflow_numpy.np
+        rng = random.Random(3)
+        for rows, cols in ((5, 6), (1, 4), (3, 3), (8, 2)):
+            grids = [[[rng.choice((1, -1)) * rng.randint(0, 4) for _ in range(cols)] for _ in range(rows)]
+                     for _ in range(200)]
+            boards = np.array(grids, dtype=np.int8)
+            waves = overflow_numpy.overflow_batch(boards)
+            for grid, board, count in zip(grids, boards.tolist(), waves.tolist()):
+                self.assertEqual(overflow_iterative(grid), count)
+                self.assertEqual(board, grid)
+
+    def test_gametree_backend(self):
+        rng = random.Random(8)
+        for _ in range(6):
+            board = random_board(rng)
+            for player in (1, -1):
+                tree = GameTree(board, player, 3)
+                batch = GameTree(board, player, 3, backend='numpy')
+                self.assertEqual([child.board for child in batch.root.children],
+                                 [child.board for child in tree.root.children])
+                self.assertEqual(batch.get_move(), tree.get_move())
+                self.assertEqual(GameTree(board, player, 4, pruning=True, backend='numpy').get_move(),
+                                 GameTree(board, player, 4).get_move())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#
+#   These are the unit tests for the on-disk table snapshots
+#   To use this, run: python test_table_snapshot.py
+
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+from table_snapshot import SnapshotTable, save_snapshot
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """These are the test cases for table_snapshot.py"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "table.snap")
+
+    def test_save_and_search(self):
+        items = [(struct.pack("<Q", i * 7919), struct.pack("<bb", i % 5, i % 6)) for i in range(1000)]
+        self.assertEqual(save_snapshot(self.path, items, 8, 2), 1000)
+        with SnapshotTable(self.path) as table:
+            self.assertEqual(len(table), 1000)
+            self.assertEqual(table.capacity(), 2048)
+            for key, value in items:
+                self.assertEqual(table.search(key), value)
+            self.assertEqual(table.search(struct.pack("<Q", 3)), None)
+            self.assertEqual(table.search(b"short"), None)
+            self.assertIn(items[10][0], table)
+
+        # an empty snapshot opens and finds nothing
+        save_snapshot(self.path, [], 4, 4)
+        with SnapshotTable(self.path) as table:
+            self.assertEqual(len(table), 0)
+            self.assertEqual(table.search(b"abcd"), None)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, save_snapshot, self.path, [(b"ab", b"c")], 2, 2)
+        self.assertRaises(ValueError, save_snapshot, self.path, [(b"ab", b"cd"), (b"ab", b"ef")], 2, 2)
+        self.assertFalse(os.path.exists(self.path))
+
+        with open(self.path, "wb") as output:
+            output.write(b"not a snapshot, just some bytes here")
+        self.assertRaises(ValueError, SnapshotTable, self.path)
+
+        # a truncated snapshot is rejected too
+        save_snapshot(self.path, [(b"ab", b"cd")], 2, 2)
+        with open(self.path, "rb+") as snapshot:
+            snapshot.truncate(os.path.getsize(self.path) - 1)
+        self.assertRaises(ValueError, SnapshotTable, self.path)
+
+    def test_other_process_finds_keys(self):
+        save_snapshot(self.path, [(b"key%d" % i, b"v%d" % i) for i in range(10)], 4, 2)
+        code = "from table_snapshot import SnapshotTable; print(SnapshotTable(%r).search(b'key7'))" % self.path
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=dict(os.environ, PYTHONHASHSEED="123"))
+        self.assertEqual(output.stdout.strip(), "b'v7'")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#
+#   These are the unit tests for the headless tournament runner
+#   To use this, run: python test_tournament.py
+
+import io
+import json
+import unittest
+from game_board import GameBoard
+from game_record import GameRecord, check_game
+from tournament import game_specs, play_game, run_tournament
+
+
+class TournamentTestCase(unittest.TestCase):
+    """These are the test cases for tournament.py"""
+
+    def test_play_game(self):
+        result = play_game(2, 3, seed=5, random_openings=2)
+        self.assertIn(result["winner"], (1, 2))
+        self.assertFalse(result["invalid"])
+        self.assertEqual(len(result["moves"]), len(result["latency_ms"]))
+        self.assertEqual(result["latency_ms"][:2], [None, None])
+        # bots are deterministic, so the same seed replays the same game
+        self.assertEqual(play_game(2, 3, seed=5, random_openings=2)["moves"], result["moves"])
+
+        # replaying the moves by the rules ends in a win for the reported winner
+        board = GameBoard(6, 5)
+        for i, (row, col) in enumerate(result["moves"]):
+            player = 1 if i % 2 == 0 else -1
+            self.assertTrue(board.add_piece(row, col, player, True))
+            board.resolve_overflow()
+        self.assertEqual(board.check_win(), 1 if result["winner"] == 1 else -1)
+
+    def test_win_on_last_move(self):
+        # on a 2x3 board random games are won within a few moves, often on the last one allowed
+        wins_at_limit = 0
+        for seed in range(40):
+            result = play_game(2, 2, seed, random_openings=4, max_moves=4, rows=2, cols=3)
+            record = GameRecord(3, 2, result["moves"], result["checksum"], result["winner"], result["invalid"])
+            self.assertIsNone(check_game(record)[0])
+            wins_at_limit += len(result["moves"]) == 4 and result["winner"] != 0
+        self.assertGreater(wins_at_limit, 0)
+
+    def test_run_tournament(self):
+        specs = game_specs(3, [2], [2, 3], seed=1, random_openings=1)
+        self.assertEqual(len(specs), 6)
+        output = io.StringIO()
+        summary = run_tournament(specs, output, workers=2)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(sorted((line["p2_depth"], line["seed"]) for line in lines),
+                         [(2, 1), (2, 2), (2, 3), (3, 1), (3, 2), (3, 3)])
+        self.assertEqual(sum(stats["games"] for stats in summary.values()), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
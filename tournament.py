@@ -0,0 +1,209 @@
+#   Headless bot-vs-bot match runner.
+#   Plays PlayerOne against PlayerTwo with the same rules as game.py, without pygame,
+#   across a pool of processes, and writes one JSON line per game, and optionally the games
+#   in the binary format of game_record.py.
+#   To use this, run: python tournament.py --games 1000 --p1-depth 2 3 --p2-depth 3 --output results.jsonl
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game_board import GameBoard
+from game_record import GameRecord, board_checksum, write_game
+from player1 import PlayerOne
+from player2 import PlayerTwo
+
+ROWS = 5
+COLS = 6
+MAX_MOVES = 1000
+
+player_id = [1, -1]
+
+
+def play_game(p1_depth, p2_depth, seed=0, random_openings=0, rows=ROWS, cols=COLS, max_moves=MAX_MOVES):
+    """
+    Plays one game between PlayerOne and PlayerTwo.
+
+    The game runs like game.py with both players set to AI: player 1 moves first, a bot that
+    returns an invalid move loses, and the game ends when one player owns every piece.
+    The first random_openings moves are chosen at random among the valid moves, from an
+    rng seeded with seed, so that games between the same bots can differ.
+
+    Parameters:
+    p1_depth (int): PlayerOne's difficulty (tree height).
+    p2_depth (int): PlayerTwo's difficulty (tree height).
+    seed (int, optional): Seed for the random opening moves. Default is 0.
+    random_openings (int, optional): Number of opening moves made at random. Default is 0.
+    rows (int, optional): Number of rows on the board. Default is ROWS.
+    cols (int, optional): Number of columns on the board. Default is COLS.
+    max_moves (int, optional): Moves after which the game is stopped as a draw. Default is MAX_MOVES.
+
+    Returns:
+    dict: The result, with keys p1_depth, p2_depth, seed, winner (1, 2, or 0 for a draw),
+          invalid (True if the game ended on an invalid bot move), moves (list of [row, col]),
+          latency_ms (time each move took the bot, None for random moves), rows, cols and
+          checksum (game_record.board_checksum of the final board).
+    """
+    rng = random.Random(seed)
+    board = GameBoard(cols, rows)
+    bots = [PlayerOne(difficulty=p1_depth), PlayerTwo(difficulty=p2_depth)]
+    moves = []
+    latencies = []
+    winner = 0
+    invalid = False
+
+    while len(moves) < max_moves:
+        win = board.check_win()
+        if win != 0:
+            winner = 1 if win == 1 else 2
+            break
+
+        current_player = board.turn % 2
+        player = player_id[current_player]
+        if len(moves) < random_openings:
+            choices = [(r, c) for r in range(rows) for c in range(cols) if board.valid_move(r, c, player)]
+            (row, col) = rng.choice(choices)
+            latencies.append(None)
+        else:
+            start = time.perf_counter()
+            (row, col) = bots[current_player].get_play(board.get_board())
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not board.valid_move(row, col, player):
+                # if p1 makes an invalid move, p2 wins.  if p2 makes an invalid move p1 wins
+                winner = ((current_player + 1) % 2) + 1
+                invalid = True
+                moves.append([row, col])
+                break
+
+        board.add_piece(row, col, player, True)
+        board.resolve_overflow()
+        moves.append([row, col])
+    else:
+        # the last allowed move can still win the game
+        win = board.check_win()
+        if win != 0:
+            winner = 1 if win == 1 else 2
+    for bot in bots:
+        bot.close()
+
+    return {
+        "p1_depth": p1_depth,
+        "p2_depth": p2_depth,
+        "seed": seed,
+        "winner": winner,
+        "invalid": invalid,
+        "moves": moves,
+        "latency_ms": latencies,
+        "rows": rows,
+        "cols": cols,
+        "checksum": board_checksum(board.board),
+    }
+
+
+def _play_game_spec(spec):
+    """Unpacks a (p1_depth, p2_depth, seed, random_openings) tuple for play_game in a worker process."""
+    return play_game(*spec)
+
+
+def game_specs(games, p1_depths, p2_depths, seed=0, random_openings=0):
+    """
+    Lists the games to play: games games for every pairing of a p1 depth with a p2 depth.
+
+    Parameters:
+    games (int): Number of games per pairing.
+    p1_depths (list of int): PlayerOne difficulties.
+    p2_depths (list of int): PlayerTwo difficulties.
+    seed (int, optional): Seed of the first game; each game gets the next seed. Default is 0.
+    random_openings (int, optional): Number of random opening moves per game. Default is 0.
+
+    Returns:
+    list of tuple: (p1_depth, p2_depth, seed, random_openings) for each game.
+    """
+    specs = []
+    for p1_depth, p2_depth in itertools.product(p1_depths, p2_depths):
+        for i in range(games):
+            specs.append((p1_depth, p2_depth, seed + i, random_openings))
+    return specs
+
+
+def run_tournament(specs, output, workers=None, record=None):
+    """
+    Plays games in a process pool and streams each result to output as a JSON line as soon
+    as it finishes (so in completion order, not the order of specs).
+
+    Parameters:
+    specs (list of tuple): Games to play, as returned by game_specs.
+    output (file): Text file to write the results to.
+    workers (int, optional): Number of worker processes. Default is os.cpu_count().
+    record (file, optional): Binary file to also write each game to as a game record. Default is None.
+
+    Returns:
+    dict: Summary keyed by (p1_depth, p2_depth), each value a dict with the number of games,
+          wins for each player, draws, invalid moves, and the bot latencies.
+    """
+    summary = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_play_game_spec, spec) for spec in specs]
+        for future in as_completed(futures):
+            result = future.result()
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            if record is not None:
+                write_game(record, GameRecord(result["cols"], result["rows"], result["moves"], result["checksum"],
+                                              result["winner"], result["invalid"], result["latency_ms"]))
+
+            stats = summary.setdefault((result["p1_depth"], result["p2_depth"]),
+                                       {"games": 0, "p1_wins": 0, "p2_wins": 0, "draws": 0,
+                                        "invalid": 0, "latency_ms": []})
+            stats["games"] += 1
+            stats["p1_wins"] += result["winner"] == 1
+            stats["p2_wins"] += result["winner"] == 2
+            stats["draws"] += result["winner"] == 0
+            stats["invalid"] += result["invalid"]
+            stats["latency_ms"].extend(latency for latency in result["latency_ms"] if latency is not None)
+    return summary
+
+
+def print_summary(summary, out=sys.stdout):
+    """Prints one line per pairing: results and bot move latency (mean and worst)."""
+    for (p1_depth, p2_depth), stats in sorted(summary.items()):
+        latencies = stats["latency_ms"]
+        mean = sum(latencies) / len(latencies) if latencies else 0
+        worst = max(latencies) if latencies else 0
+        print(f"p1 depth {p1_depth} vs p2 depth {p2_depth}: {stats['games']} games, "
+              f"p1 {stats['p1_wins']} / p2 {stats['p2_wins']} / draws {stats['draws']}, "
+              f"invalid {stats['invalid']}, move latency mean {mean:.2f}ms max {worst:.2f}ms", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play PlayerOne against PlayerTwo without a window.")
+    parser.add_argument("--games", type=int, default=100, help="games per depth pairing")
+    parser.add_argument("--p1-depth", type=int, nargs="+", default=[4], help="PlayerOne difficulties")
+    parser.add_argument("--p2-depth", type=int, nargs="+", default=[4], help="PlayerTwo difficulties")
+    parser.add_argument("--random-openings", type=int, default=2,
+                        help="opening moves made at random so games differ")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default="tournament.jsonl", help="file the JSON lines are written to")
+    parser.add_argument("--record", default=None, help="file the games are also written to as game records")
+    args = parser.parse_args(argv)
+
+    specs = game_specs(args.games, args.p1_depth, args.p2_depth, args.seed, args.random_openings)
+    start = time.perf_counter()
+    with open(args.output, "w") as output:
+        if args.record is None:
+            summary = run_tournament(specs, output, args.workers)
+        else:
+            with open(args.record, "wb") as record:
+                summary = run_tournament(specs, output, args.workers, record)
+    elapsed = time.perf_counter() - start
+    print_summary(summary)
+    print(f"{len(specs)} games in {elapsed:.1f}s ({len(specs) / elapsed:.1f} games/s), results in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
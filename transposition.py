@@ -0,0 +1,232 @@
+from a2_parta import BoundedHashTable, HashTable
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(value):
+    """
+    Scrambles an integer into a well distributed 64 bit value (splitmix64 finalizer).
+
+    Parameters:
+    value (int): The value to scramble.
+
+    Returns:
+    int: A 64 bit pseudo-random value determined only by value.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def _entry_depth(entry):
+    """Returns the depth a table entry was searched to, for depth-preferred replacement."""
+    return entry[1]
+
+
+class ZobristHasher:
+    def __init__(self, seed=0):
+        """
+        Initializes a Zobrist hasher for boards of any size.
+
+        Every (cell, value) pair gets a fixed 64 bit key derived from the seed, so the same
+        board hashes to the same value in every process. Empty cells contribute nothing.
+
+        Parameters:
+        seed (int, optional): Seed the cell keys are derived from. Default is 0.
+        """
+        self.seed = seed
+        self._keys = {}
+
+    def cell_key(self, row, col, value):
+        """
+        Returns the key for a cell holding a value.
+
+        Parameters:
+        row (int): The row of the cell.
+        col (int): The column of the cell.
+        value (int): The value in the cell.
+
+        Returns:
+        int: The 64 bit key, 0 for an empty cell.
+        """
+        if value == 0:
+            return 0
+        key = self._keys.get((row, col, value))
+        if key is None:
+            key = _mix(self.seed ^ (row << 40) ^ (col << 24) ^ (value & 0xFFFF))
+            self._keys[(row, col, value)] = key
+        return key
+
+    def side_key(self, player, maximizing):
+        """
+        Returns the key folded into a board hash to tell apart the side searching and whose turn it is.
+
+        Parameters:
+        player (int): The player the tree is searched for.
+        maximizing (bool): True if the node is a maximizing node.
+
+        Returns:
+        int: The 64 bit key.
+        """
+        return _mix(self.seed ^ (0xA5 << 56) ^ ((player & 0xFF) << 1) ^ bool(maximizing))
+
+    def hash_board(self, board):
+        """
+        Computes the hash of a whole board.
+
+        Parameters:
+        board (list of list of int): The game board.
+
+        Returns:
+        int: The 64 bit hash of the board.
+        """
+        h = 0
+        for r, row in enumerate(board):
+            for c, value in enumerate(row):
+                if value != 0:
+                    h ^= self.cell_key(r, c, value)
+        return h
+
+    def update(self, h, old_board, new_board):
+        """
+        Updates a board hash for the cells that differ between two boards.
+
+        Only rows that changed are scanned cell by cell, so a move that touches a few
+        cells costs a few key lookups instead of a full rehash.
+
+        Parameters:
+        h (int): The hash of old_board.
+        old_board (list of list of int): The board h was computed for.
+        new_board (list of list of int): The board to compute the hash for.
+
+        Returns:
+        int: The hash of new_board.
+        """
+        for r, (old_row, new_row) in enumerate(zip(old_board, new_board)):
+            if old_row != new_row:
+                for c, (old, new) in enumerate(zip(old_row, new_row)):
+                    if old != new:
+                        h ^= self.cell_key(r, c, old) ^ self.cell_key(r, c, new)
+        return h
+
+
+class TranspositionTable:
+    def __init__(self, capacity=1024, hasher=None, max_entries=None):
+        """
+        Initializes a transposition table for GameTree searches.
+
+        Entries are kept in a HashTable keyed by position hash. Each entry is a tuple
+        (score, depth, bound, move) where depth is the number of plies searched below the
+        position, bound is one of EXACT, LOWER or UPPER, and move is the best move found.
+
+        The table grows without limit unless max_entries is given. It then holds at most
+        max_entries positions in a BoundedHashTable, which evicts by CLOCK and prefers to keep
+        entries searched deeper, so a bot can keep one table over a long session.
+
+        Parameters:
+        capacity (int, optional): The initial capacity of the underlying HashTable. Default is 1024.
+        hasher (ZobristHasher, optional): The hasher for positions. Default is a new ZobristHasher().
+        max_entries (int, optional): The most positions to keep. Default is None (no limit).
+
+        Attributes:
+        hits (int): Number of lookups that found an entry for the requested depth.
+        misses (int): Number of lookups that did not.
+        stores (int): Number of entries written.
+        """
+        if max_entries is not None:
+            self.table = BoundedHashTable(max_entries, policy='clock', depth=_entry_depth)
+        else:
+            self.table = HashTable(capacity)
+        self.hasher = hasher if hasher is not None else ZobristHasher()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def position_key(self, board_key, player, maximizing):
+        """
+        Combines a board hash with the side to move into a table key.
+
+        Parameters:
+        board_key (int): The Zobrist hash of the board.
+        player (int): The player the tree is searched for.
+        maximizing (bool): True if the node is a maximizing node.
+
+        Returns:
+        int: The key for the position.
+        """
+        return board_key ^ self.hasher.side_key(player, maximizing)
+
+    def lookup(self, key, depth):
+        """
+        Looks up the entry for a position searched to a given depth.
+
+        Only entries searched to exactly depth are returned, so using them never changes
+        the result of the search.
+
+        Parameters:
+        key (int): The position key.
+        depth (int): The number of plies to be searched below the position.
+
+        Returns:
+        tuple or None: The (score, depth, bound, move) entry, or None on a miss.
+        """
+        return self.probe(key, depth)[0]
+
+    def probe(self, key, depth):
+        """
+        Looks up a position, also returning the best move recorded for it at any depth.
+
+        The move is useful for ordering a search even when the entry is for another depth.
+
+        Parameters:
+        key (int): The position key.
+        depth (int): The number of plies to be searched below the position.
+
+        Returns:
+        tuple: (entry, move) where entry is the (score, depth, bound, move) entry if it was
+               searched to exactly depth, otherwise None, and move is the recorded move or None.
+        """
+        entry = self.table.search(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+        if entry[1] != depth:
+            self.misses += 1
+            return None, entry[3]
+        self.hits += 1
+        return entry, entry[3]
+
+    def store(self, key, score, depth, bound, move=None):
+        """
+        Records the result of searching a position, replacing any older entry.
+
+        Parameters:
+        key (int): The position key.
+        score (int or float): The score found.
+        depth (int): The number of plies searched below the position.
+        bound (int): EXACT, LOWER (score is a lower bound) or UPPER (score is an upper bound).
+        move (tuple of int, optional): The best move found. Default is None.
+        """
+        entry = (score, depth, bound, move)
+        if not self.table.modify(key, entry):
+            self.table.insert(key, entry)
+        self.stores += 1
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        if isinstance(self.table, BoundedHashTable):
+            self.table.clear()
+        else:
+            self.table = HashTable(self.table.capacity())
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        """Returns the number of positions stored in the table."""
+        return len(self.table)